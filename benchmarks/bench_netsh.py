@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Benchmarks et corpus de référence du moteur d'analyse netsh WLAN
+- vérifie d'abord chaque fixture de benchmarks/fixtures/netsh (FR/EN, cp850,
+  UTF-8 relu en cp1252, XML), décodée avec decode_output
+- mesure decode_output, parse_profile_list / parse_profile_detail /
+  parse_wlan_profile_xml et l'analyse d'un dossier d'export complet
+
+    python -m benchmarks.bench_netsh --save     # enregistre benchmarks/baselines_netsh.json
+    python -m benchmarks.bench_netsh            # vérifie le corpus puis compare à la référence
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.bench_printer import (_measure, _row, compare, load_baseline,
+                                      print_rows, save_baseline, REGRESSION_THRESHOLD)
+from services.netsh_wlan import (parse_profile_detail, parse_profile_list,
+                                 parse_wlan_profile_xml)
+from services.network_service import parse_wlan_export_folder
+from utils.console_encoding import decode_output
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "netsh")
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines_netsh.json")
+PROFILE_COUNTS = (5, 50, 500)
+
+_PARSERS = {
+    "list": parse_profile_list,
+    "detail": parse_profile_detail,
+    "xml": lambda data: list(parse_wlan_profile_xml(data)),
+}
+
+
+def _read_fixture(case):
+    with open(os.path.join(FIXTURES_DIR, case["file"]), "rb") as f:
+        data = f.read()
+    if case["kind"] == "xml":
+        return data
+    return decode_output(data, case.get("encoding", "utf-8"))
+
+
+def load_corpus():
+    with open(os.path.join(FIXTURES_DIR, "expected.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_corpus(corpus=None):
+    """
+    Analyse chaque fixture et compare au résultat attendu
+
+    Returns:
+        list: (fichier, attendu, obtenu) des fixtures en échec
+    """
+    failures = []
+    for case in corpus or load_corpus():
+        got = _PARSERS[case["kind"]](_read_fixture(case))
+        if got != case["expected"]:
+            failures.append((case["file"], case["expected"], got))
+    return failures
+
+
+def _profile_list(count, template):
+    """Sortie "show profiles" synthétique avec count profils"""
+    with open(os.path.join(FIXTURES_DIR, template), "r", encoding="utf-8") as f:
+        text = f.read()
+    head, _, _ = text.partition("    ")
+    prefix = ("    All User Profile     : " if template.startswith("en")
+              else "    Profil Tous les utilisateurs : ")
+    return head + "".join(f"{prefix}Réseau {i}\r\n" for i in range(count))
+
+
+def bench_parsers(profile_counts=PROFILE_COUNTS):
+    """
+    Returns:
+        list: Lignes de résultats
+    """
+    rows = []
+    for lang in ("en", "fr"):
+        for n in profile_counts:
+            text = _profile_list(n, f"{lang}_profiles.txt")
+            ms, peak, _ = _measure(lambda: parse_profile_list(text))
+            rows.append(_row(f"liste {lang} n={n}", ms, peak, len(text.encode())))
+            raw = text.encode("cp850")
+            ms, peak, _ = _measure(lambda: decode_output(raw, "cp850"))
+            rows.append(_row(f"décodage {lang} n={n}", ms, peak, len(raw)))
+        detail = _read_fixture({"file": f"{lang}_detail.txt", "kind": "detail"})
+        ms, peak, _ = _measure(lambda: parse_profile_detail(detail))
+        rows.append(_row(f"détail {lang}", ms, peak, len(detail.encode())))
+    xml = _read_fixture({"file": "export_wpa2.xml", "kind": "xml"})
+    ms, peak, _ = _measure(lambda: parse_wlan_profile_xml(xml))
+    rows.append(_row("xml profil", ms, peak, len(xml)))
+    return rows
+
+
+def bench_export_folder(profile_counts=PROFILE_COUNTS):
+    """
+    Analyse d'un dossier d'export netsh de n profils
+
+    Returns:
+        list: Lignes de résultats
+    """
+    rows = []
+    with open(os.path.join(FIXTURES_DIR, "export_wpa2.xml"), "r", encoding="utf-8") as f:
+        template = f.read()
+    for n in profile_counts:
+        folder = tempfile.mkdtemp(prefix="wlan-bench-")
+        try:
+            for i in range(n):
+                with open(os.path.join(folder, f"Wi-Fi-{i}.xml"), "w", encoding="utf-8") as f:
+                    f.write(template.replace("Bureau Étage 2", f"Réseau {i}"))
+            ms, peak, _ = _measure(lambda: parse_wlan_export_folder(folder), repeat=3)
+            rows.append(_row(f"export n={n}", ms, peak, len(template.encode()) * n))
+        finally:
+            shutil.rmtree(folder, ignore_errors=True)
+    return rows
+
+
+def run_all():
+    """Exécute tous les benchmarks"""
+    return bench_parsers() + bench_export_folder()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks netsh WLAN")
+    parser.add_argument("--save", action="store_true", help="enregistrer comme référence")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="fichier de référence")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    print("=" * 76)
+    print("BENCHMARKS netsh WLAN")
+    print("=" * 76)
+    failures = check_corpus()
+    if failures:
+        print(f"❌ {len(failures)} fixture(s) mal analysée(s):")
+        for name, expected, got in failures:
+            print(f"   • {name}: attendu {expected!r}, obtenu {got!r}")
+        return 1
+    print(f"✅ Corpus: {len(load_corpus())} fixture(s) correctement analysée(s)\n")
+
+    rows = run_all()
+    baseline = {} if args.save else load_baseline(args.baseline)
+    print_rows(rows, baseline)
+
+    if args.save:
+        save_baseline(rows, args.baseline)
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+        return 0
+    regressions = compare(rows, baseline, args.threshold) if baseline else []
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) (> {args.threshold * 100:.0f} % plus lent):")
+        for name in regressions:
+            print(f"   • {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmarks des chemins critiques de printer_service
+- build_message / iter_message selon n_lines_each et la taille du texte
+- send_tcp vers un puits local (émulateur sans limite de débit) selon la taille du message
+- boucles d'envois répétés comme _run_print_test (avec et sans pool de connexions)
+
+Chaque mesure rapporte ops/s, octets/s et le pic d'allocation (tracemalloc).
+Les résultats peuvent être enregistrés comme référence puis comparés. La référence
+dépend de la machine: elle est créée sur chaque poste de mesure et n'est pas versionnée
+(benchmarks/baselines*.json est ignoré par git).
+
+    python -m benchmarks.bench_printer --save     # enregistre benchmarks/baselines.json
+    python -m benchmarks.bench_printer            # compare à la référence
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from services.printer_emulator import PrinterEmulator
+from services.printer_service import (PrinterConnectionPool, build_message,
+                                      iter_message, send_tcp)
+
+LINE_COUNTS = (20, 200, 2000, 20000, 100000)
+TEXT_SIZES = (16, 40, 160)
+PAYLOAD_LINES = (20, 2000, 20000)
+REPEAT_COUNTS = (10,)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+# Écart d'ops/s toléré avant de signaler une régression
+REGRESSION_THRESHOLD = 0.25
+
+
+def _measure(fn, repeat=5, min_time=0.2):
+    """
+    Mesure le meilleur temps d'exécution et le pic mémoire d'une fonction
+
+    La fonction est exécutée au moins `repeat` fois et au moins `min_time` secondes
+    au total, pour stabiliser les mesures très courtes.
+
+    Returns:
+        tuple: (meilleur temps en ms, pic mémoire en octets, résultat)
+    """
+    fn()  # échauffement (caches, allocateur)
+    best = float("inf")
+    result = None
+    runs = 0
+    start = time.perf_counter()
+    while runs < repeat or time.perf_counter() - start < min_time:
+        t0 = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - t0)
+        runs += 1
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best * 1000, peak, result
+
+
+def _row(name, ms, peak, nbytes):
+    seconds = ms / 1000
+    return {
+        "name": name,
+        "ms": ms,
+        "ops_per_s": 1 / seconds if seconds else 0.0,
+        "bytes_per_s": nbytes / seconds if seconds else 0.0,
+        "peak_bytes": peak,
+    }
+
+
+def _consume_stream(n_lines_each, text="Test Test Test Test Test Test Test Test"):
+    """Parcourt iter_message comme le ferait un envoi par blocs"""
+    total = 0
+    for chunk in iter_message(n_lines_each=n_lines_each, text=text):
+        total += len(chunk)
+    return total
+
+
+def bench_build_message(line_counts=LINE_COUNTS, text_sizes=TEXT_SIZES):
+    """
+    Construction du message: complète (build_message) et en flux (iter_message)
+
+    Returns:
+        list: Lignes de résultats
+    """
+    rows = []
+    for size in text_sizes:
+        text = ("Test " * size)[:size]
+        for n in line_counts:
+            ms, peak, msg = _measure(lambda: build_message(n_lines_each=n, text=text))
+            rows.append(_row(f"build n={n} texte={size}", ms, peak, len(msg)))
+            ms, peak, total = _measure(lambda: _consume_stream(n, text))
+            rows.append(_row(f"flux  n={n} texte={size}", ms, peak, total))
+    return rows
+
+
+def _delivered(sink, send, nbytes):
+    """
+    Retourne une fonction qui envoie puis attend que le puits ait tout reçu
+
+    La mesure couvre ainsi le trajet complet et pas seulement la copie dans le buffer noyau.
+    """
+    def run():
+        target = sink.bytes_received + nbytes
+        sample = send()
+        if not sample.ok:
+            raise RuntimeError(sample.error)
+        while sink.bytes_received < target:
+            time.sleep(0)
+        return sample
+    return run
+
+
+def bench_send_tcp(payload_lines=PAYLOAD_LINES):
+    """
+    send_tcp vers un puits local, une connexion par envoi puis via le pool
+
+    Returns:
+        list: Lignes de résultats
+    """
+    rows = []
+    quiet = lambda msg: None
+    with PrinterEmulator(buffer_size=1 << 20, keep_lines=0) as sink:
+        ip, port = sink.address
+        for n in payload_lines:
+            data = build_message(n_lines_each=n)
+            run = _delivered(sink, lambda: send_tcp(ip, port, data, quiet), len(data))
+            ms, peak, _ = _measure(run, repeat=10)
+            rows.append(_row(f"send_tcp {len(data)} o", ms, peak, len(data)))
+            # L'émulateur sert une connexion à la fois: le pool est fermé après chaque série
+            pool = PrinterConnectionPool()
+            run = _delivered(sink, lambda: send_tcp(ip, port, data, quiet, pool=pool), len(data))
+            ms, peak, _ = _measure(run, repeat=10)
+            rows.append(_row(f"send_tcp pool {len(data)} o", ms, peak, len(data)))
+            pool.close()
+    return rows
+
+
+def bench_repeat_loop(repeat_counts=REPEAT_COUNTS, n_lines_each=20):
+    """
+    Boucle d'envois répétés comme _run_print_test (sans la pause entre répétitions)
+
+    Returns:
+        list: Lignes de résultats (ops = une boucle complète)
+    """
+    rows = []
+    quiet = lambda msg: None
+    with PrinterEmulator(buffer_size=1 << 20, keep_lines=0) as sink:
+        ip, port = sink.address
+        data = build_message(n_lines_each=n_lines_each)
+        for repeat in repeat_counts:
+            def loop(pool=None):
+                for _ in range(repeat):
+                    _delivered(sink, lambda: send_tcp(ip, port, data, quiet, pool=pool),
+                               len(data))()
+
+            ms, peak, _ = _measure(loop, repeat=3)
+            rows.append(_row(f"boucle x{repeat}", ms, peak, len(data) * repeat))
+            pool = PrinterConnectionPool()
+            ms, peak, _ = _measure(lambda: loop(pool), repeat=3)
+            rows.append(_row(f"boucle x{repeat} pool", ms, peak, len(data) * repeat))
+            pool.close()
+    return rows
+
+
+def run_all():
+    """Exécute tous les benchmarks"""
+    return bench_build_message() + bench_send_tcp() + bench_repeat_loop()
+
+
+def load_baseline(path=BASELINE_FILE):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {r["name"]: r for r in json.load(f)}
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(rows, path=BASELINE_FILE):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(rows, f, indent=2, ensure_ascii=False)
+
+
+def compare(rows, baseline, threshold=REGRESSION_THRESHOLD):
+    """
+    Compare les ops/s à la référence
+
+    Returns:
+        list: Noms des mesures en régression
+    """
+    regressions = []
+    for r in rows:
+        ref = baseline.get(r["name"])
+        if ref and ref["ops_per_s"] and r["ops_per_s"] < ref["ops_per_s"] * (1 - threshold):
+            regressions.append(r["name"])
+    return regressions
+
+
+def print_rows(rows, baseline):
+    print(f"{'Mesure':<30}{'ops/s':>12}{'Mo/s':>12}{'pic':>12}{'vs réf.':>10}")
+    for r in rows:
+        ref = baseline.get(r["name"])
+        delta = ""
+        if ref and ref["ops_per_s"]:
+            delta = f"{(r['ops_per_s'] / ref['ops_per_s'] - 1) * 100:+.0f} %"
+        print(f"{r['name']:<30}{r['ops_per_s']:>12.1f}{r['bytes_per_s'] / 1e6:>12.1f}"
+              f"{r['peak_bytes'] / 1024:>10.1f}Ko{delta:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks printer_service")
+    parser.add_argument("--save", action="store_true", help="enregistrer comme référence")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="fichier de référence")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    print("=" * 76)
+    print("BENCHMARKS printer_service")
+    print("=" * 76)
+    rows = run_all()
+    baseline = {} if args.save else load_baseline(args.baseline)
+    print_rows(rows, baseline)
+
+    if args.save:
+        save_baseline(rows, args.baseline)
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+        return 0
+    if not baseline:
+        print("\n⚠️ Aucune référence: lancer avec --save pour en créer une")
+        return 0
+    regressions = compare(rows, baseline, args.threshold)
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) (> {args.threshold * 100:.0f} % plus lent):")
+        for name in regressions:
+            print(f"   • {name}")
+        return 1
+    print("\n✅ Aucune régression")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
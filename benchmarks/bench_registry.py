@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Benchmarks et vérifications de la couche d'accès au registre (registre factice)
+- vérifie la lecture des ID TeamViewer / AnyDesk dans les vues WOW64 64 et 32 bits
+- mesure les lectures à froid (sans cache) et en cache, avec le nombre d'ouvertures
+  de clés par lecture
+- mesure l'application des jeux de tweaks sur un poste vierge puis déjà configuré
+  (ouvertures de clés et écritures), avec journal et annulation
+
+    python -m benchmarks.bench_registry --save     # enregistre benchmarks/baselines_registry.json
+    python -m benchmarks.bench_registry            # vérifie puis compare à la référence
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.bench_printer import (_measure, _row, compare, load_baseline,
+                                      print_rows, save_baseline, REGRESSION_THRESHOLD)
+from services.network_service import REMOTE_ID_NOT_FOUND, get_anydesk_id, get_teamviewer_id
+from services.registry_journal import RegistryJournal
+from services.registry_service import (HKEY_LOCAL_MACHINE, REG_DWORD, REG_SZ,
+                                       FakeWinreg, RegistryEngine, RegistryReader)
+from services.windows_service import (DIRECTORY_CACHE_TWEAKS, NOTIFICATION_TWEAKS,
+                                      POWER_BUTTON_TWEAKS, UAC_TWEAKS, active_hours_tweaks)
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines_registry.json")
+KEY_COUNTS = (10, 1000, 10000)
+
+# (valeurs du registre factice, ID TeamViewer attendu, ID AnyDesk attendu)
+CASES = (
+    ({(HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\TeamViewer", "ClientID"): (1234567890, REG_DWORD),
+      (HKEY_LOCAL_MACHINE, r"SOFTWARE\AnyDesk", "ClientID"): ("987654321", REG_SZ)},
+     "1234567890", "987654321"),
+    ({(HKEY_LOCAL_MACHINE, r"SOFTWARE\TeamViewer", "ClientID"): (42, REG_DWORD),
+      (HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\AnyDesk", "ClientID"): (" 55 ", REG_SZ)},
+     "42", "55"),
+    ({}, REMOTE_ID_NOT_FOUND, REMOTE_ID_NOT_FOUND),
+)
+
+
+def check_cases():
+    """
+    Returns:
+        list: (cas, attendu, obtenu) en échec
+    """
+    failures = []
+    for i, (values, tv, ad) in enumerate(CASES):
+        reader = RegistryReader(FakeWinreg(values))
+        got = (get_teamviewer_id(reader), get_anydesk_id(reader))
+        if got != (tv, ad):
+            failures.append((i, (tv, ad), got))
+    return failures
+
+
+def _fake_registry(key_count):
+    """Registre factice de key_count clés, TeamViewer en 32 bits"""
+    values = {(HKEY_LOCAL_MACHINE, rf"SOFTWARE\Editeur {i}", "Version"): (str(i), REG_SZ)
+              for i in range(key_count)}
+    values[(HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\TeamViewer", "ClientID")] = (
+        1234567890, REG_DWORD)
+    return FakeWinreg(values)
+
+
+def bench_reads(key_counts=KEY_COUNTS):
+    """
+    Returns:
+        list: Lignes de résultats
+    """
+    rows = []
+    for n in key_counts:
+        backend = _fake_registry(n)
+
+        def cold():
+            return get_teamviewer_id(RegistryReader(backend)), get_anydesk_id(RegistryReader(backend))
+
+        ms, peak, _ = _measure(cold)
+        rows.append(_row(f"ID à froid n={n}", ms, peak, 0))
+        reader = RegistryReader(backend)
+        before = backend.opens
+        get_teamviewer_id(reader), get_anydesk_id(reader)
+        cold_opens = backend.opens - before
+        before = backend.opens
+        ms, peak, _ = _measure(lambda: (get_teamviewer_id(reader), get_anydesk_id(reader)))
+        rows.append(_row(f"ID en cache n={n}", ms, peak, 0))
+        print(f"   n={n}: {cold_opens} ouverture(s) de clé à froid, "
+              f"{backend.opens - before} en cache")
+    return rows
+
+
+def bench_tweaks():
+    """
+    Returns:
+        list: Lignes de résultats
+    """
+    tweaks = (NOTIFICATION_TWEAKS + UAC_TWEAKS + DIRECTORY_CACHE_TWEAKS + POWER_BUTTON_TWEAKS
+              + active_hours_tweaks(8, 22))
+
+    def fresh():
+        backend = FakeWinreg()
+        return RegistryEngine(backend, RegistryReader(backend)).apply(tweaks)
+
+    ms, peak, _ = _measure(fresh)
+    rows = [_row(f"tweaks poste vierge ({len(tweaks)})", ms, peak, 0)]
+    backend = FakeWinreg()
+    engine = RegistryEngine(backend, RegistryReader(backend))
+    engine.apply(tweaks)
+    first = (backend.opens, backend.writes)
+    backend.opens = backend.writes = 0
+    engine.apply(tweaks)
+    print(f"   tweaks: {first[0]} ouverture(s) / {first[1]} écriture(s) au premier passage, "
+          f"{backend.opens} / {backend.writes} au passage suivant")
+    ms, peak, _ = _measure(lambda: engine.apply(tweaks))
+    rows.append(_row(f"tweaks déjà appliqués ({len(tweaks)})", ms, peak, 0))
+
+    folder = tempfile.mkdtemp(prefix="registry-journal-")
+    try:
+        journal = RegistryJournal(folder)
+
+        def journaled():
+            backend = FakeWinreg()
+            engine = RegistryEngine(backend, RegistryReader(backend), journal)
+            with engine.run("bench") as run:
+                engine.apply(tweaks)
+            return engine, run[0]
+
+        ms, peak, (engine, run_id) = _measure(journaled)
+        rows.append(_row(f"tweaks journalisés ({len(tweaks)})", ms, peak, 0))
+        ms, peak, _ = _measure(lambda: engine.rollback(run_id))
+        rows.append(_row(f"annulation ({len(tweaks)})", ms, peak, 0))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return rows
+
+
+def run_all():
+    """Exécute tous les benchmarks"""
+    return bench_reads() + bench_tweaks()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks accès au registre")
+    parser.add_argument("--save", action="store_true", help="enregistrer comme référence")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="fichier de référence")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    print("=" * 76)
+    print("BENCHMARKS registre")
+    print("=" * 76)
+    failures = check_cases()
+    if failures:
+        print(f"❌ {len(failures)} cas en échec:")
+        for case, expected, got in failures:
+            print(f"   • cas {case}: attendu {expected!r}, obtenu {got!r}")
+        return 1
+    print(f"✅ {len(CASES)} cas de lecture d'ID corrects\n")
+
+    rows = run_all()
+    baseline = {} if args.save else load_baseline(args.baseline)
+    print_rows(rows, baseline)
+
+    if args.save:
+        save_baseline(rows, args.baseline)
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+        return 0
+    regressions = compare(rows, baseline, args.threshold) if baseline else []
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) (> {args.threshold * 100:.0f} % plus lent):")
+        for name in regressions:
+            print(f"   • {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Banc de débit du partage veloce en ligne de commande
+Sans --share, le banc tourne dans un dossier temporaire local qui tient lieu de
+partage (vérification sous Linux, référence du disque local).
+
+    python -m benchmarks.bench_share                       # dossier temporaire local
+    python -m benchmarks.bench_share --share \\\\SV\\veloce  # partage du serveur
+    python -m benchmarks.bench_share --save                # enregistre benchmarks/baselines_share.json
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.bench_printer import (_row, compare, load_baseline, print_rows,
+                                      save_baseline, REGRESSION_THRESHOLD)
+from services.share_benchmark import run_share_benchmark
+
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines_share.json")
+
+
+def report_rows(report):
+    """
+    Returns:
+        list: Lignes de résultats (débit séquentiel puis une ligne par opération)
+    """
+    rows = []
+    for kind, (nbytes, seconds) in report.throughput.items():
+        rows.append(_row(f"{kind} séquentielle", seconds * 1000, 0, nbytes))
+    for op, values in report.latencies.items():
+        rows.append(_row(op, sum(values) / len(values), 0, 0))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc de débit du partage veloce")
+    parser.add_argument("--share", help="dossier ou partage cible (défaut: dossier temporaire)")
+    parser.add_argument("--size", type=float, default=16, help="taille des gros fichiers (Mo)")
+    parser.add_argument("--count", type=int, default=4, help="nombre de gros fichiers")
+    parser.add_argument("--small", type=int, default=200, help="nombre de petits fichiers")
+    parser.add_argument("--save", action="store_true", help="enregistrer comme référence")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="fichier de référence")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    print("=" * 76)
+    print("BANC DE DÉBIT DU PARTAGE")
+    print("=" * 76)
+    share = args.share or tempfile.mkdtemp(prefix="veloce-share-")
+    try:
+        report = run_share_benchmark(share, print, file_size_mb=args.size,
+                                     file_count=args.count, small_files=args.small)
+    finally:
+        if not args.share:
+            shutil.rmtree(share, ignore_errors=True)
+    if report is None or report.errors:
+        return 1
+    print()
+    for line in report.format_lines():
+        print(line)
+    print()
+
+    rows = report_rows(report)
+    baseline = {} if args.save else load_baseline(args.baseline)
+    print_rows(rows, baseline)
+    if args.save:
+        save_baseline(rows, args.baseline)
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+        return 0
+    regressions = compare(rows, baseline, args.threshold) if baseline else []
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) (> {args.threshold * 100:.0f} % plus lent):")
+        for name in regressions:
+            print(f"   • {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmarks et corpus de référence des raccourcis .lnk
+- vérifie d'abord chaque fixture de benchmarks/fixtures/lnk: octets identiques à
+  build_shell_link et relecture (cible, dossier de travail, arguments, icône)
+- mesure la construction d'un raccourci et l'écriture de lots de raccourcis
+
+    python -m benchmarks.bench_shell_link --save     # enregistre benchmarks/baselines_shell_link.json
+    python -m benchmarks.bench_shell_link            # vérifie le corpus puis compare à la référence
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+
+from benchmarks.bench_printer import (_measure, _row, compare, load_baseline,
+                                      print_rows, save_baseline, REGRESSION_THRESHOLD)
+from services.shell_link import ShellLink, build_shell_link, read_shortcut, write_shortcut
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "lnk")
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines_shell_link.json")
+SHORTCUT_COUNTS = (3, 30, 300)
+
+
+def load_corpus():
+    with open(os.path.join(FIXTURES_DIR, "expected.json"), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def check_corpus(corpus=None):
+    """
+    Compare chaque fixture aux octets produits et au contenu relu
+
+    Returns:
+        list: (fichier, attendu, obtenu) des fixtures en échec
+    """
+    failures = []
+    for case in corpus or load_corpus():
+        path = os.path.join(FIXTURES_DIR, case["file"])
+        expected = ShellLink(**case["expected"])
+        with open(path, "rb") as f:
+            data = f.read()
+        built = build_shell_link(expected)
+        if built != data:
+            failures.append((case["file"], f"{len(data)} octets", f"{len(built)} octets différents"))
+            continue
+        got = read_shortcut(path)
+        if got != expected:
+            failures.append((case["file"], expected, got))
+    return failures
+
+
+def bench_shortcuts(counts=SHORTCUT_COUNTS):
+    """
+    Returns:
+        list: Lignes de résultats
+    """
+    velsrv = ShellLink(r"c:\veloce\velsrv.exe", r"c:\veloce", "", r"c:\veloce\velsrv.exe", 1)
+    ms, peak, data = _measure(lambda: build_shell_link(velsrv))
+    rows = [_row("build_shell_link", ms, peak, len(data))]
+
+    folder = tempfile.mkdtemp(prefix="lnk-")
+    try:
+        for n in counts:
+            def write_all():
+                for i in range(n):
+                    write_shortcut(os.path.join(folder, f"station {i}.lnk"),
+                                   rf"\\SV\veloce\stat{i:02d}\install\WS Starter.exe",
+                                   working_dir=rf"\\SV\veloce\stat{i:02d}")
+
+            ms, peak, _ = _measure(write_all)
+            rows.append(_row(f"write_shortcut x{n}", ms, peak, 0))
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks raccourcis .lnk")
+    parser.add_argument("--save", action="store_true", help="enregistrer comme référence")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="fichier de référence")
+    parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    args = parser.parse_args()
+
+    print("=" * 76)
+    print("BENCHMARKS raccourcis .lnk")
+    print("=" * 76)
+    corpus = load_corpus()
+    failures = check_corpus(corpus)
+    if failures:
+        print(f"❌ {len(failures)} fixture(s) en échec:")
+        for name, expected, got in failures:
+            print(f"   • {name}: attendu {expected!r}, obtenu {got!r}")
+        return 1
+    print(f"✅ {len(corpus)} fixtures identiques octet par octet\n")
+
+    rows = bench_shortcuts()
+    baseline = {} if args.save else load_baseline(args.baseline)
+    print_rows(rows, baseline)
+
+    if args.save:
+        save_baseline(rows, args.baseline)
+        print(f"\n💾 Référence enregistrée: {args.baseline}")
+        return 0
+    regressions = compare(rows, baseline, args.threshold) if baseline else []
+    if regressions:
+        print(f"\n❌ {len(regressions)} régression(s) (> {args.threshold * 100:.0f} % plus lent):")
+        for name in regressions:
+            print(f"   • {name}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
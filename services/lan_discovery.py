@@ -0,0 +1,233 @@
+"""
+Découverte des postes du réseau local
+Balaye les sous-réseaux locaux (SMB 445 et autres ports connus), résout les noms en
+parallèle et repère les serveurs exposant le partage "veloce". Les résultats sont
+gardés pour la session afin que les formulaires de configuration restent rapides.
+"""
+import asyncio
+import ipaddress
+import os
+import socket
+import threading
+import time
+from dataclasses import dataclass, field
+
+from utils.network_utils import local_subnets
+
+# SMB, NetBIOS, Bureau à distance, Veloce
+LAN_PORTS = (445, 139, 3389, 40000)
+SMB_PORT = 445
+VELOCE_SHARE = "veloce"
+
+_cache = {}
+_cache_lock = threading.Lock()
+
+
+@dataclass
+class LanHost:
+    """Poste du réseau local ayant répondu au balayage"""
+    ip: str
+    name: str = ""
+    open_ports: list = field(default_factory=list)
+    rtt_ms: float = 0.0
+    veloce_share: bool = False
+
+    @property
+    def label(self):
+        """Nom NetBIOS/DNS court, sinon l'adresse IP"""
+        return self.name or self.ip
+
+
+async def _connect_rtt(host, port, timeout):
+    """Tente une connexion TCP; retourne le RTT en ms ou None"""
+    t0 = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    rtt = (time.perf_counter() - t0) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return rtt
+
+
+def _reverse_name(ip):
+    """Nom court de l'hôte (DNS/NetBIOS selon le système), ou "" """
+    try:
+        name = socket.gethostbyaddr(ip)[0]
+    except OSError:
+        return ""
+    return name.split(".")[0].upper() if name != ip else ""
+
+
+def _settle(future, result, error):
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+async def _call_with_deadline(fn, arg, timeout):
+    """
+    Exécute fn(arg) dans un thread démon et attend au plus timeout secondes
+
+    Un appel bloqué (gethostbyaddr, chemin UNC) ne retient ni la boucle, ni
+    asyncio.run à sa fermeture, ni le pool de threads par défaut: son thread est
+    abandonné et son résultat ignoré.
+
+    Raises:
+        asyncio.TimeoutError: Si fn n'a pas terminé à temps
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def run():
+        try:
+            result, error = fn(arg), None
+        except Exception as e:
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(_settle, future, result, error)
+        except RuntimeError:
+            pass  # boucle déjà fermée: résultat arrivé trop tard
+
+    threading.Thread(target=run, daemon=True).start()
+    return await asyncio.wait_for(future, timeout)
+
+
+def has_veloce_share(host):
+    """Vérifie la présence du partage \\\\host\\veloce (chemin UNC, Windows)"""
+    return os.path.isdir(f"\\\\{host}\\{VELOCE_SHARE}")
+
+
+async def discover_lan_hosts(subnets=None, ports=LAN_PORTS, concurrency=256, timeout=0.4,
+                             name_timeout=2.0, share_check=has_veloce_share, on_found=None):
+    """
+    Balaye les sous-réseaux et identifie les postes et serveurs Veloce
+
+    Tous les couples (hôte, port) sont sondés en parallèle; la résolution de nom et la
+    recherche du partage se font ensuite, en parallèle, pour les seuls hôtes trouvés,
+    chacune bornée à name_timeout même si l'appel système reste bloqué.
+
+    Args:
+        subnets (list): Réseaux à balayer (défaut: local_subnets())
+        ports (tuple): Ports sondés sur chaque hôte
+        concurrency (int): Nombre maximal de connexions simultanées
+        timeout (float): Timeout par tentative de connexion (s)
+        name_timeout (float): Timeout de résolution de nom / d'accès au partage (s)
+        share_check (callable): Fonction (hôte) -> bool, partage veloce présent
+        on_found (callable): Appelée (LanHost) dès qu'un hôte est identifié
+
+    Returns:
+        list: LanHost triés par adresse
+    """
+    if subnets is None:
+        subnets = local_subnets()
+    sem = asyncio.Semaphore(concurrency)
+    hosts = {}
+
+    async def probe(ip, port):
+        async with sem:
+            rtt = await _connect_rtt(ip, port, timeout)
+        if rtt is not None:
+            host = hosts.setdefault(ip, LanHost(ip, rtt_ms=rtt))
+            host.open_ports.append(port)
+            host.rtt_ms = min(host.rtt_ms, rtt)
+
+    await asyncio.gather(*(probe(str(ip), port)
+                           for net in subnets for ip in net.hosts() for port in ports))
+
+    async def identify(host):
+        host.open_ports.sort()
+        try:
+            host.name = await _call_with_deadline(_reverse_name, host.ip, name_timeout)
+        except asyncio.TimeoutError:
+            pass
+        if SMB_PORT in host.open_ports and share_check:
+            try:
+                host.veloce_share = await _call_with_deadline(share_check, host.label,
+                                                              name_timeout)
+            except (asyncio.TimeoutError, OSError):
+                host.veloce_share = False
+        if on_found:
+            on_found(host)
+
+    await asyncio.gather(*(identify(h) for h in hosts.values()))
+    return sorted(hosts.values(), key=lambda h: ipaddress.IPv4Address(h.ip))
+
+
+def cached_lan_hosts(subnets=None):
+    """Résultat du dernier balayage de la session (ou None)"""
+    with _cache_lock:
+        return _cache.get(_cache_key(subnets))
+
+
+def _cache_key(subnets):
+    return tuple(str(n) for n in subnets) if subnets is not None else None
+
+
+def run_lan_discovery(log_fn, subnets=None, refresh=False, **kwargs):
+    """
+    Exécute discover_lan_hosts de façon synchrone, avec cache de session
+
+    Args:
+        log_fn (callable): Fonction de logging
+        subnets (list): Réseaux à balayer (défaut: local_subnets())
+        refresh (bool): Ignorer le cache et refaire le balayage
+        **kwargs: Options de discover_lan_hosts (ports, timeout, share_check...)
+
+    Returns:
+        list: LanHost triés par adresse
+    """
+    cached = None if refresh else cached_lan_hosts(subnets)
+    if cached is not None:
+        log_fn(f"ℹ️ {len(cached)} poste(s) du dernier balayage (cache de session)")
+        return cached
+    try:
+        nets = local_subnets() if subnets is None else subnets
+    except Exception as e:
+        log_fn(f"❌ Impossible de lister les interfaces réseau: {e}")
+        return []
+    if not nets:
+        log_fn("⚠️ Aucune interface IPv4 active")
+        return []
+
+    log_fn(f"🔍 Recherche des postes sur {', '.join(str(n) for n in nets)}...")
+
+    def found(host):
+        tag = " 📁 partage veloce" if host.veloce_share else ""
+        log_fn(f"  🖥️ {host.label} ({host.ip}) ports {', '.join(map(str, host.open_ports))}"
+               f" - {host.rtt_ms:.0f} ms{tag}")
+
+    t0 = time.perf_counter()
+    hosts = asyncio.run(discover_lan_hosts(nets, on_found=found, **kwargs))
+    servers = [h for h in hosts if h.veloce_share]
+    log_fn(f"✅ {len(hosts)} poste(s), {len(servers)} serveur(s) Veloce "
+           f"en {time.perf_counter() - t0:.1f} s")
+    with _cache_lock:
+        _cache[_cache_key(subnets)] = hosts
+    return hosts
+
+
+def veloce_servers(hosts):
+    """Noms des serveurs exposant le partage veloce (pour une liste de choix)"""
+    return [h.label for h in hosts if h.veloce_share]
+
+
+def probe_smb(server, timeout=1.5):
+    """
+    Vérifie qu'un serveur répond sur SMB (445), sans passer par ping/le shell
+
+    Returns:
+        bool: True si la connexion TCP a abouti
+    """
+    try:
+        with socket.create_connection((server, SMB_PORT), timeout=timeout):
+            return True
+    except OSError:
+        return False
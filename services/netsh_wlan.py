@@ -0,0 +1,94 @@
+"""
+Analyse des sorties netsh WLAN
+Moteur unique, français et anglais, pour la liste des profils WiFi, le détail
+d'un profil (clé en clair) et les profils exportés en XML.
+"""
+import re
+import xml.etree.ElementTree as ET
+
+# Liste des profils ("netsh wlan show profiles")
+#   EN:     All User Profile     : Bureau
+#   FR:     Profil Tous les utilisateurs : Bureau
+_PROFILE_LIST_RE = re.compile(
+    r"^[ \t]*(?:All User Profile|Current User Profile|Profil Tous les utilisateurs"
+    r"|Profil (?:de l'|d')utilisateur (?:actuel|courant))[ \t]*:[ \t]*(?P<name>.*?)[ \t]*\r?$",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Détail d'un profil ("netsh wlan show profile name=... key=clear"), une seule passe:
+# le nom du groupe trouvé indique le champ. "cl." tolère un é mal décodé.
+_PROFILE_DETAIL_RE = re.compile(
+    r"^[ \t]*(?:(?P<key>Key Content|Contenu de la cl.)"
+    r"|(?P<name>Name|Nom)"
+    r"|(?P<auth>Authentication|Authentification))"
+    r"[ \t]*:[ \t]?(?P<value>[^\r\n]*)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Espace de noms des profils exportés par "netsh wlan export profile"
+WLAN_PROFILE_NS = {"w": "http://www.microsoft.com/networking/WLAN/profile/v1"}
+
+
+def parse_profile_list(text):
+    """
+    Extrait les noms de profils de "netsh wlan show profiles"
+
+    Args:
+        text (str): Sortie décodée de netsh
+
+    Returns:
+        list: Noms des profils, sans doublons, dans l'ordre d'apparition
+    """
+    names = (m.group("name").strip('"') for m in _PROFILE_LIST_RE.finditer(text))
+    return list(dict.fromkeys(n for n in names if n))
+
+
+def parse_profile_detail(text):
+    """
+    Extrait nom, authentification et clé de "netsh wlan show profile ... key=clear"
+
+    Seule la première occurrence de chaque champ est retenue (le nom du profil
+    précède les paramètres de connectivité; plusieurs authentifications possibles).
+
+    Args:
+        text (str): Sortie décodée de netsh
+
+    Returns:
+        dict: {"name", "authentication", "key"}; valeurs None si absentes
+    """
+    fields = {"name": None, "authentication": None, "key": None}
+    for m in _PROFILE_DETAIL_RE.finditer(text):
+        if m.group("key"):
+            field = "key"
+        elif m.group("name"):
+            field = "name"
+        else:
+            field = "authentication"
+        if fields[field] is None:
+            fields[field] = m.group("value").rstrip()
+    return fields
+
+
+def parse_wlan_profile_xml(data):
+    """
+    Extrait le nom et la clé d'un profil WiFi exporté (XML netsh)
+
+    Args:
+        data (bytes | str): Contenu du fichier XML
+
+    Returns:
+        tuple: (nom du profil, clé en clair ou None si réseau ouvert / clé protégée)
+    """
+    root = ET.fromstring(data)
+    name = root.findtext("w:name", default="", namespaces=WLAN_PROFILE_NS).strip()
+    if not name:
+        name = root.findtext("w:SSIDConfig/w:SSID/w:name", default="",
+                             namespaces=WLAN_PROFILE_NS).strip()
+    shared = root.find("w:MSM/w:security/w:sharedKey", WLAN_PROFILE_NS)
+    key = None
+    if shared is not None:
+        protected = shared.findtext("w:protected", default="false",
+                                    namespaces=WLAN_PROFILE_NS).strip().lower()
+        if protected != "true":
+            key = shared.findtext("w:keyMaterial", namespaces=WLAN_PROFILE_NS)
+    return name, key
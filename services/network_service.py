@@ -2,88 +2,201 @@
 Service de gestion réseau
 Gère les opérations réseau: vérification de ports, récupération de mots de passe WiFi, etc.
 """
+import asyncio
+import glob
+import json
+import os
+import queue
+import re
 import socket
 import subprocess
-import re
-import unicodedata
+import tempfile
 import threading
+import time
+import urllib.parse
+import urllib.request
+import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from services.netsh_wlan import (parse_profile_detail, parse_profile_list,
+                                 parse_wlan_profile_xml)
+from services.registry_service import HKEY_LOCAL_MACHINE, registry_reader
+from utils.console_encoding import decode_output
 from utils.system_utils import is_admin, relaunch_as_admin
 
 
-def check_tcp_port(host, port, log_fn):
+# Services d'IP publique: (nom, URL, format de réponse "json" {"ip": ...} ou "text")
+IP_PROVIDERS = (
+    ("ipify", "https://api.ipify.org?format=json", "json"),
+    ("my-ip.io", "https://api.my-ip.io/ip", "text"),
+)
+
+# Vérificateurs de port externes: (nom, URL, type). {ip} et {port} sont substitués.
+#   "json_get": GET, réponse JSON {"open": bool} ou {"status": "open"}
+#   "form_post": POST remoteAddress/portNumber, réponse texte contenant open/closed
+PORT_CHECKERS = (
+    ("portchecker.co", "https://api.portchecker.co/check?host={ip}&port={port}", "json_get"),
+    ("yougetsignal.com", "https://ports.yougetsignal.com/check-port.php", "form_post"),
+)
+
+# Durée de validité de l'IP publique en cache (s)
+PUBLIC_IP_TTL = 300
+
+_public_ip_cache = {"ip": None, "expires": 0.0}
+_public_ip_lock = threading.Lock()
+
+
+def _http_request(url, data=None, headers=None, timeout=5):
+    req = urllib.request.Request(url, data=data, headers={
+        'User-Agent': 'Mozilla/5.0', **(headers or {})})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return response.read().decode('utf-8', errors='replace')
+
+
+def _race(calls, timeout, conclusive=lambda result: result is not None):
+    """
+    Exécute des appels en parallèle et retourne le premier résultat concluant
+    
+    Les appels tournent dans des threads démons: un service lent n'est pas attendu
+    (ni à la fermeture de l'application) une fois qu'un autre a répondu.
+    
+    Args:
+        calls (list): (nom, fonction sans argument)
+        timeout (float): Attente maximale globale (s)
+        conclusive (callable): Indique si un résultat met fin à la course
+    
+    Returns:
+        tuple: (nom, résultat, {nom: erreur}); (None, None, erreurs) si aucun concluant
+    """
+    results = queue.Queue()
+    
+    def run(name, fn):
+        try:
+            results.put((name, fn(), None))
+        except Exception as e:
+            results.put((name, None, e))
+    
+    for name, fn in calls:
+        threading.Thread(target=run, args=(name, fn), daemon=True).start()
+    
+    errors = {}
+    deadline = time.monotonic() + timeout
+    for _ in range(len(calls)):
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+        try:
+            name, result, error = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if error is None and conclusive(result):
+            return name, result, errors
+        errors[name] = error or "réponse non concluante"
+    return None, None, errors
+
+
+def get_public_ip(providers=None, ttl=PUBLIC_IP_TTL, timeout=5, refresh=False):
+    """
+    Retourne l'IP publique, interrogeant les services en parallèle (mise en cache ttl s)
+    
+    Args:
+        providers (tuple): Services (nom, URL, "json"|"text") (défaut: IP_PROVIDERS)
+        ttl (float): Durée de validité du cache (s)
+        timeout (float): Timeout par requête (s)
+        refresh (bool): Ignorer le cache
+    
+    Returns:
+        tuple: (IP publique ou None, source: nom du service ou "cache")
+    """
+    now = time.monotonic()
+    with _public_ip_lock:
+        if not refresh and _public_ip_cache["ip"] and now < _public_ip_cache["expires"]:
+            return _public_ip_cache["ip"], "cache"
+    
+    def fetch(url, kind):
+        body = _http_request(url, timeout=timeout)
+        ip = json.loads(body)['ip'] if kind == "json" else body.strip()
+        socket.inet_aton(ip)  # rejette une page d'erreur à la place de l'IP
+        return ip
+    
+    calls = [(name, lambda u=url, k=kind: fetch(u, k))
+             for name, url, kind in (providers or IP_PROVIDERS)]
+    name, ip, _ = _race(calls, timeout + 1)
+    if ip:
+        with _public_ip_lock:
+            _public_ip_cache.update(ip=ip, expires=time.monotonic() + ttl)
+    return ip, name
+
+
+def _check_port_with(kind, url, ip, port, timeout):
+    """
+    Interroge un vérificateur de port externe
+    
+    Returns:
+        bool | None: True ouvert, False fermé, None réponse non concluante
+    """
+    if kind == "json_get":
+        body = _http_request(url.format(ip=ip, port=port),
+                             headers={'Accept': 'application/json'}, timeout=timeout)
+        result = json.loads(body)
+        if 'open' in result:
+            return bool(result['open'])
+        status = str(result.get('status', '')).lower()
+        return {'open': True, 'closed': False}.get(status)
+    data = urllib.parse.urlencode({'remoteAddress': ip, 'portNumber': port}).encode()
+    text = _http_request(url.format(ip=ip, port=port), data=data, headers={
+        'Content-Type': 'application/x-www-form-urlencoded'}, timeout=timeout).lower()
+    if 'open' in text:
+        return True
+    if 'closed' in text:
+        return False
+    return None
+
+
+def check_tcp_port(host, port, log_fn, ip_providers=None, checkers=None, timeout=20):
     """
     Vérifie si un port TCP est accessible depuis l'EXTÉRIEUR (internet)
-    Utilise plusieurs services de vérification de port pour plus de fiabilité
+    Les services de vérification sont interrogés en parallèle: la première réponse
+    concluante l'emporte, un service lent ou en panne ne retarde plus le résultat.
     
     Args:
         host (str): Adresse de l'hôte (ignoré, utilise l'IP publique)
         port (int): Numéro de port
         log_fn (callable): Fonction de logging
+        ip_providers (tuple): Services d'IP publique (défaut: IP_PROVIDERS)
+        checkers (tuple): Vérificateurs de port (défaut: PORT_CHECKERS)
+        timeout (float): Attente maximale des vérificateurs (s)
+    
+    Returns:
+        bool | None: True ouvert, False fermé, None indéterminé
     """
     log_fn(f"🔎 Vérification de l'accessibilité EXTERNE du port {port}...")
     log_fn("⏳ Test depuis l'extérieur (internet)...")
     
     try:
-        import urllib.request
-        import urllib.parse
-        import json
-        
-        # Récupérer l'IP publique d'abord
         log_fn("📡 Récupération de votre IP publique...")
-        try:
-            ip_response = urllib.request.urlopen('https://api.ipify.org?format=json', timeout=5)
-            public_ip = json.loads(ip_response.read().decode())['ip']
-        except:
-            # Backup API
-            ip_response = urllib.request.urlopen('https://api.my-ip.io/ip', timeout=5)
-            public_ip = ip_response.read().decode().strip()
-        
-        log_fn(f"🌐 Votre IP publique: {public_ip}")
-        
-        # Vérifier le port avec API externe (seule méthode fiable)
-        log_fn(f"🔍 Test du port {port} depuis l'extérieur...")
+        public_ip, source = get_public_ip(ip_providers)
+        if not public_ip:
+            log_fn("❌ IP publique introuvable (aucun service n'a répondu)")
+            log_fn(f"⚠️  Vérifiez manuellement le port sur: https://canyouseeme.org")
+            return None
+        log_fn(f"🌐 Votre IP publique: {public_ip}"
+               + (" (en cache)" if source == "cache" else f" (via {source})"))
         
-        is_open = None
-        error_msg = ""
-        
-        # Méthode 1: API portchecker.co
-        try:
-            log_fn("  → Test via portchecker.co...")
-            check_url = f'https://api.portchecker.co/check?host={public_ip}&port={port}'
-            req = urllib.request.Request(check_url, headers={
-                'User-Agent': 'Mozilla/5.0',
-                'Accept': 'application/json'
-            })
-            response = urllib.request.urlopen(req, timeout=20)
-            result = json.loads(response.read().decode('utf-8'))
-            is_open = result.get('open', False) or result.get('status', '').lower() == 'open'
-            log_fn(f"  ✓ Réponse API: {result}")
-        except Exception as e:
-            log_fn(f"  ✗ Erreur API portchecker.co: {e}")
-            error_msg = str(e)
-            
-        # Méthode 2 (backup): API yougetsignal.com
-        if is_open is None:
-            try:
-                log_fn("  → Test via yougetsignal.com...")
-                check_url = f'https://ports.yougetsignal.com/check-port.php'
-                data = urllib.parse.urlencode({'remoteAddress': public_ip, 'portNumber': port}).encode()
-                req = urllib.request.Request(check_url, data=data, headers={
-                    'User-Agent': 'Mozilla/5.0',
-                    'Content-Type': 'application/x-www-form-urlencoded'
-                })
-                response = urllib.request.urlopen(req, timeout=20)
-                text = response.read().decode('utf-8').lower()
-                if 'open' in text:
-                    is_open = True
-                    log_fn(f"  ✓ Port détecté ouvert")
-                elif 'closed' in text:
-                    is_open = False
-                    log_fn(f"  ✓ Port détecté fermé")
-            except Exception as e:
-                log_fn(f"  ✗ Erreur API yougetsignal: {e}")
-                if not error_msg:
-                    error_msg = str(e)
+        checkers = checkers or PORT_CHECKERS
+        log_fn(f"🔍 Test du port {port} depuis l'extérieur "
+               f"({', '.join(name for name, _, _ in checkers)} en parallèle)...")
+        calls = [(name, lambda u=url, k=kind: _check_port_with(k, u, public_ip, port, timeout))
+                 for name, url, kind in checkers]
+        start = time.monotonic()
+        winner, is_open, errors = _race(calls, timeout + 1)
+        for name, _, _ in checkers:
+            if name in errors:
+                log_fn(f"  ✗ {name}: {errors[name]}")
+            elif not winner:
+                log_fn(f"  ✗ {name}: pas de réponse en {timeout:.0f} s")
+        if winner:
+            log_fn(f"  ✓ Réponse de {winner} en {time.monotonic() - start:.1f} s")
         
         # Afficher le résultat final
         log_fn("")
@@ -96,55 +209,265 @@ def check_tcp_port(host, port, log_fn):
             log_fn(f"   Pour l'ouvrir: configurez le NAT/Port Forwarding dans votre routeur")
         else:
             log_fn(f"⚠️  Impossible de vérifier le port {port}")
-            log_fn(f"   Erreur: {error_msg}")
             log_fn(f"   Vérifiez manuellement sur: https://canyouseeme.org")
+        return is_open
         
     except Exception as e:
         log_fn(f"❌ Erreur générale: {e}")
         log_fn(f"⚠️  Vérifiez manuellement le port sur: https://canyouseeme.org")
+        return None
+
+
+OPEN = "ouvert"
+CLOSED = "fermé"
+FILTERED = "filtré"
+
+# Au-delà de ce nombre de ports, seuls les ports ouverts sont affichés au fil de l'eau
+SCAN_VERBOSE_LIMIT = 64
+
+# Windows ne remonte WSAECONNREFUSED qu'après avoir réémis le SYN pendant ~1 s
+# (2 retransmissions à 500 ms): sous ce délai, un port fermé paraît filtré
+SCAN_TIMEOUT = 2.5
 
 
-def _decode_bytes(b):
+@dataclass
+class PortScanResult:
+    """Résultat du test d'un port"""
+    port: int
+    state: str
+    rtt_ms: float = None
+    error: str = ""
+
+
+def parse_port_spec(spec):
     """
-    Tente de décoder des bytes avec différents encodages
+    Convertit une liste de ports "80,443,9100-9102" en liste triée
     
     Args:
-        b (bytes): Données à décoder
+        spec (str): Ports et plages séparés par des virgules ou espaces
     
     Returns:
-        str: Chaîne décodée
+        list: Ports uniques triés
+    
+    Raises:
+        ValueError: Si un port ou une plage est invalide
     """
-    for enc in ("cp1252", "cp850", "utf-8", "latin-1"):
-        try:
-            return b.decode(enc)
-        except Exception:
+    ports = set()
+    for part in re.split(r"[,;\s]+", spec.strip()):
+        if not part:
             continue
-    return b.decode("utf-8", errors="replace")
+        first, sep, last = part.partition("-")
+        start = int(first)
+        end = int(last) if sep else start
+        if not (1 <= start <= end <= 65535):
+            raise ValueError(f"Plage de ports invalide: {part}")
+        ports.update(range(start, end + 1))
+    return sorted(ports)
+
+
+async def _scan_port(addr, port, timeout):
+    """
+    Teste un port: ouvert, fermé (RST) ou filtré (timeout, erreur réseau)
+    
+    Sous Windows, un RST n'est signalé qu'après ~1 s de retransmissions du SYN;
+    timeout doit donc dépasser nettement 1 s pour distinguer fermé de filtré.
+    """
+    t0 = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(addr, port), timeout)
+    except ConnectionRefusedError:
+        # RST reçu: hôte joignable, aucun service sur ce port
+        return PortScanResult(port, CLOSED, (time.perf_counter() - t0) * 1000)
+    except asyncio.TimeoutError:
+        return PortScanResult(port, FILTERED)
+    except OSError as e:
+        return PortScanResult(port, FILTERED, error=e.strerror or str(e))
+    rtt = (time.perf_counter() - t0) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except Exception:
+        pass
+    return PortScanResult(port, OPEN, rtt)
 
 
-def _normalize_text(s):
+async def scan_ports(host, ports, concurrency=200, timeout=SCAN_TIMEOUT, on_result=None):
     """
-    Normalise le texte pour gérer les encodages corrompus de Windows
+    Teste des ports TCP d'un hôte en parallèle
+    
+    Le nom est résolu une seule fois avant le balayage.
     
     Args:
-        s (str): Texte à normaliser
+        host (str): Nom ou adresse de l'hôte
+        ports (iterable): Ports à tester
+        concurrency (int): Nombre maximal de connexions simultanées
+        timeout (float): Timeout par tentative de connexion (s); au moins 2 s
+            sous Windows, qui met ~1 s à signaler un port fermé
+        on_result (callable): Appelée (PortScanResult) dès qu'un port est testé
     
     Returns:
-        str: Texte normalisé
+        list: PortScanResult triés par port
+    
+    Raises:
+        socket.gaierror: Si le nom d'hôte ne peut pas être résolu
     """
-    s = unicodedata.normalize("NFKC", s)
+    infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    addr = infos[0][4][0]
+    sem = asyncio.Semaphore(concurrency)
     
-    replacements = {
-        "Ã©": "é", "Ã¨": "è", "Ãª": "ê", "Ã«": "ë", "Ã ": "à",
-        "Ã¢": "â", "Ã´": "ô", "Ã¹": "ù", "Ã»": "û", "Ã§": "ç",
-        "Â": "", "\u00A0": " "
-    }
+    async def probe(port):
+        async with sem:
+            return await _scan_port(addr, port, timeout)
     
-    for k, v in replacements.items():
-        s = s.replace(k, v)
+    results = []
+    for fut in asyncio.as_completed([probe(p) for p in ports]):
+        result = await fut
+        results.append(result)
+        if on_result:
+            on_result(result)
+    return sorted(results, key=lambda r: r.port)
+
+
+def run_port_scan(host, spec, log_fn, concurrency=200, timeout=SCAN_TIMEOUT, verbose=None):
+    """
+    Exécute scan_ports de façon synchrone, résultats journalisés au fil de l'eau
     
-    s = re.sub(r'[\x00-\x08\x0b\x0c\x0e-\x1f]', '', s)
-    return s
+    Args:
+        host (str): Nom ou adresse de l'hôte (ex: serveur Veloce, imprimante)
+        spec (str): Ports et plages, ex: "80,443,9100-9102"
+        log_fn (callable): Fonction de logging
+        concurrency (int): Nombre maximal de connexions simultanées
+        timeout (float): Timeout par tentative de connexion (s)
+        verbose (bool): Afficher aussi les ports fermés/filtrés (défaut: si peu de ports)
+    
+    Returns:
+        list: PortScanResult triés par port (vide en cas d'erreur)
+    """
+    try:
+        ports = parse_port_spec(spec)
+    except ValueError as e:
+        log_fn(f"⚠️ {e}")
+        return []
+    if not ports:
+        log_fn("⚠️ Aucun port à tester")
+        return []
+    if verbose is None:
+        verbose = len(ports) <= SCAN_VERBOSE_LIMIT
+    icons = {OPEN: "🟢", CLOSED: "🔴", FILTERED: "⚪"}
+    
+    def show(r):
+        if r.state == OPEN or verbose:
+            rtt = f" ({r.rtt_ms:.1f} ms)" if r.rtt_ms is not None else ""
+            detail = f" - {r.error}" if r.error else ""
+            log_fn(f"  {icons[r.state]} {host}:{r.port} {r.state}{rtt}{detail}")
+    
+    log_fn(f"🔍 Scan de {len(ports)} port(s) sur {host} "
+           f"({concurrency} simultanés, timeout {timeout:g} s)...")
+    start = time.perf_counter()
+    try:
+        results = asyncio.run(scan_ports(host, ports, concurrency, timeout, on_result=show))
+    except socket.gaierror as e:
+        log_fn(f"❌ Hôte introuvable: {host} ({e})")
+        return []
+    counts = {state: sum(1 for r in results if r.state == state)
+              for state in (OPEN, CLOSED, FILTERED)}
+    log_fn(f"✅ Scan terminé en {time.perf_counter() - start:.1f} s: "
+           + ", ".join(f"{n} {state}(s)" for state, n in counts.items()))
+    open_ports = [str(r.port) for r in results if r.state == OPEN]
+    if open_ports:
+        log_fn(f"   Ports ouverts: {', '.join(open_ports)}")
+    return results
+
+
+def _read_wlan_profile(path):
+    """Lit un fichier de profil exporté; None si illisible"""
+    try:
+        with open(path, "rb") as f:
+            return parse_wlan_profile_xml(f.read())
+    except (OSError, ET.ParseError):
+        return None
+
+
+def parse_wlan_export_folder(folder, max_workers=8):
+    """
+    Analyse en parallèle les fichiers XML d'un dossier d'export netsh
+    
+    Un profil présent sur plusieurs interfaces n'est gardé qu'une fois.
+    
+    Args:
+        folder (str): Dossier contenant les fichiers *.xml
+        max_workers (int): Nombre de fichiers analysés simultanément
+    
+    Returns:
+        dict: {nom du profil: clé ou None}, trié par nom
+    """
+    paths = glob.glob(os.path.join(folder, "*.xml"))
+    profiles = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for path, result in zip(paths, pool.map(_read_wlan_profile, paths)):
+            if result is None:
+                continue
+            name, key = result
+            if name and profiles.get(name) is None:
+                profiles[name] = key
+    return dict(sorted(profiles.items(), key=lambda item: item[0].casefold()))
+
+
+def export_wifi_profiles(run=subprocess.run):
+    """
+    Récupère tous les profils WiFi en un seul appel "netsh wlan export profile key=clear"
+    
+    Args:
+        run (callable): Exécuteur de commande (défaut: subprocess.run)
+    
+    Returns:
+        dict | None: {nom du profil: clé ou None}, ou None si l'export a échoué
+            (l'appelant se rabat alors sur netsh profil par profil)
+    """
+    with tempfile.TemporaryDirectory(prefix="wlan-export-") as folder:
+        try:
+            proc = run(
+                ["netsh", "wlan", "export", "profile", "key=clear", f"folder={folder}"],
+                capture_output=True, text=False
+            )
+        except OSError:
+            return None
+        if proc.returncode != 0:
+            return None
+        profiles = parse_wlan_export_folder(folder)
+    return profiles or None
+
+
+def netsh_wifi_profiles(run=subprocess.run):
+    """
+    Récupère les profils WiFi avec une commande netsh par profil (repli de l'export)
+    
+    Args:
+        run (callable): Exécuteur de commande (défaut: subprocess.run)
+    
+    Returns:
+        dict: {nom du profil: clé ou None}; vide si aucun profil
+    
+    Raises:
+        subprocess.CalledProcessError: Si la liste des profils est inaccessible
+    """
+    proc = run(["netsh", "wlan", "show", "profiles"], capture_output=True, text=False,
+               check=True)
+    profiles = parse_profile_list(decode_output(proc.stdout))
+    result = {}
+    for profile in profiles:
+        try:
+            detail = run(["netsh", "wlan", "show", "profile", "name=" + profile, "key=clear"],
+                         capture_output=True, text=False, check=True)
+            result[profile] = parse_profile_detail(decode_output(detail.stdout))["key"]
+        except subprocess.CalledProcessError:
+            result[profile] = None
+    return result
+
+
+def _collect_wifi_profiles():
+    """Profils WiFi via l'export groupé, sinon netsh profil par profil"""
+    return export_wifi_profiles() or netsh_wifi_profiles()
 
 
 def get_wifi_passwords(log_fn):
@@ -165,24 +488,7 @@ def get_wifi_passwords(log_fn):
     log_fn("▶ Récupération des profils WiFi et mots de passe...")
     
     try:
-        proc = subprocess.run(
-            ["netsh", "wlan", "show", "profiles"],
-            capture_output=True, text=False, check=True
-        )
-        stdout = _normalize_text(_decode_bytes(proc.stdout))
-        
-        profiles = []
-        for line in stdout.splitlines():
-            m = re.search(
-                r'(?:Profil\s+Tous\s+les\s+utilisateurs|All User Profile|Profil|Profile)[^:]*:\s*(.+)$',
-                line.strip(), flags=re.IGNORECASE
-            )
-            if m:
-                name = m.group(1).strip().strip('"')
-                if name:
-                    profiles.append(name)
-        
-        profiles = list(dict.fromkeys(profiles))
+        profiles = _collect_wifi_profiles()
         
         if not profiles:
             log_fn("❌ Aucun profil WiFi trouvé")
@@ -193,26 +499,8 @@ def get_wifi_passwords(log_fn):
             log_fn(f"📶 Profil: {p}")
         
         log_fn("----- Mots de passe -----")
-        for profile in profiles:
-            try:
-                password_proc = subprocess.run(
-                    ["netsh", "wlan", "show", "profile", "name=" + profile, "key=clear"],
-                    capture_output=True, text=False, check=True
-                )
-                out = _normalize_text(_decode_bytes(password_proc.stdout))
-                
-                m_pwd = re.search(
-                    r'(?im)(?:contenu\s*(?:de\s*la\s*)?cle|cont.*de.*la.*cle|key\s*content|contenu\s*de\s*la\s*cl[eé])[^\:]*:\s*([^\r\n]+)',
-                    out
-                )
-                
-                pwd = m_pwd.group(1).strip() if m_pwd else "Non trouvé"
-                log_fn(f"🔑 {profile}: {pwd}")
-                
-            except subprocess.CalledProcessError as e:
-                log_fn(f"❌ Erreur pour {profile}: Impossible de récupérer le mot de passe")
-            except Exception as e:
-                log_fn(f"❌ Erreur inattendue pour {profile}: {e}")
+        for profile, pwd in profiles.items():
+            log_fn(f"🔑 {profile}: {pwd if pwd is not None else 'Non trouvé'}")
         
         log_fn("✅ Récupération terminée")
         
@@ -220,54 +508,54 @@ def get_wifi_passwords(log_fn):
         log_fn(f"❌ Erreur globale: {e}")
 
 
-def get_teamviewer_id():
+REMOTE_ID_NOT_FOUND = "Non installé ou introuvable"
+
+
+def _read_client_id(path, reader=None):
+    """
+    Lit la valeur ClientID sous HKLM (vues 64 et 32 bits) sans lancer reg.exe
+
+    Args:
+        path (str): Clé du logiciel (ex: SOFTWARE\\TeamViewer)
+        reader (RegistryReader): Lecteur du registre (défaut: registry_reader partagé)
+
+    Returns:
+        str: ID (DWORD converti en décimal) ou REMOTE_ID_NOT_FOUND
+    """
+    found = (reader or registry_reader).read(HKEY_LOCAL_MACHINE, path, "ClientID")
+    if found is None:
+        return REMOTE_ID_NOT_FOUND
+    value = found[0]
+    if isinstance(value, int):
+        return str(value)
+    value = str(value).strip()
+    return value or REMOTE_ID_NOT_FOUND
+
+
+def get_teamviewer_id(reader=None):
     """
     Récupère l'ID TeamViewer
     
+    Args:
+        reader (RegistryReader): Lecteur du registre (défaut: registry_reader partagé)
+    
     Returns:
         str: ID TeamViewer ou message d'erreur
     """
-    try:
-        res = subprocess.check_output(
-            r'reg query "HKLM\SOFTWARE\WOW6432Node\TeamViewer" /v ClientID',
-            shell=True, text=True, stderr=subprocess.DEVNULL
-        )
-        tv_id_raw = res.strip().split()[-1]
-        return str(int(tv_id_raw, 16)) if tv_id_raw.startswith("0x") else tv_id_raw
-    except Exception:
-        try:
-            res = subprocess.check_output(
-                r'reg query "HKLM\SOFTWARE\TeamViewer" /v ClientID',
-                shell=True, text=True, stderr=subprocess.DEVNULL
-            )
-            tv_id_raw = res.strip().split()[-1]
-            return str(int(tv_id_raw, 16)) if tv_id_raw.startswith("0x") else tv_id_raw
-        except Exception:
-            return "Non installé ou introuvable"
+    return _read_client_id(r"SOFTWARE\TeamViewer", reader)
 
 
-def get_anydesk_id():
+def get_anydesk_id(reader=None):
     """
     Récupère l'ID AnyDesk
     
+    Args:
+        reader (RegistryReader): Lecteur du registre (défaut: registry_reader partagé)
+    
     Returns:
         str: ID AnyDesk ou message d'erreur
     """
-    try:
-        res = subprocess.check_output(
-            r'reg query "HKLM\SOFTWARE\AnyDesk" /v "ClientID"',
-            shell=True, text=True, stderr=subprocess.DEVNULL
-        )
-        return res.strip().split()[-1]
-    except Exception:
-        try:
-            res = subprocess.check_output(
-                r'reg query "HKLM\SOFTWARE\WOW6432Node\AnyDesk" /v "ClientID"',
-                shell=True, text=True, stderr=subprocess.DEVNULL
-            )
-            return res.strip().split()[-1]
-        except Exception:
-            return "Non installé ou introuvable"
+    return _read_client_id(r"SOFTWARE\AnyDesk", reader)
 
 
 def show_wifi_passwords(log_fn):
@@ -289,26 +577,12 @@ def show_wifi_passwords(log_fn):
         try:
             log_fn("▶ Récupération des profils WiFi...")
             
-            # Lister tous les profils
-            profiles_result = subprocess.run(
-                ["netsh", "wlan", "show", "profiles"],
-                capture_output=True, text=True, encoding="utf-8", errors="ignore"
-            )
-            
-            if profiles_result.returncode != 0:
+            try:
+                profiles = _collect_wifi_profiles()
+            except subprocess.CalledProcessError:
                 log_fn("❌ Impossible de lister les profils WiFi")
                 return
             
-            # Extraire les noms des profils
-            profiles = []
-            for line in profiles_result.stdout.splitlines():
-                if "Profil Tous les utilisateurs" in line or "All User Profile" in line:
-                    # Format: "    Profil Tous les utilisateurs : NomDuReseau"
-                    parts = line.split(":")
-                    if len(parts) >= 2:
-                        profile_name = parts[1].strip()
-                        profiles.append(profile_name)
-            
             if not profiles:
                 log_fn("⚠️ Aucun profil WiFi trouvé")
                 return
@@ -316,28 +590,10 @@ def show_wifi_passwords(log_fn):
             log_fn(f"✅ {len(profiles)} profil(s) WiFi trouvé(s)")
             log_fn("=" * 60)
             
-            # Pour chaque profil, afficher le mot de passe
-            for profile in profiles:
-                try:
-                    password_result = subprocess.run(
-                        ["netsh", "wlan", "show", "profile", profile, "key=clear"],
-                        capture_output=True, text=True, encoding="utf-8", errors="ignore"
-                    )
-                    
-                    password = "Non disponible"
-                    for line in password_result.stdout.splitlines():
-                        if "Contenu de la clé" in line or "Key Content" in line:
-                            parts = line.split(":")
-                            if len(parts) >= 2:
-                                password = parts[1].strip()
-                                break
-                    
-                    log_fn(f"📶 {profile}")
-                    log_fn(f"   🔑 Mot de passe: {password}")
-                    log_fn("")
-                    
-                except Exception as e:
-                    log_fn(f"❌ Erreur pour {profile}: {e}")
+            for profile, password in profiles.items():
+                log_fn(f"📶 {profile}")
+                log_fn(f"   🔑 Mot de passe: {password if password is not None else 'Non disponible'}")
+                log_fn("")
             
             log_fn("=" * 60)
             log_fn("✅ Récupération terminée")
@@ -0,0 +1,191 @@
+"""
+Inventaire des ports série
+Énumère les ports COM une seule fois, garde leurs métadonnées (VID/PID, description)
+en cache et surveille les branchements/débranchements en arrière-plan.
+"""
+import glob
+import sys
+import threading
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class PortInfo:
+    """Port série et métadonnées du périphérique"""
+    device: str
+    description: str = ""
+    vid: int = None
+    pid: int = None
+    serial_number: str = ""
+    manufacturer: str = ""
+
+    @property
+    def usb_id(self):
+        if self.vid is None:
+            return ""
+        return f"{self.vid:04X}:{self.pid or 0:04X}"
+
+    def label(self):
+        """Texte lisible: COM3 - USB-SERIAL CH340 (1A86:7523)"""
+        text = self.device
+        if self.description and self.description != "n/a":
+            text += f" - {self.description}"
+        if self.usb_id:
+            text += f" ({self.usb_id})"
+        return text
+
+
+def enumerate_ports():
+    """
+    Énumération complète via pyserial (coûteuse sur les postes avec beaucoup d'USB-série)
+
+    Returns:
+        list: Liste de PortInfo triée par nom de port
+    """
+    try:
+        import serial.tools.list_ports
+        ports = serial.tools.list_ports.comports()
+    except Exception:
+        return []
+    infos = [PortInfo(p.device, p.description or "", p.vid, p.pid,
+                      p.serial_number or "", p.manufacturer or "") for p in ports]
+    return sorted(infos, key=lambda p: p.device)
+
+
+def ports_signature():
+    """
+    Empreinte peu coûteuse de la liste des ports, pour détecter un changement
+
+    Windows: valeurs de HKLM\\HARDWARE\\DEVICEMAP\\SERIALCOMM (tenue à jour par le système).
+    Linux: noms des périphériques /dev/tty* série.
+
+    Returns:
+        tuple | None: Empreinte, ou None si indisponible (énumération complète à chaque fois)
+    """
+    if sys.platform.startswith("win"):
+        try:
+            import winreg
+            key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"HARDWARE\DEVICEMAP\SERIALCOMM")
+        except OSError:
+            return ()
+        values = []
+        try:
+            i = 0
+            while True:
+                try:
+                    name, data, _ = winreg.EnumValue(key, i)
+                except OSError:
+                    break
+                values.append((name, data))
+                i += 1
+        finally:
+            winreg.CloseKey(key)
+        return tuple(sorted(values))
+    patterns = ("/dev/ttyS*", "/dev/ttyUSB*", "/dev/ttyACM*", "/dev/cu.*")
+    return tuple(sorted(p for pattern in patterns for p in glob.glob(pattern)))
+
+
+class PortInventory:
+    """
+    Cache des ports série avec surveillance des branchements
+
+    L'énumération complète n'est refaite que lorsque l'empreinte change.
+    """
+
+    def __init__(self, enumerate_fn=enumerate_ports, signature_fn=ports_signature,
+                 interval=2.0):
+        """
+        Args:
+            enumerate_fn (callable): Énumération complète -> liste de PortInfo
+            signature_fn (callable): Empreinte rapide -> valeur comparable ou None
+            interval (float): Période de surveillance (s)
+        """
+        self._enumerate = enumerate_fn
+        self._signature = signature_fn
+        self.interval = interval
+        self._ports = None
+        self._sig = None
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._thread = None
+        self._stop = threading.Event()
+
+    def ports(self):
+        """Retourne les ports en cache (énumère au premier appel)"""
+        with self._lock:
+            cached = self._ports
+        if cached is None:
+            self.refresh(force=True)
+            with self._lock:
+                cached = self._ports
+        return list(cached)
+
+    def devices(self):
+        """Retourne les noms des ports (ex: ["COM1", "COM3"])"""
+        return [p.device for p in self.ports()]
+
+    def get(self, device):
+        """Retourne le PortInfo d'un port, ou None"""
+        return next((p for p in self.ports() if p.device == device), None)
+
+    def refresh(self, force=False):
+        """
+        Met le cache à jour si l'empreinte a changé (ou toujours si force)
+
+        Les abonnés ne sont pas notifiés lors de la toute première énumération.
+
+        Returns:
+            tuple: (ports ajoutés, ports retirés) sous forme de listes de PortInfo
+        """
+        try:
+            sig = self._signature()
+        except Exception:
+            sig = None
+        with self._lock:
+            unchanged = not force and sig is not None and sig == self._sig and self._ports is not None
+        if unchanged:
+            return [], []
+        ports = self._enumerate()
+        with self._lock:
+            first = self._ports is None
+            old = self._ports or []
+            self._ports = ports
+            self._sig = sig
+        if first:
+            return list(ports), []
+        old_devices = {p.device for p in old}
+        new_devices = {p.device for p in ports}
+        added = [p for p in ports if p.device not in old_devices]
+        removed = [p for p in old if p.device not in new_devices]
+        if added or removed:
+            for listener in list(self._listeners):
+                try:
+                    listener(added, removed)
+                except Exception:
+                    pass
+        return added, removed
+
+    def subscribe(self, listener):
+        """Enregistre listener(ajoutés, retirés), appelé depuis le thread de surveillance"""
+        self._listeners.append(listener)
+
+    def start_watching(self):
+        """Démarre la surveillance en arrière-plan (sans effet si déjà démarrée)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, daemon=True)
+        self._thread.start()
+
+    def stop_watching(self):
+        self._stop.set()
+
+    def _watch(self):
+        if self._ports is None:
+            self.refresh(force=True)
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+
+# Inventaire partagé par l'application
+port_inventory = PortInventory()
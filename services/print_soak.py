@@ -0,0 +1,156 @@
+"""
+Test d'endurance des imprimantes
+Envoie des tickets à cadence fixe pendant une durée donnée (ex: simuler le rush
+du vendredi soir) et rapporte l'histogramme des latences, p50/p95/p99, le taux
+d'erreur et le débit obtenu.
+"""
+import threading
+import time
+from collections import Counter
+
+from services.printer_service import printer_pool, send_serial, send_tcp
+from utils.stats_utils import LatencyHistogram
+
+
+class SoakReport:
+    """Résultats d'un test d'endurance"""
+
+    def __init__(self, rate_per_min, duration_s):
+        self.rate_per_min = rate_per_min
+        self.duration_s = duration_s
+        self.histogram = LatencyHistogram()
+        self.jobs = 0
+        self.errors = Counter()
+        self.bytes_sent = 0
+        self.late_jobs = 0
+        self.max_lag_ms = 0.0
+        self.elapsed_s = 0.0
+        self.stopped = False
+
+    @property
+    def failed(self):
+        return sum(self.errors.values())
+
+    @property
+    def error_rate(self):
+        return self.failed / self.jobs if self.jobs else 0.0
+
+    @property
+    def throughput_per_min(self):
+        return self.jobs / self.elapsed_s * 60 if self.elapsed_s else 0.0
+
+    def record(self, sample, latency_ms, lag_ms=0.0):
+        """
+        Enregistre un envoi
+
+        Args:
+            sample (SendSample): Résultat de l'envoi
+            latency_ms (float): Durée totale de l'envoi (connexion, écriture, statut)
+            lag_ms (float): Retard du départ sur l'horaire prévu (0 si à l'heure)
+        """
+        self.jobs += 1
+        self.bytes_sent += sample.bytes_sent
+        if sample.ok:
+            self.histogram.record(latency_ms)
+        else:
+            self.errors[sample.error or "erreur inconnue"] += 1
+        if lag_ms > 0:
+            self.late_jobs += 1
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+    def format_lines(self):
+        """
+        Returns:
+            list: Lignes de rapport prêtes à journaliser
+        """
+        h = self.histogram
+        status = "interrompu" if self.stopped else "terminé"
+        lines = [
+            f"📊 Endurance {status}: {self.jobs} ticket(s) en {self.elapsed_s:.0f} s, "
+            f"{self.failed} échec(s) ({self.error_rate * 100:.1f} %)",
+            f"   Débit obtenu: {self.throughput_per_min:.1f} tickets/min "
+            f"(visé: {self.rate_per_min:g}), {self.bytes_sent / 1024:.0f} Ko envoyés",
+        ]
+        if h.count:
+            lines.append(f"   Latence (ms): min {h.min:.1f} | p50 {h.percentile(50):.1f} | "
+                         f"p95 {h.percentile(95):.1f} | p99 {h.percentile(99):.1f} | "
+                         f"max {h.max:.1f}")
+            lines.extend(h.format_bars())
+        if self.late_jobs:
+            lines.append(f"   ⚠️ {self.late_jobs} ticket(s) partis en retard sur la cadence "
+                         f"(jusqu'à {self.max_lag_ms:.0f} ms): l'imprimante ne suit pas")
+        for error, n in self.errors.most_common(3):
+            lines.append(f"   ✗ {n} x {error}")
+        return lines
+
+
+def run_soak_test(send_fn, data, rate_per_min, duration_s, log_fn,
+                  stop_event=None, progress_every=30.0):
+    """
+    Envoie data à cadence fixe pendant duration_s secondes
+
+    Les tickets sont planifiés à intervalle régulier depuis le début du test: un
+    envoi lent retarde les suivants (compté comme retard) sans provoquer de rafale
+    de rattrapage au-delà d'un ticket.
+
+    Args:
+        send_fn (callable): Fonction (data) -> SendSample
+        data (bytes): Ticket à envoyer
+        rate_per_min (float): Cadence visée (tickets par minute)
+        duration_s (float): Durée du test (s)
+        log_fn (callable): Fonction de logging
+        stop_event (threading.Event): Interrompt le test s'il est levé
+        progress_every (float): Intervalle des messages de progression (s)
+
+    Returns:
+        SoakReport: Résultats
+    """
+    if rate_per_min <= 0 or duration_s <= 0:
+        raise ValueError("La cadence et la durée doivent être positives")
+    stop_event = stop_event or threading.Event()
+    report = SoakReport(rate_per_min, duration_s)
+    interval = 60.0 / rate_per_min
+    start = time.perf_counter()
+    end = start + duration_s
+    next_progress = start + progress_every
+    due = start
+    log_fn(f"🏁 Test d'endurance: {rate_per_min:g} tickets/min pendant {duration_s:.0f} s")
+
+    while due < end and not stop_event.is_set():
+        delay = due - time.perf_counter()
+        if delay > 0 and stop_event.wait(delay):
+            break
+        t0 = time.perf_counter()
+        sample = send_fn(data)
+        now = time.perf_counter()
+        lag_ms = (t0 - due) * 1000
+        # Tolérance de 10 % de l'intervalle avant de compter un départ en retard
+        report.record(sample, (now - t0) * 1000, lag_ms if lag_ms > interval * 100 else 0.0)
+        # Pas de rafale: au plus un ticket immédiatement après un envoi lent
+        due = max(due + interval, now - interval)
+        if now >= next_progress:
+            log_fn(f"   … {report.jobs} ticket(s), {report.failed} échec(s), "
+                   f"p95 {report.histogram.percentile(95):.0f} ms")
+            next_progress = now + progress_every
+
+    report.elapsed_s = time.perf_counter() - start
+    report.stopped = stop_event.is_set()
+    return report
+
+
+def soak_sender(mode, address, port=9100, baud=9600, flow_control="aucun",
+                check_status=True):
+    """
+    Construit la fonction d'envoi d'un test d'endurance vers une imprimante
+
+    En TCP la connexion est conservée dans printer_pool entre les tickets.
+
+    Returns:
+        callable: Fonction (data) -> SendSample
+    """
+    quiet = lambda msg: None
+    if mode.lower() == "tcp":
+        return lambda data: send_tcp(address, port, data, quiet, pool=printer_pool,
+                                     check_status=check_status)
+    return lambda data: send_serial(address, baud, data, quiet, check_status=check_status,
+                                    flow_control=flow_control)
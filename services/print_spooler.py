@@ -0,0 +1,343 @@
+"""
+Spouleur d'impression persistant
+File de travaux sauvegardée sur disque, un worker par imprimante et nouvelles
+tentatives avec délai exponentiel. S'appuie sur send_tcp / send_serial.
+"""
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import asdict, dataclass
+
+from services.printer_service import PrintTarget, printer_pool, send_serial, send_tcp
+
+QUEUED = "en attente"
+SENDING = "envoi"
+DONE = "terminé"
+FAILED = "échec"
+
+
+def default_spool_dir():
+    """Dossier du spouleur: %LOCALAPPDATA%\\Sys-Tools\\spool (ou dossier temporaire)"""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(base, "Sys-Tools", "spool")
+
+
+@dataclass
+class PrintJob:
+    """Travail d'impression du spouleur"""
+    id: str
+    mode: str
+    address: str
+    port: int = 9100
+    baud: int = 9600
+    flow_control: str = "aucun"
+    label: str = ""
+    state: str = QUEUED
+    attempts: int = 0
+    next_attempt: float = 0.0
+    error: str = ""
+    created: float = 0.0
+    updated: float = 0.0
+
+    @property
+    def target(self):
+        return PrintTarget(self.mode, self.address, self.port, self.baud, self.flow_control)
+
+    @property
+    def printer(self):
+        return self.target.label
+
+
+class PrintSpooler:
+    """
+    Spouleur: un thread worker par imprimante, état persisté dans jobs.jsonl
+
+    Chaque changement d'état ajoute une ligne (le travail complet) au journal: le
+    coût d'un changement ne dépend pas de la taille de la file. Le journal est
+    compacté (une ligne par travail) au chargement et par clear_finished.
+    Les données de chaque travail sont stockées dans <id>.bin à côté du journal.
+    Au redémarrage, les travaux non terminés sont remis en file. Quand la file d'une
+    imprimante est vide, sa connexion du pool est fermée pour la libérer (beaucoup
+    n'acceptent qu'une connexion à la fois).
+    """
+
+    def __init__(self, spool_dir=None, log_fn=print, on_change=None, max_attempts=5,
+                 base_delay=2.0, max_delay=60.0, sender=None):
+        """
+        Args:
+            spool_dir (str): Dossier de persistance (défaut: default_spool_dir())
+            log_fn (callable): Fonction de logging
+            on_change (callable): Appelée (job) à chaque changement d'état
+            max_attempts (int): Nombre maximal de tentatives par travail
+            base_delay (float): Délai avant la 1re nouvelle tentative (s), doublé ensuite
+            max_delay (float): Délai maximal entre tentatives (s)
+            sender (callable): Fonction (job, data) -> (succès, erreur), remplace l'envoi réel
+        """
+        self.spool_dir = spool_dir or default_spool_dir()
+        self.log = log_fn
+        self.on_change = on_change
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._send = sender or self._send_job
+        self._release = self._release_printer if sender is None else (lambda job: None)
+        self._jobs = {}
+        self._workers = {}
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._wake = {}
+        self._stop = threading.Event()
+        os.makedirs(self.spool_dir, exist_ok=True)
+        self._load()
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.spool_dir, "jobs.jsonl")
+
+    @property
+    def _legacy_index_path(self):
+        """Index JSON complet des versions précédentes, repris puis supprimé"""
+        return os.path.join(self.spool_dir, "jobs.json")
+
+    def _payload_path(self, job_id):
+        return os.path.join(self.spool_dir, f"{job_id}.bin")
+
+    def _read_records(self):
+        """Enregistrements de l'ancien index puis du journal, dans l'ordre d'écriture"""
+        try:
+            with open(self._legacy_index_path, "r", encoding="utf-8") as f:
+                legacy = json.load(f)
+        except (OSError, ValueError):
+            legacy = []
+        if not isinstance(legacy, list):
+            self.log(f"⚠️ Spouleur: index illisible ignoré ({self._legacy_index_path})")
+            legacy = []
+        yield from legacy
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        # Dernière ligne tronquée par un arrêt brutal
+                        self.log("⚠️ Spouleur: ligne illisible ignorée dans le journal")
+        except OSError:
+            pass
+
+    def _load(self):
+        fields = PrintJob.__dataclass_fields__
+        for rec in self._read_records():
+            try:
+                # Clés inconnues ignorées: journal écrit par une autre version
+                job = PrintJob(**{k: v for k, v in rec.items() if k in fields})
+            except (AttributeError, TypeError, ValueError):
+                self.log(f"⚠️ Spouleur: travail illisible ignoré: {rec!r:.150}")
+                continue
+            if job.state == SENDING:
+                job.state = QUEUED
+            self._jobs[job.id] = job
+        self._compact()
+
+    def _append(self, records):
+        """Ajoute des lignes au journal"""
+        lines = "".join(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+        with self._save_lock:
+            with open(self._index_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+
+    def _compact(self):
+        """Réécrit le journal avec une ligne par travail (fichier temporaire + remplacement)"""
+        tmp = self._index_path + ".tmp"
+        with self._save_lock:
+            with self._lock:
+                records = [asdict(j) for j in self._jobs.values()]
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.writelines(json.dumps(r, ensure_ascii=False) + "\n" for r in records)
+            os.replace(tmp, self._index_path)
+            try:
+                os.remove(self._legacy_index_path)
+            except OSError:
+                pass
+
+    def _update(self, job, **changes):
+        for k, v in changes.items():
+            setattr(job, k, v)
+        job.updated = time.time()
+        self._append([asdict(job)])
+        if self.on_change:
+            self.on_change(job)
+
+    def submit(self, target, data):
+        """
+        Ajoute un travail à la file
+
+        Args:
+            target (PrintTarget): Imprimante cible
+            data (bytes): Données à imprimer
+
+        Returns:
+            PrintJob: Travail créé
+        """
+        job_id = uuid.uuid4().hex[:12]
+        with open(self._payload_path(job_id), "wb") as f:
+            f.write(data)
+        now = time.time()
+        job = PrintJob(job_id, target.mode, target.address, target.port, target.baud,
+                       flow_control=target.flow_control, label=target.label,
+                       created=now, updated=now)
+        with self._lock:
+            self._jobs[job_id] = job
+        self._append([asdict(job)])
+        if self.on_change:
+            self.on_change(job)
+        self._ensure_worker(job.printer)
+        return job
+
+    def jobs(self):
+        """Retourne les travaux, du plus ancien au plus récent"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda j: j.created)
+
+    def counts(self):
+        """Retourne {état: nombre de travaux}"""
+        counts = {QUEUED: 0, SENDING: 0, DONE: 0, FAILED: 0}
+        for job in self.jobs():
+            counts[job.state] = counts.get(job.state, 0) + 1
+        return counts
+
+    def clear_finished(self):
+        """Supprime les travaux terminés ou en échec"""
+        with self._lock:
+            finished = [j for j in self._jobs.values() if j.state in (DONE, FAILED)]
+            for job in finished:
+                del self._jobs[job.id]
+        for job in finished:
+            try:
+                os.remove(self._payload_path(job.id))
+            except OSError:
+                pass
+        self._compact()
+        return len(finished)
+
+    def retry_failed(self):
+        """Remet en file les travaux en échec"""
+        failed = [j for j in self.jobs() if j.state == FAILED]
+        for job in failed:
+            self._update(job, state=QUEUED, attempts=0, next_attempt=0.0, error="")
+            self._ensure_worker(job.printer)
+        return len(failed)
+
+    def start(self):
+        """Démarre les workers des travaux en attente (ex: après redémarrage)"""
+        for printer in {j.printer for j in self.jobs() if j.state == QUEUED}:
+            self._ensure_worker(printer)
+
+    def stop(self):
+        self._stop.set()
+        for event in list(self._wake.values()):
+            event.set()
+
+    def _ensure_worker(self, printer):
+        with self._lock:
+            wake = self._wake.setdefault(printer, threading.Event())
+            worker = self._workers.get(printer)
+            if worker is None or not worker.is_alive():
+                worker = threading.Thread(target=self._worker, args=(printer,), daemon=True)
+                self._workers[printer] = worker
+                worker.start()
+        wake.set()
+
+    def _next_job(self, printer):
+        """Retourne (travail prêt ou None, délai avant le prochain)"""
+        now = time.time()
+        # Le dictionnaire suit l'ordre de création (soumission, journal compacté)
+        with self._lock:
+            pending = [j for j in self._jobs.values()
+                       if j.printer == printer and j.state == QUEUED]
+        if not pending:
+            return None, None
+        ready = [j for j in pending if j.next_attempt <= now]
+        if ready:
+            return ready[0], 0
+        return None, min(j.next_attempt for j in pending) - now
+
+    def _worker(self, printer):
+        wake = self._wake[printer]
+        last = None
+        while not self._stop.is_set():
+            wake.clear()
+            job, delay = self._next_job(printer)
+            if job is None:
+                if delay is None:
+                    with self._lock:
+                        # Relecture sous verrou: un submit a pu arriver entre-temps
+                        if not any(j.printer == printer and j.state == QUEUED
+                                   for j in self._jobs.values()):
+                            self._workers.pop(printer, None)
+                            break
+                    continue
+                wake.wait(delay)
+                continue
+            self._process(job)
+            last = job
+        if last is not None:
+            self._release(last)
+
+    def _process(self, job):
+        self._update(job, state=SENDING, attempts=job.attempts + 1)
+        try:
+            with open(self._payload_path(job.id), "rb") as f:
+                data = f.read()
+            ok, error = self._send(job, data)
+        except Exception as e:
+            ok, error = False, str(e)
+        if ok:
+            self._update(job, state=DONE, error="")
+            self.log(f"✅ Spouleur: travail {job.id} imprimé sur {job.printer}")
+            return
+        if job.attempts >= self.max_attempts:
+            self._update(job, state=FAILED, error=error)
+            self.log(f"❌ Spouleur: travail {job.id} abandonné après "
+                     f"{job.attempts} tentative(s): {error}")
+            return
+        delay = min(self.max_delay, self.base_delay * 2 ** (job.attempts - 1))
+        self._update(job, state=QUEUED, error=error, next_attempt=time.time() + delay)
+        self.log(f"⚠️ Spouleur: {job.printer} en échec ({error}), "
+                 f"nouvel essai dans {delay:.0f} s")
+
+    @staticmethod
+    def _send_job(job, data):
+        """Envoi réel via send_tcp / send_serial; retourne (succès, erreur)"""
+        quiet = lambda msg: None
+        if job.mode == "tcp":
+            sample = send_tcp(job.address, job.port, data, quiet,
+                              pool=printer_pool, check_status=True)
+        else:
+            sample = send_serial(job.address, job.baud, data, quiet, check_status=True,
+                                 flow_control=job.flow_control)
+        return sample.ok, sample.error
+
+    @staticmethod
+    def _release_printer(job):
+        """Ferme la connexion du pool vers l'imprimante du travail"""
+        if job.mode == "tcp":
+            printer_pool.close(job.address, job.port)
+
+    def format_jobs(self, limit=20):
+        """
+        Returns:
+            list: Lignes décrivant les derniers travaux
+        """
+        counts = self.counts()
+        lines = [" | ".join(f"{state}: {n}" for state, n in counts.items())]
+        for job in self.jobs()[-limit:]:
+            line = f"{job.id}  {job.printer:<22} {job.state:<10} essais: {job.attempts}"
+            if job.error and job.state != DONE:
+                line += f"  ({job.error})"
+            lines.append(line)
+        return lines
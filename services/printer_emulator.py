@@ -0,0 +1,455 @@
+"""
+Émulateur d'imprimante ESC/P / ESC/POS
+Serveur TCP brut (type port 9100) et imprimante série sur paire pty (Linux) pour tester
+et mesurer printer_service sans matériel: décodage des commandes émises par build_message
+(ESC r couleur, ESC i coupe), buffer de taille fixe vidé à un débit configurable,
+réponses DLE EOT / GS r, et enregistrement des octets reçus et des temps.
+
+Lancement: python -m services.printer_emulator --port 9100 --buffer 4096 --rate 20000
+"""
+import os
+import re
+import select
+import socket
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+
+ESC, GS, DLE, EOT, LF, CR = 0x1b, 0x1d, 0x10, 0x04, 0x0a, 0x0d
+_SPECIAL = re.compile(rb"[\x1b\x1d\x10\n\r]")
+
+
+@dataclass
+class Ticket:
+    """Ticket reçu, délimité par une commande de coupe (ESC i)"""
+    lines: int = 0
+    red_lines: int = 0
+    bytes: int = 0
+    raster_bytes: int = 0
+    started: float = 0.0
+    completed: float = 0.0
+
+    @property
+    def duration_ms(self):
+        return (self.completed - self.started) * 1000
+
+
+class EscPosParser:
+    """
+    Décodeur incrémental du flux imprimé
+
+    Les séquences coupées entre deux blocs sont conservées jusqu'au bloc suivant.
+    """
+
+    def __init__(self, on_gs_r=None, keep_lines=10000):
+        """
+        Args:
+            on_gs_r (callable): Appelée (n) quand GS r n est traité (réponse différée)
+            keep_lines (int): Nombre de dernières lignes conservées
+        """
+        self.on_gs_r = on_gs_r
+        self.color = 0
+        self.lines = deque(maxlen=keep_lines)
+        self.cuts = 0
+        self.tickets = []
+        self._ticket = None
+        self._line = bytearray()
+        self._pending = b""
+
+    def _current(self):
+        if self._ticket is None:
+            self._ticket = Ticket(started=time.perf_counter())
+        return self._ticket
+
+    def _end_line(self):
+        ticket = self._current()
+        ticket.lines += 1
+        if self.color:
+            ticket.red_lines += 1
+        self.lines.append((self.color, self._line.decode("cp437", errors="replace")))
+        self._line.clear()
+
+    def _cut(self):
+        if self._line:
+            self._end_line()
+        ticket = self._current()
+        ticket.completed = time.perf_counter()
+        self.tickets.append(ticket)
+        self._ticket = None
+        self.cuts += 1
+
+    def feed(self, data):
+        """Traite un bloc de données"""
+        buf = self._pending + bytes(data)
+        self._current().bytes += len(data)
+        n = len(buf)
+        i = 0
+        while i < n:
+            b = buf[i]
+            if b == ESC:
+                if i + 1 >= n:
+                    break
+                cmd = buf[i + 1]
+                if cmd in (0x72, 0x21, 0x2d, 0x45, 0x61, 0x64):  # ESC r/!/-/E/a/d n
+                    if i + 2 >= n:
+                        break
+                    if cmd == 0x72:
+                        self.color = buf[i + 2] & 1
+                    i += 3
+                    continue
+                if cmd in (0x69, 0x6d):  # ESC i / ESC m: coupe
+                    self._cut()
+                elif cmd == 0x40:  # ESC @: initialisation
+                    self.color = 0
+                i += 2
+            elif b == DLE:
+                # DLE EOT n: répondu en temps réel à la réception
+                if i + 2 >= n:
+                    break
+                i += 3
+            elif b == GS:
+                if i + 1 >= n:
+                    break
+                cmd = buf[i + 1]
+                if cmd == 0x72:  # GS r n
+                    if i + 2 >= n:
+                        break
+                    if self.on_gs_r:
+                        self.on_gs_r(buf[i + 2])
+                    i += 3
+                elif cmd == 0x76:  # GS v 0 m xL xH yL yH d1...dk
+                    if i + 7 >= n:
+                        break
+                    width = buf[i + 4] + buf[i + 5] * 256
+                    height = buf[i + 6] + buf[i + 7] * 256
+                    size = width * height
+                    if i + 8 + size > n:
+                        break
+                    self._current().raster_bytes += size
+                    i += 8 + size
+                elif cmd == 0x56:  # GS V m: coupe
+                    if i + 2 >= n:
+                        break
+                    self._cut()
+                    i += 3
+                else:
+                    i += 2
+            elif b == LF:
+                self._end_line()
+                i += 1
+            elif b == CR:
+                i += 1
+            else:
+                # Texte: copie jusqu'au prochain octet de contrôle en une fois
+                m = _SPECIAL.search(buf, i)
+                end = m.start() if m else n
+                self._line += buf[i:end]
+                i = end
+        self._pending = buf[i:]
+
+
+class EmulatedPrinter:
+    """
+    Moteur commun aux transports: buffer borné vidé à drain_rate octets/s
+
+    Tant que le buffer est plein, plus rien n'est lu: l'émetteur subit la contre-pression
+    (fenêtre TCP ou blocage série) comme avec une vraie imprimante.
+    """
+
+    def __init__(self, buffer_size=4096, drain_rate=None, keep_lines=10000):
+        """
+        Args:
+            buffer_size (int): Taille du buffer de réception (octets)
+            drain_rate (float): Débit d'impression (octets/s), None = instantané
+            keep_lines (int): Nombre de dernières lignes conservées
+        """
+        self.buffer_size = buffer_size
+        self.drain_rate = drain_rate
+        self.offline = False
+        self.cover_open = False
+        self.paper_out = False
+        self.parser = EscPosParser(on_gs_r=self._on_gs_r, keep_lines=keep_lines)
+        self.bytes_received = 0
+        self.bytes_printed = 0
+        self.max_fill = 0
+        self.first_byte_at = None
+        self.last_byte_at = None
+        self.receive_log = deque(maxlen=100000)
+        self._buffer = bytearray()
+        self._tail = b""
+        self._send = None
+        self._lock = threading.Lock()
+
+    def status_byte(self, n):
+        """Octet de réponse à DLE EOT n"""
+        b = 0x12
+        if n == 1 and (self.offline or self.cover_open or self.paper_out):
+            b |= 0x08
+        elif n == 2:
+            b |= (0x04 if self.cover_open else 0) | (0x20 if self.paper_out else 0)
+        elif n == 4 and self.paper_out:
+            b |= 0x60
+        return b
+
+    def _reply(self, data):
+        try:
+            if self._send:
+                self._send(data)
+        except OSError:
+            pass
+
+    def _on_gs_r(self, n):
+        self._reply(bytes([0x0c if self.paper_out else 0x00]))
+
+    def _realtime(self, data):
+        """Répond immédiatement aux DLE EOT n présents dans les données reçues"""
+        window = self._tail + data
+        start = 0
+        while True:
+            i = window.find(b"\x10\x04", start)
+            if i < 0 or i + 2 >= len(window):
+                break
+            self._reply(bytes([self.status_byte(window[i + 2])]))
+            start = i + 3
+        self._tail = window[-2:]
+
+    def receive(self, data):
+        now = time.perf_counter()
+        with self._lock:
+            if self.first_byte_at is None:
+                self.first_byte_at = now
+            self.last_byte_at = now
+            self.bytes_received += len(data)
+            self.receive_log.append((now, len(data)))
+            self._buffer += data
+            self.max_fill = max(self.max_fill, len(self._buffer))
+        self._realtime(data)
+
+    def drain(self, budget=None):
+        """Imprime jusqu'à budget octets du buffer (tout si None)"""
+        with self._lock:
+            count = len(self._buffer) if budget is None else min(budget, len(self._buffer))
+            chunk = bytes(self._buffer[:count])
+            del self._buffer[:count]
+        if chunk:
+            self.parser.feed(chunk)
+            self.bytes_printed += len(chunk)
+        return len(chunk)
+
+    @property
+    def room(self):
+        return self.buffer_size - len(self._buffer)
+
+    def serve(self, read, send, running):
+        """
+        Boucle de service d'un canal
+
+        Args:
+            read (callable): read(max, timeout) -> bytes (b"" si rien, None si fermé)
+            send (callable): Envoi des réponses à l'hôte
+            running (callable): Retourne False pour arrêter
+        """
+        self._send = send
+        last = time.perf_counter()
+        carry = 0.0
+        closed = False
+        while running():
+            now = time.perf_counter()
+            if self.drain_rate:
+                carry += (now - last) * self.drain_rate
+                printed = self.drain(int(carry))
+                carry = 0.0 if not self._buffer else carry - printed
+            else:
+                self.drain()
+            last = now
+            if closed:
+                if not self._buffer:
+                    break
+                time.sleep(0.005)
+                continue
+            if self.room <= 0:
+                time.sleep(0.005)
+                continue
+            data = read(min(self.room, 65536), 0.01)
+            if data is None:
+                closed = True
+            elif data:
+                self.receive(data)
+
+    def stats(self):
+        """Retourne un instantané des mesures"""
+        elapsed = 0.0
+        if self.first_byte_at is not None:
+            elapsed = self.last_byte_at - self.first_byte_at
+        return {
+            "bytes_received": self.bytes_received,
+            "bytes_printed": self.bytes_printed,
+            "buffered": len(self._buffer),
+            "max_fill": self.max_fill,
+            "receive_s": elapsed,
+            "receive_bytes_per_s": self.bytes_received / elapsed if elapsed else 0.0,
+            "lines": sum(t.lines for t in self.parser.tickets),
+            "cuts": self.parser.cuts,
+            "tickets": len(self.parser.tickets),
+        }
+
+
+class PrinterEmulator(EmulatedPrinter):
+    """
+    Imprimante réseau émulée (TCP brut)
+
+    Les connexions sont servies une à la fois, comme sur une imprimante réelle.
+    Utilisable comme gestionnaire de contexte; address donne (ip, port) d'écoute.
+    """
+
+    def __init__(self, host="127.0.0.1", port=0, buffer_size=4096, drain_rate=None,
+                 keep_lines=10000):
+        super().__init__(buffer_size, drain_rate, keep_lines)
+        self.host = host
+        self.port = port
+        self.connections = 0
+        self._server = None
+        self._thread = None
+        self._running = threading.Event()
+
+    @property
+    def address(self):
+        return self._server.getsockname()[:2]
+
+    def start(self):
+        self._server = socket.create_server((self.host, self.port))
+        self._server.settimeout(0.1)
+        self._running.set()
+        self._thread = threading.Thread(target=self._accept_loop, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        if self._thread:
+            self._thread.join(timeout=2)
+        if self._server:
+            self._server.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _accept_loop(self):
+        while self._running.is_set():
+            try:
+                conn, _ = self._server.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            self.connections += 1
+            with conn:
+                conn.setblocking(True)
+                self.serve(lambda size, timeout: self._read(conn, size, timeout),
+                           conn.sendall, self._running.is_set)
+
+    @staticmethod
+    def _read(conn, size, timeout):
+        try:
+            if not select.select([conn], [], [], timeout)[0]:
+                return b""
+            data = conn.recv(size)
+        except OSError:
+            return None
+        return data or None
+
+
+class PtyPrinterEmulator(EmulatedPrinter):
+    """
+    Imprimante série émulée sur une paire pty (Linux uniquement)
+
+    port donne le chemin du côté esclave, à ouvrir avec pyserial comme un port COM.
+    Le flux série étant continu, les tickets sont délimités par les coupes.
+    """
+
+    def __init__(self, buffer_size=4096, drain_rate=None, keep_lines=10000):
+        super().__init__(buffer_size, drain_rate, keep_lines)
+        import pty
+        import tty
+        self._master, self._slave = pty.openpty()
+        tty.setraw(self._master)
+        tty.setraw(self._slave)
+        self.port = os.ttyname(self._slave)
+        self._thread = None
+        self._running = threading.Event()
+
+    def start(self):
+        self._running.set()
+        self._thread = threading.Thread(
+            target=self.serve,
+            args=(self._read, lambda data: os.write(self._master, data), self._running.is_set),
+            daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        if self._thread:
+            self._thread.join(timeout=2)
+        for fd in (self._master, self._slave):
+            try:
+                os.close(fd)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def _read(self, size, timeout):
+        if not select.select([self._master], [], [], timeout)[0]:
+            return b""
+        try:
+            return os.read(self._master, size)
+        except OSError:
+            # EIO tant qu'aucun processus n'a ouvert le côté esclave
+            time.sleep(timeout)
+            return b""
+
+
+def main():
+    import argparse
+    parser = argparse.ArgumentParser(description="Émulateur d'imprimante ESC/P")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--buffer", type=int, default=4096, help="taille du buffer (octets)")
+    parser.add_argument("--rate", type=float, default=None, help="débit d'impression (octets/s)")
+    parser.add_argument("--pty", action="store_true", help="émuler une imprimante série (pty)")
+    args = parser.parse_args()
+
+    if args.pty:
+        emu = PtyPrinterEmulator(args.buffer, args.rate)
+        where = emu.port
+    else:
+        emu = PrinterEmulator(args.host, args.port, args.buffer, args.rate)
+    with emu:
+        if not args.pty:
+            where = "%s:%d" % emu.address
+        print(f"🖨️ Émulateur en écoute sur {where} (Ctrl+C pour arrêter)")
+        seen = 0
+        try:
+            while True:
+                time.sleep(0.5)
+                tickets = emu.parser.tickets
+                for t in tickets[seen:]:
+                    print(f"  🧾 Ticket: {t.lines} lignes ({t.red_lines} rouges), "
+                          f"{t.bytes} octets, {t.duration_ms:.0f} ms")
+                seen = len(tickets)
+        except KeyboardInterrupt:
+            pass
+        print(emu.stats())
+
+
+if __name__ == "__main__":
+    main()
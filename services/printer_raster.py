@@ -0,0 +1,181 @@
+"""
+Impression d'images raster (logo) sur imprimantes thermiques
+Conversion d'une image en bitmap 1 bit (GS v 0): redimensionnement, tramage
+Floyd–Steinberg ou ordonné, puis compactage des bits, le tout vectorisé avec NumPy.
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from utils.system_utils import get_resource_path
+
+GS = b'\x1d'
+
+# Largeur imprimable en points selon le papier (203 dpi)
+PRINTER_WIDTHS = {"58 mm": 384, "80 mm": 576}
+DEFAULT_LOGO = os.path.join("assets", "images", "mainlogo.png")
+DITHER_METHODS = ("floyd", "ordonne")
+
+# Hauteur maximale d'une commande GS v 0: les petits buffers acceptent mal les gros blocs
+BAND_HEIGHT = 128
+
+_BAYER_2 = np.array([[0, 2], [3, 1]])
+
+
+def _bayer_matrix(order=3):
+    """Matrice de Bayer 2^order x 2^order (valeurs 0..n²-1)"""
+    m = _BAYER_2
+    for _ in range(order - 1):
+        m = np.block([[4 * m, 4 * m + 2], [4 * m + 3, 4 * m + 1]])
+    return m
+
+
+# Seuils 0..255 de la matrice 8x8, calculés une seule fois
+_BAYER_THRESHOLDS = ((_bayer_matrix(3) + 0.5) * 256 / 64).astype(np.float32)
+
+
+def load_grayscale(image, max_width):
+    """
+    Charge une image en niveaux de gris, fond transparent rendu blanc
+
+    L'image est réduite (jamais agrandie) pour tenir dans max_width points.
+
+    Args:
+        image (str | Image.Image): Chemin ou image Pillow
+        max_width (int): Largeur imprimable en points
+
+    Returns:
+        numpy.ndarray: Tableau float32 (hauteur, largeur) de 0 (noir) à 255 (blanc)
+    """
+    img = Image.open(image) if isinstance(image, str) else image
+    img = img.convert("RGBA")
+    background = Image.new("RGBA", img.size, (255, 255, 255, 255))
+    img = Image.alpha_composite(background, img).convert("L")
+    if img.width > max_width:
+        height = max(1, round(img.height * max_width / img.width))
+        img = img.resize((max_width, height), Image.Resampling.LANCZOS)
+    return np.asarray(img, dtype=np.float32)
+
+
+def ordered_dither(gray):
+    """
+    Tramage ordonné (Bayer 8x8), entièrement vectorisé
+
+    Returns:
+        numpy.ndarray: Tableau booléen, True = point noir
+    """
+    h, w = gray.shape
+    reps = (-(-h // 8), -(-w // 8))
+    return gray < np.tile(_BAYER_THRESHOLDS, reps)[:h, :w]
+
+
+def floyd_steinberg(gray):
+    """
+    Tramage Floyd–Steinberg vectorisé par fronts d'onde
+
+    Le pixel (y, x) ne dépend que de pixels dont x + 2y est plus petit: tous les
+    pixels d'un même front x + 2y = t sont traités ensemble, en largeur + 2 x hauteur
+    étapes NumPy au lieu d'une boucle par pixel. Le résultat est identique au
+    parcours ligne par ligne classique (erreur perdue sur les bords).
+
+    Returns:
+        numpy.ndarray: Tableau booléen, True = point noir
+    """
+    h, w = gray.shape
+    # Une colonne de marge de chaque côté et une ligne en bas absorbent l'erreur des bords
+    buf = np.zeros((h + 1, w + 2), dtype=np.float32)
+    buf[:h, 1:w + 1] = gray
+    black = np.zeros((h, w), dtype=bool)
+    for t in range(w + 2 * (h - 1)):
+        y = np.arange(max(0, (t - w + 2) // 2), min(h - 1, t // 2) + 1)
+        x = t - 2 * y + 1
+        old = buf[y, x]
+        dots = old < 128
+        err = old - np.where(dots, 0.0, 255.0)
+        black[y, x - 1] = dots
+        buf[y, x + 1] += err * (7 / 16)
+        buf[y + 1, x - 1] += err * (3 / 16)
+        buf[y + 1, x] += err * (5 / 16)
+        buf[y + 1, x + 1] += err * (1 / 16)
+    return black
+
+
+def pack_raster(black, width_dots):
+    """
+    Centre le bitmap sur la largeur du papier et compacte 8 points par octet
+
+    Args:
+        black (numpy.ndarray): Tableau booléen (hauteur, largeur), True = point noir
+        width_dots (int): Largeur du papier en points (multiple de 8)
+
+    Returns:
+        tuple: (octets par ligne, hauteur, données compactées)
+    """
+    h, w = black.shape
+    width_dots = max(width_dots - width_dots % 8, -(-w // 8) * 8)
+    canvas = np.zeros((h, width_dots), dtype=bool)
+    left = (width_dots - w) // 2
+    canvas[:, left:left + w] = black
+    return width_dots // 8, h, np.packbits(canvas, axis=1).tobytes()
+
+
+def raster_command(width_bytes, height, data, band_height=BAND_HEIGHT):
+    """
+    Encode un bitmap compacté en commandes GS v 0, par bandes de band_height lignes
+
+    Returns:
+        bytes: Commandes ESC/POS prêtes à envoyer
+    """
+    out = []
+    for top in range(0, height, band_height):
+        rows = min(band_height, height - top)
+        header = GS + b'v0\x00' + bytes([width_bytes & 0xFF, width_bytes >> 8,
+                                          rows & 0xFF, rows >> 8])
+        out.append(header + data[top * width_bytes:(top + rows) * width_bytes])
+    return b"".join(out)
+
+
+def image_to_raster(image, width_dots=576, method="floyd"):
+    """
+    Convertit une image en commandes raster GS v 0
+
+    Args:
+        image (str | Image.Image): Chemin ou image Pillow
+        width_dots (int): Largeur imprimable en points (384 en 58 mm, 576 en 80 mm)
+        method (str): "floyd" (Floyd–Steinberg) ou "ordonne" (Bayer)
+
+    Returns:
+        bytes: Commandes ESC/POS
+    """
+    if method not in DITHER_METHODS:
+        raise ValueError(f"Méthode de tramage inconnue: {method}")
+    gray = load_grayscale(image, width_dots)
+    black = floyd_steinberg(gray) if method == "floyd" else ordered_dither(gray)
+    return raster_command(*pack_raster(black, width_dots))
+
+
+@lru_cache(maxsize=16)
+def _cached_raster(path, mtime_ns, size, width_dots, method):
+    # mtime/size dans la clé: une image modifiée sur disque est retraitée
+    return image_to_raster(path, width_dots, method)
+
+
+def logo_raster(path=None, width_dots=576, method="floyd"):
+    """
+    Raster du logo, mis en cache par (image, largeur, méthode)
+
+    Les impressions de test répétées ne retraitent pas l'image.
+
+    Args:
+        path (str): Image à imprimer (défaut: assets/images/mainlogo.png)
+        width_dots (int): Largeur imprimable en points
+        method (str): "floyd" ou "ordonne"
+
+    Returns:
+        bytes: Commandes ESC/POS (saut de ligne final inclus)
+    """
+    path = os.path.abspath(path or get_resource_path(DEFAULT_LOGO))
+    st = os.stat(path)
+    return _cached_raster(path, st.st_mtime_ns, st.st_size, width_dots, method) + b"\r\n"
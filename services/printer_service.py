@@ -2,12 +2,84 @@
 Service de gestion des imprimantes
 Gère la communication TCP/IP et série avec les imprimantes ESC/P
 """
+import asyncio
+import ipaddress
+import select
 import socket
+import threading
 import time
+from dataclasses import dataclass
+
+from services.printer_status import (PrinterNotReadyError, query_status_async,
+                                     status_guard, wait_drained)
+from services.port_inventory import port_inventory
+from services.serial_transport import SerialTransport
+from utils.network_utils import local_subnets
+from utils.stats_utils import summarize
+
+
+# Segments ESC/P statiques, construits une seule fois
+ESC = b'\x1b'
+BLACK_CMD = ESC + b'r' + bytes([0])
+RED_CMD = ESC + b'r' + bytes([1])
+CUT_THERMAL = ESC + b'i'
+CRLF = b'\r\n'
+_STARS = b"***************************************" + CRLF
+
+_HEADER_BANNER = BLACK_CMD + _STARS + b"TEST D'IMPRESSION - INFO CONNEXION" + CRLF + _STARS
+_BLACK_BANNER = CRLF + BLACK_CMD + _STARS + b"TEST D'IMPRESSION - SECTION NOIR:" + CRLF + _STARS
+_RED_BANNER = CRLF + RED_CMD + _STARS + b"TEST D'IMPRESSION - SECTION ROUGE:" + CRLF + _STARS
+_FOOTER = CRLF + BLACK_CMD + b"Le Papier Devrait Couper ici" + CRLF + CRLF * 8 + CUT_THERMAL + CRLF
+
+# Taille par défaut des blocs produits par iter_message / iter_chunks
+CHUNK_SIZE = 4096
+
+
+def _connection_info(mode, ip, port, com_port, baud):
+    """Lignes d'information de connexion de l'en-tête"""
+    if mode.lower() == "tcp":
+        fields = ("Mode: TCP/IP", f"IP: {ip}", f"Port: {port}")
+    else:
+        fields = ("Mode: COM", f"Port COM: {com_port}", f"Baudrate: {baud}")
+    return b"".join(BLACK_CMD + f.encode() + CRLF for f in fields)
+
+
+def _repeat_lines(line, count, chunk_size):
+    """Produit count fois la ligne en blocs d'environ chunk_size octets"""
+    per_chunk = max(1, chunk_size // len(line))
+    block = line * min(per_chunk, count)
+    full, rest = divmod(count, per_chunk)
+    for _ in range(full):
+        yield block
+    if rest:
+        yield line * rest
+
+
+def iter_message(n_lines_each=20, text="Test Test Test Test Test Test Test Test",
+                 mode="tcp", ip="", port="", com_port="", baud="", chunk_size=CHUNK_SIZE,
+                 logo=b""):
+    """
+    Produit le message ESC/P par blocs, sans matérialiser le message complet
+    
+    Mêmes arguments que build_message, plus:
+        chunk_size (int): Taille approximative des blocs de lignes
+    
+    Yields:
+        bytes: Blocs successifs du message
+    """
+    encoded = text.encode()
+    if logo:
+        yield logo
+    yield _HEADER_BANNER + _connection_info(mode, ip, port, com_port, baud)
+    yield _BLACK_BANNER
+    yield from _repeat_lines(BLACK_CMD + encoded + CRLF, n_lines_each, chunk_size)
+    yield _RED_BANNER
+    yield from _repeat_lines(RED_CMD + encoded + CRLF, n_lines_each, chunk_size)
+    yield _FOOTER
 
 
 def build_message(n_lines_each=20, text="Test Test Test Test Test Test Test Test",
-                  mode="tcp", ip="", port="", com_port="", baud=""):
+                  mode="tcp", ip="", port="", com_port="", baud="", logo=b""):
     """
     Construit un message ESC/P pour imprimantes thermiques
     
@@ -19,116 +91,762 @@ def build_message(n_lines_each=20, text="Test Test Test Test Test Test Test Test
         port (str): Port pour TCP
         com_port (str): Port COM pour série
         baud (str): Baudrate pour série
+        logo (bytes): Raster GS v 0 imprimé en tête (voir printer_raster.logo_raster)
     
     Returns:
         bytes: Message formaté ESC/P
     """
-    ESC = b'\x1b'
-    black_cmd = ESC + b'r' + bytes([0])
-    red_cmd = ESC + b'r' + bytes([1])
-    cut_thermal = ESC + b'i'
-    crlf = b'\r\n'
+    return b"".join(iter_message(n_lines_each, text, mode, ip, port, com_port, baud,
+                                 logo=logo))
+
 
-    msg = bytearray()
+def iter_chunks(data, chunk_size=CHUNK_SIZE):
+    """
+    Découpe des données à envoyer en blocs
     
-    # Header info
-    msg += black_cmd
-    msg += b"***************************************" + crlf
-    msg += b"TEST D'IMPRESSION - INFO CONNEXION" + crlf
-    msg += b"***************************************" + crlf
+    Args:
+        data: bytes/bytearray/memoryview (découpé sans copie) ou itérable de blocs
+        chunk_size (int): Taille des blocs pour les données contiguës
     
-    if mode.lower() == "tcp":
-        msg += black_cmd + f"Mode: TCP/IP".encode() + crlf
-        msg += black_cmd + f"IP: {ip}".encode() + crlf
-        msg += black_cmd + f"Port: {port}".encode() + crlf
+    Yields:
+        bytes | memoryview: Blocs successifs
+    """
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        view = memoryview(data)
+        for i in range(0, len(view), chunk_size):
+            yield view[i:i + chunk_size]
     else:
-        msg += black_cmd + f"Mode: COM".encode() + crlf
-        msg += black_cmd + f"Port COM: {com_port}".encode() + crlf
-        msg += black_cmd + f"Baudrate: {baud}".encode() + crlf
-    msg += crlf
-
-    # Section Noir
-    msg += black_cmd
-    msg += b"***************************************" + crlf
-    msg += b"TEST D'IMPRESSION - SECTION NOIR:" + crlf
-    msg += b"***************************************" + crlf
-    for _ in range(n_lines_each):
-        msg += black_cmd + text.encode() + crlf
-    msg += crlf
-
-    # Section Rouge
-    msg += red_cmd
-    msg += b"***************************************" + crlf
-    msg += b"TEST D'IMPRESSION - SECTION ROUGE:" + crlf
-    msg += b"***************************************" + crlf
-    for _ in range(n_lines_each):
-        msg += red_cmd + text.encode() + crlf
-    msg += crlf
-
-    # Fin
-    msg += black_cmd + b"Le Papier Devrait Couper ici" + crlf
-    msg += b'\r\n' * 8
-    msg += cut_thermal + crlf
-    
-    return bytes(msg)
+        yield from data
+
+
+@dataclass
+class SendSample:
+    """Mesures d'un envoi vers une imprimante"""
+    transport: str
+    target: str
+    connect_ms: float = 0.0
+    first_write_ms: float = 0.0
+    write_ms: float = 0.0
+    bytes_sent: int = 0
+    bytes_per_s: float = 0.0
+    baud_utilization: float = 0.0
+    drain_ms: float = 0.0
+    drained: bool = False
+    not_ready: bool = False
+    reused: bool = False
+    error: str = ""
+
+    @property
+    def ok(self):
+        return not self.error
+
+    def finish(self, bytes_sent, write_s, baud=None):
+        """Renseigne volume, durée d'écriture et débit effectif"""
+        self.bytes_sent = bytes_sent
+        self.write_ms = write_s * 1000
+        if write_s > 0:
+            self.bytes_per_s = bytes_sent / write_s
+            if baud:
+                # 8N1: 10 bits transmis par octet
+                self.baud_utilization = min(1.0, bytes_sent * 10 / (baud * write_s))
+
+
+class PrintSessionMetrics:
+    """Accumule les SendSample d'une session (ex: répétitions d'un test d'impression)"""
+
+    FIELDS = (
+        ("connect_ms", "Connexion (ms)"),
+        ("first_write_ms", "1re écriture (ms)"),
+        ("write_ms", "Écriture totale (ms)"),
+        ("bytes_per_s", "Débit (Ko/s)"),
+        ("baud_utilization", "Utilisation baud"),
+        ("drain_ms", "Vidange buffer (ms)"),
+    )
+
+    def __init__(self):
+        self.samples = []
+        self._lock = threading.Lock()
+
+    def record(self, sample):
+        with self._lock:
+            self.samples.append(sample)
+
+    def summary(self):
+        """
+        Returns:
+            dict: {champ: {count, min, avg, p95, max}} sur les envois réussis
+        """
+        with self._lock:
+            ok = [s for s in self.samples if s.ok]
+        return {name: summarize(getattr(s, name) for s in ok) for name, _ in self.FIELDS}
+
+    def diagnose(self):
+        """Indique si la lenteur vient plutôt du réseau ou du buffer de l'imprimante"""
+        stats = self.summary()
+        connect = stats["connect_ms"]["avg"]
+        write = stats["write_ms"]["avg"]
+        util = stats["baud_utilization"]
+        if not stats["write_ms"]["count"]:
+            return "Aucun envoi réussi"
+        if util["count"] and util["avg"]:
+            if util["avg"] < 0.5:
+                return "Débit série sous 50 % du baud: imprimante qui bloque (buffer plein / contrôle de flux)"
+            return "Aucune anomalie évidente"
+        if connect > 50 and connect >= write:
+            return "Connexion lente: problème réseau probable (latence, switch, Wi-Fi)"
+        if write > 200 and connect < 20:
+            return "Connexion rapide mais écriture lente: buffer de l'imprimante saturé"
+        if stats["drain_ms"]["avg"] > 2000 and connect < 20:
+            return "Réseau rapide, vidange lente: l'imprimante limite le débit (mécanique)"
+        return "Aucune anomalie évidente"
+
+    def format_summary(self):
+        """
+        Returns:
+            list: Lignes de résumé min/moy/p95 prêtes à journaliser
+        """
+        with self._lock:
+            total = len(self.samples)
+            failed = sum(1 for s in self.samples if not s.ok)
+            sent = sum(s.bytes_sent for s in self.samples)
+        stats = self.summary()
+        lines = [f"📊 {total} envoi(s), {failed} échec(s), {sent} octets",
+                 f"   {'Mesure':<22}{'min':>12}{'moy':>12}{'p95':>12}"]
+        for name, label in self.FIELDS:
+            st = stats[name]
+            if not st["count"] or not st["max"]:
+                continue
+            if name == "baud_utilization":
+                vals = [f"{st[k] * 100:.0f} %" for k in ("min", "avg", "p95")]
+            elif name == "bytes_per_s":
+                vals = [f"{st[k] / 1024:.1f}" for k in ("min", "avg", "p95")]
+            else:
+                vals = [f"{st[k]:.1f}" for k in ("min", "avg", "p95")]
+            lines.append(f"   {label:<22}" + "".join(f"{v:>12}" for v in vals))
+        lines.append(f"   → {self.diagnose()}")
+        return lines
+
+
+class PrinterConnectionPool:
+    """
+    Pool de connexions TCP persistantes vers les imprimantes, indexé par (ip, port)
+
+    Une connexion est réutilisée tant qu'elle est saine et qu'elle n'est pas restée
+    inactive plus de max_idle secondes. Les sockets ouverts utilisent SO_KEEPALIVE.
+    Un thread de nettoyage ferme les connexions inactives à échéance: beaucoup
+    d'imprimantes n'acceptent qu'une connexion à la fois. Il s'arrête quand le pool
+    est vide et redémarre à la prochaine remise d'un socket.
+    """
 
+    def __init__(self, max_idle=30.0, connect_timeout=5):
+        """
+        Args:
+            max_idle (float): Durée maximale d'inactivité (s) avant fermeture
+            connect_timeout (float): Timeout de connexion/envoi (s)
+        """
+        self.max_idle = max_idle
+        self.connect_timeout = connect_timeout
+        self._conns = {}
+        self._lock = threading.Lock()
+        self._reaper = None
 
-def send_tcp(ip, port, data, log_fn):
+    def _open(self, ip, port):
+        """Ouvre une nouvelle connexion TCP avec keep-alive"""
+        s = socket.create_connection((ip, port), timeout=self.connect_timeout)
+        s.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return s
+
+    @staticmethod
+    def _is_healthy(s):
+        """
+        Vérifie qu'un socket inactif est toujours utilisable
+
+        Un socket lisible sans données (EOF) ou en erreur a été fermé par l'imprimante.
+        """
+        try:
+            readable, _, errored = select.select([s], [], [s], 0)
+        except (OSError, ValueError):
+            return False
+        if errored:
+            return False
+        if readable:
+            try:
+                s.setblocking(False)
+                try:
+                    peek = s.recv(1, socket.MSG_PEEK)
+                finally:
+                    s.setblocking(True)
+            except (BlockingIOError, InterruptedError):
+                return True
+            except OSError:
+                return False
+            return bool(peek)
+        return True
+
+    def acquire(self, ip, port):
+        """
+        Retourne un socket connecté vers (ip, port), réutilisé si possible
+
+        Returns:
+            tuple: (socket, réutilisé: bool)
+        """
+        key = (ip, port)
+        with self._lock:
+            entry = self._conns.pop(key, None)
+        if entry is not None:
+            s, last_used = entry
+            if time.monotonic() - last_used <= self.max_idle and self._is_healthy(s):
+                return s, True
+            self._close(s)
+        return self._open(ip, port), False
+
+    def release(self, ip, port, s):
+        """Remet un socket sain dans le pool"""
+        key = (ip, port)
+        with self._lock:
+            old = self._conns.pop(key, None)
+            self._conns[key] = (s, time.monotonic())
+            if self._reaper is None:
+                self._reaper = threading.Thread(target=self._reap, daemon=True,
+                                                name="printer-pool-reaper")
+                self._reaper.start()
+        if old is not None and old[0] is not s:
+            self._close(old[0])
+
+    def _reap(self):
+        """Ferme les connexions à échéance de max_idle; s'arrête quand le pool est vide"""
+        while True:
+            self.prune()
+            with self._lock:
+                if not self._conns:
+                    self._reaper = None
+                    return
+                deadline = min(t for _, t in self._conns.values()) + self.max_idle
+            time.sleep(max(0.05, deadline - time.monotonic()))
+
+    def send(self, ip, port, data, sample=None, check_status=False):
+        """
+        Envoie des données en réutilisant la connexion du pool
+
+        En cas d'échec sur une connexion réutilisée, une reconnexion est tentée une fois.
+
+        Args:
+            sample (SendSample): Mesures à renseigner (optionnel)
+            check_status (bool): Vérifier le statut avant et pendant l'envoi, puis
+                attendre la vidange du buffer (lève PrinterNotReadyError)
+
+        Returns:
+            bool: True si la connexion a été réutilisée
+        """
+        if sample is None:
+            sample = SendSample("tcp", f"{ip}:{port}")
+        chunks = iter_chunks(data)
+        first = next(chunks, b"")
+
+        def start(s):
+            s.settimeout(self.connect_timeout)
+            guard = status_guard(s) if check_status else None
+            if guard:
+                guard(0)
+            s.sendall(first)
+            return guard
+
+        t0 = time.perf_counter()
+        s, reused = self.acquire(ip, port)
+        t1 = time.perf_counter()
+        try:
+            guard = start(s)
+        except PrinterNotReadyError:
+            self.release(ip, port, s)
+            raise
+        except OSError:
+            self._close(s)
+            if not reused:
+                raise
+            t0 = time.perf_counter()
+            s, reused = self._open(ip, port), False
+            t1 = time.perf_counter()
+            try:
+                guard = start(s)
+            except PrinterNotReadyError:
+                self.release(ip, port, s)
+                raise
+            except OSError:
+                self._close(s)
+                raise
+        sample.connect_ms = (t1 - t0) * 1000
+        sample.first_write_ms = (time.perf_counter() - t1) * 1000
+        sample.reused = reused
+        sent = len(first)
+        try:
+            for index, chunk in enumerate(chunks, 1):
+                if guard:
+                    guard(index)
+                s.sendall(chunk)
+                sent += len(chunk)
+            sample.finish(sent, time.perf_counter() - t1)
+            if guard:
+                _record_drain(s, sample, guard)
+        except PrinterNotReadyError:
+            self.release(ip, port, s)
+            raise
+        except OSError:
+            self._close(s)
+            raise
+        self.release(ip, port, s)
+        return reused
+
+    def prune(self):
+        """Ferme les connexions inactives depuis plus de max_idle secondes"""
+        now = time.monotonic()
+        with self._lock:
+            expired = [k for k, (_, t) in self._conns.items() if now - t > self.max_idle]
+            stale = [self._conns.pop(k)[0] for k in expired]
+        for s in stale:
+            self._close(s)
+        return len(stale)
+
+    def close(self, ip=None, port=None):
+        """Ferme une connexion précise, ou toutes si ip est None"""
+        with self._lock:
+            if ip is None:
+                stale = [s for s, _ in self._conns.values()]
+                self._conns.clear()
+            else:
+                entry = self._conns.pop((ip, port), None)
+                stale = [entry[0]] if entry else []
+        for s in stale:
+            self._close(s)
+
+    @staticmethod
+    def _close(s):
+        try:
+            s.close()
+        except Exception:
+            pass
+
+
+# Pool partagé par l'interface (test d'impression et envois répétés)
+printer_pool = PrinterConnectionPool()
+
+
+def _write_timed(write_fn, data, sample, t_start, guard=None):
+    """Écrit les blocs, renseigne le délai de 1re écriture et retourne les octets écrits"""
+    sent = 0
+    for index, chunk in enumerate(iter_chunks(data)):
+        if guard:
+            guard(index)
+        write_fn(chunk)
+        if not sent:
+            sample.first_write_ms = (time.perf_counter() - t_start) * 1000
+        sent += len(chunk)
+    return sent
+
+
+def _record_drain(conn, sample, guard):
+    """
+    Attend la vidange du buffer de l'imprimante et la note dans le sample
+
+    Ignorée si l'imprimante n'a pas répondu aux DLE EOT: elle ne répondra pas non
+    plus à GS r et l'attente durerait tout le timeout à chaque envoi.
+    """
+    if not guard.answered:
+        return
+    drain_ms = wait_drained(conn)
+    if drain_ms is not None:
+        sample.drain_ms = drain_ms
+        sample.drained = True
+
+
+def send_tcp(ip, port, data, log_fn, pool=None, metrics=None, check_status=False):
     """
     Envoie des données via TCP à une imprimante
     
     Args:
         ip (str): Adresse IP
         port (int): Port TCP
-        data (bytes): Données à envoyer
+        data (bytes | iterable): Données à envoyer (ou blocs, ex: iter_message)
         log_fn (callable): Fonction de logging
+        pool (PrinterConnectionPool): Pool de connexions à réutiliser (optionnel)
+        metrics (PrintSessionMetrics): Session où enregistrer les mesures (optionnel)
+        check_status (bool): Interroger le statut (DLE EOT) avant et pendant l'envoi
+            et attendre la vidange du buffer
+    
+    Returns:
+        SendSample: Mesures de l'envoi
     """
+    sample = SendSample("tcp", f"{ip}:{port}")
+    if pool is not None:
+        try:
+            reused = pool.send(ip, port, data, sample, check_status)
+            suffix = " (connexion réutilisée)" if reused else ""
+            log_fn(f"✅ Envoi TCP réussi vers {ip}:{port}{suffix}")
+        except PrinterNotReadyError as e:
+            sample.error = str(e)
+            sample.not_ready = True
+            log_fn(f"❌ Imprimante {ip}:{port} non prête: {e}")
+        except Exception as e:
+            sample.error = str(e)
+            log_fn(f"❌ Erreur TCP: {e}")
+        if metrics is not None:
+            metrics.record(sample)
+        return sample
+
     s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     s.settimeout(5)
     
     try:
+        t0 = time.perf_counter()
         s.connect((ip, port))
-        s.sendall(data)
+        t1 = time.perf_counter()
+        sample.connect_ms = (t1 - t0) * 1000
+        guard = status_guard(s) if check_status else None
+        sent = _write_timed(s.sendall, data, sample, t1, guard)
+        sample.finish(sent, time.perf_counter() - t1)
+        if guard:
+            _record_drain(s, sample, guard)
         log_fn(f"✅ Envoi TCP réussi vers {ip}:{port}")
+    except PrinterNotReadyError as e:
+        sample.error = str(e)
+        sample.not_ready = True
+        log_fn(f"❌ Imprimante {ip}:{port} non prête: {e}")
     except Exception as e:
+        sample.error = str(e)
         log_fn(f"❌ Erreur TCP: {e}")
     finally:
         try:
             s.close()
         except:
             pass
+    if metrics is not None:
+        metrics.record(sample)
+    return sample
 
 
-def send_serial(port, baudrate, data, log_fn):
+def send_serial(port, baudrate, data, log_fn, metrics=None, check_status=False,
+                flow_control="aucun", pacing=True):
     """
     Envoie des données via port série à une imprimante
     
     Args:
         port (str): Port COM
         baudrate (int): Vitesse de communication
-        data (bytes): Données à envoyer
+        data (bytes | iterable): Données à envoyer (ou blocs, ex: iter_message)
         log_fn (callable): Fonction de logging
+        metrics (PrintSessionMetrics): Session où enregistrer les mesures (optionnel)
+        check_status (bool): Interroger le statut (DLE EOT) avant et pendant l'envoi
+            et attendre la vidange du buffer
+        flow_control (str): "aucun", "rtscts" ou "xonxoff"
+        pacing (bool): Cadencer les blocs au baudrate
+    
+    Returns:
+        SendSample: Mesures de l'envoi (baud_utilization renseigné)
     """
+    sample = SendSample("com", f"{port}@{baudrate}")
     try:
-        import serial
-        with serial.Serial(port, baudrate, timeout=1) as ser:
-            ser.write(data)
+        t0 = time.perf_counter()
+        with SerialTransport(port, baudrate, flow_control, pacing) as ser:
+            t1 = time.perf_counter()
+            sample.connect_ms = (t1 - t0) * 1000
+            guard = status_guard(ser) if check_status else None
+            sent = _write_timed(ser.write, data, sample, t1, guard)
             ser.flush()
+            sample.finish(sent, time.perf_counter() - t1, baudrate)
+            if guard:
+                _record_drain(ser, sample, guard)
         log_fn(f"✅ Envoi série réussi vers {port} @ {baudrate}")
+    except PrinterNotReadyError as e:
+        sample.error = str(e)
+        sample.not_ready = True
+        log_fn(f"❌ Imprimante {port} non prête: {e}")
     except Exception as e:
+        sample.error = str(e)
         log_fn(f"❌ Erreur série: {e}")
+    if metrics is not None:
+        metrics.record(sample)
+    return sample
 
 
 def get_serial_ports():
     """
-    Liste les ports série disponibles
+    Liste les ports série disponibles (depuis l'inventaire en cache)
     
     Returns:
         list: Liste des ports COM disponibles
     """
     try:
-        import serial.tools.list_ports
-        ports = serial.tools.list_ports.comports()
-        return [p.device for p in ports]
+        return port_inventory.devices()
+    except Exception:
+        return []
+
+
+@dataclass
+class PrintTarget:
+    """
+    Imprimante cible: mode "tcp" (address=IP, port) ou "com" (address=port COM, baud,
+    flow_control parmi FLOW_CONTROLS)
+    """
+    mode: str
+    address: str
+    port: int = 9100
+    baud: int = 9600
+    flow_control: str = "aucun"
+
+    @property
+    def label(self):
+        if self.mode == "tcp":
+            return f"{self.address}:{self.port}"
+        return f"{self.address}@{self.baud}"
+
+
+@dataclass
+class PrintResult:
+    """Résultat d'envoi pour une cible"""
+    target: PrintTarget
+    ok: bool = False
+    connect_ms: float = 0.0
+    send_ms: float = 0.0
+    bytes_sent: int = 0
+    error: str = ""
+
+
+def parse_printer_targets(text, flow_control="aucun"):
+    """
+    Interprète une liste de cibles, une par ligne (ou séparées par des virgules)
+
+    Formats acceptés: "192.168.1.50", "192.168.1.50:9100", "COM3", "COM3@19200"
+
+    Args:
+        text (str): Texte saisi par l'utilisateur
+        flow_control (str): Contrôle de flux appliqué aux cibles série
+
+    Returns:
+        list: Liste de PrintTarget
+    """
+    targets = []
+    for raw in text.replace(",", "\n").splitlines():
+        item = raw.strip()
+        if not item or item.startswith("#"):
+            continue
+        if item.upper().startswith("COM") or item.startswith("/dev/"):
+            port, _, baud = item.partition("@")
+            targets.append(PrintTarget("com", port.strip(), baud=int(baud or 9600),
+                                       flow_control=flow_control))
+        else:
+            host, _, port = item.partition(":")
+            targets.append(PrintTarget("tcp", host.strip(), port=int(port or 9100)))
+    return targets
+
+
+async def _send_tcp_async(target, data, timeout, check_status=False):
+    """Envoie via asyncio et mesure connexion / envoi"""
+    result = PrintResult(target)
+    t0 = time.perf_counter()
+    reader, writer = await asyncio.wait_for(
+        asyncio.open_connection(target.address, target.port), timeout)
+    t1 = time.perf_counter()
+    result.connect_ms = (t1 - t0) * 1000
+    try:
+        if check_status:
+            status = await query_status_async(reader, writer)
+            if status is not None and not status.ready:
+                result.error = f"non prête: {status.describe()}"
+                return result
+            t1 = time.perf_counter()
+        writer.write(data)
+        await asyncio.wait_for(writer.drain(), timeout)
+        result.send_ms = (time.perf_counter() - t1) * 1000
+        result.bytes_sent = len(data)
+        result.ok = True
+    finally:
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except Exception:
+            pass
+    return result
+
+
+def _send_serial_timed(target, data):
+    """Envoi série bloquant avec mesure d'ouverture / écriture"""
+    result = PrintResult(target)
+    t0 = time.perf_counter()
+    with SerialTransport(target.address, target.baud, target.flow_control) as ser:
+        t1 = time.perf_counter()
+        result.connect_ms = (t1 - t0) * 1000
+        ser.write(data)
+        ser.flush()
+        result.send_ms = (time.perf_counter() - t1) * 1000
+    result.bytes_sent = len(data)
+    result.ok = True
+    return result
+
+
+async def fan_out_print(targets, data_for, max_parallel=4, timeout=5, check_status=False):
+    """
+    Envoie un message à plusieurs imprimantes en parallèle (parallélisme borné)
+
+    Args:
+        targets (list): Liste de PrintTarget
+        data_for (callable): Fonction target -> bytes à envoyer
+        max_parallel (int): Nombre maximal d'envois simultanés
+        timeout (float): Timeout de connexion/envoi TCP (s)
+        check_status (bool): Vérifier le statut (DLE EOT) avant d'envoyer
+
+    Returns:
+        list: Liste de PrintResult, dans l'ordre des cibles
+    """
+    sem = asyncio.Semaphore(max(1, max_parallel))
+
+    async def one(target):
+        async with sem:
+            try:
+                data = data_for(target)
+                if target.mode == "tcp":
+                    return await _send_tcp_async(target, data, timeout, check_status)
+                return await asyncio.to_thread(_send_serial_timed, target, data)
+            except asyncio.TimeoutError:
+                return PrintResult(target, error="timeout")
+            except Exception as e:
+                return PrintResult(target, error=str(e) or type(e).__name__)
+
+    return await asyncio.gather(*(one(t) for t in targets))
+
+
+def format_fanout_table(results):
+    """
+    Formate les résultats d'un envoi multiple en tableau texte
+
+    Returns:
+        list: Lignes du tableau
+    """
+    width = max([len(r.target.label) for r in results] + [5])
+    lines = [f"{'Cible':<{width}}  {'État':<5}  {'Connexion':>10}  {'Envoi':>10}  Erreur"]
+    lines.append("-" * (width + 47))
+    for r in results:
+        state = "OK" if r.ok else "ÉCHEC"
+        conn = f"{r.connect_ms:.1f} ms" if r.ok else "-"
+        send = f"{r.send_ms:.1f} ms" if r.ok else "-"
+        lines.append(f"{r.target.label:<{width}}  {state:<5}  {conn:>10}  {send:>10}  {r.error}")
+    return lines
+
+
+def run_print_fanout(targets, data_for, log_fn, max_parallel=4, timeout=5, check_status=False):
+    """
+    Exécute fan_out_print de façon synchrone et affiche le tableau récapitulatif
+
+    Args:
+        targets (list): Liste de PrintTarget
+        data_for (callable): Fonction target -> bytes à envoyer
+        log_fn (callable): Fonction de logging
+        max_parallel (int): Nombre maximal d'envois simultanés
+        timeout (float): Timeout de connexion/envoi TCP (s)
+        check_status (bool): Vérifier le statut (DLE EOT) avant d'envoyer
+
+    Returns:
+        list: Liste de PrintResult
+    """
+    log_fn(f"▶ Envoi vers {len(targets)} imprimante(s), {max_parallel} en parallèle...")
+    results = asyncio.run(fan_out_print(targets, data_for, max_parallel, timeout,
+                                          check_status))
+    for line in format_fanout_table(results):
+        log_fn(line)
+    ok = sum(1 for r in results if r.ok)
+    log_fn(f"{'✅' if ok == len(results) else '⚠️'} {ok}/{len(results)} imprimante(s) OK")
+    return results
+
+
+# Ports d'impression brute (JetDirect / AppSocket)
+RAW_PRINT_PORTS = (9100, 9101, 9102)
+
+
+async def _probe_tcp(host, port, timeout):
+    """Tente une connexion TCP; retourne le RTT en ms ou None"""
+    t0 = time.perf_counter()
+    try:
+        _, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    except (OSError, asyncio.TimeoutError):
+        return None
+    rtt = (time.perf_counter() - t0) * 1000
+    writer.close()
+    try:
+        await writer.wait_closed()
     except Exception:
+        pass
+    return rtt
+
+
+async def discover_printers(subnets=None, ports=RAW_PRINT_PORTS, concurrency=256,
+                            timeout=0.5, on_found=None):
+    """
+    Balaye les sous-réseaux à la recherche d'imprimantes réseau (port brut ouvert)
+
+    Args:
+        subnets (list): Réseaux à balayer (défaut: local_subnets())
+        ports (tuple): Ports testés sur chaque hôte
+        concurrency (int): Nombre maximal de connexions simultanées
+        timeout (float): Timeout par tentative de connexion (s)
+        on_found (callable): Appelée (ip, port, rtt_ms) dès qu'une imprimante répond
+
+    Returns:
+        list: Tuples (ip, port, rtt_ms) triés par adresse
+    """
+    if subnets is None:
+        subnets = local_subnets()
+    sem = asyncio.Semaphore(max(1, concurrency))
+    found = []
+
+    async def probe(host, port):
+        async with sem:
+            rtt = await _probe_tcp(host, port, timeout)
+        if rtt is not None:
+            found.append((host, port, rtt))
+            if on_found:
+                on_found(host, port, rtt)
+
+    hosts = dict.fromkeys(str(ip) for net in subnets
+                          for ip in ipaddress.ip_network(net).hosts())
+    await asyncio.gather(*(probe(h, p) for h in hosts for p in ports))
+    found.sort(key=lambda f: (ipaddress.IPv4Address(f[0]), f[1]))
+    return found
+
+
+def run_printer_discovery(log_fn, on_found=None, subnets=None, ports=RAW_PRINT_PORTS,
+                          concurrency=256, timeout=0.5):
+    """
+    Exécute discover_printers de façon synchrone avec journalisation
+
+    Args:
+        log_fn (callable): Fonction de logging
+        on_found (callable): Appelée (ip, port, rtt_ms) pour chaque imprimante trouvée
+        subnets (list): Réseaux à balayer (défaut: local_subnets())
+        ports (tuple): Ports testés sur chaque hôte
+        concurrency (int): Nombre maximal de connexions simultanées
+        timeout (float): Timeout par tentative de connexion (s)
+
+    Returns:
+        list: Tuples (ip, port, rtt_ms)
+    """
+    try:
+        if subnets is None:
+            subnets = local_subnets()
+    except Exception as e:
+        log_fn(f"❌ Impossible de lister les interfaces réseau: {e}")
+        return []
+    if not subnets:
+        log_fn("⚠️ Aucune interface IPv4 active")
         return []
+
+    log_fn(f"🔍 Recherche d'imprimantes sur {', '.join(str(n) for n in subnets)} "
+           f"(ports {', '.join(str(p) for p in ports)})...")
+
+    def found(ip, port, rtt):
+        log_fn(f"  🖨️ {ip}:{port} ({rtt:.0f} ms)")
+        if on_found:
+            on_found(ip, port, rtt)
+
+    t0 = time.perf_counter()
+    results = asyncio.run(discover_printers(subnets, ports, concurrency, timeout, found))
+    log_fn(f"✅ {len(results)} imprimante(s) trouvée(s) en {time.perf_counter() - t0:.1f} s")
+    return results
@@ -0,0 +1,207 @@
+"""
+Statut temps réel des imprimantes ESC/POS
+Interroge l'imprimante (DLE EOT n) sur le canal TCP ou série déjà ouvert et décode
+les bits papier absent / capot ouvert / hors ligne. GS r sert à détecter la vidange du buffer.
+"""
+import asyncio
+import select
+import socket
+import time
+from dataclasses import dataclass, field
+
+DLE_EOT = b'\x10\x04'
+# GS r 1: commande non temps réel, sa réponse n'arrive qu'une fois le buffer traité
+GS_R_PAPER = b'\x1dr\x01'
+
+# Requêtes DLE EOT envoyées: 1 = imprimante, 2 = cause hors ligne, 4 = capteur papier
+STATUS_REQUESTS = (1, 2, 4)
+
+# Attente maximale de la réponse GS r (s); au-delà l'appelant revient au délai fixe
+DRAIN_TIMEOUT = 3.0
+
+
+class PrinterNotReadyError(RuntimeError):
+    """L'imprimante a signalé un état qui empêche l'impression"""
+
+    def __init__(self, status):
+        super().__init__(status.describe())
+        self.status = status
+
+
+@dataclass
+class PrinterStatus:
+    """Statut décodé d'une imprimante ESC/POS"""
+    offline: bool = False
+    cover_open: bool = False
+    paper_out: bool = False
+    paper_near_end: bool = False
+    error: bool = False
+    raw: dict = field(default_factory=dict)
+
+    @property
+    def ready(self):
+        return not (self.offline or self.cover_open or self.paper_out or self.error)
+
+    def describe(self):
+        """Retourne un résumé lisible du statut"""
+        problems = []
+        if self.paper_out:
+            problems.append("papier absent")
+        if self.cover_open:
+            problems.append("capot ouvert")
+        if self.error:
+            problems.append("erreur imprimante")
+        if self.offline and not problems:
+            problems.append("hors ligne")
+        if not problems:
+            return "papier presque fini" if self.paper_near_end else "prête"
+        return ", ".join(problems)
+
+
+def _valid(b):
+    """Les octets de statut DLE EOT ont les bits 1 et 4 à 1, les bits 0 et 7 à 0"""
+    return b is not None and (b & 0x93) == 0x12
+
+
+def decode_status(responses):
+    """
+    Décode les réponses DLE EOT
+
+    Args:
+        responses (dict): {n: octet reçu ou None}
+
+    Returns:
+        PrinterStatus | None: None si aucune réponse valide (imprimante non ESC/POS)
+    """
+    valid = {n: b for n, b in responses.items() if _valid(b)}
+    if not valid:
+        return None
+    status = PrinterStatus(raw=valid)
+    if 1 in valid:
+        status.offline = bool(valid[1] & 0x08)
+    if 2 in valid:
+        status.cover_open = bool(valid[2] & 0x04)
+        status.paper_out = bool(valid[2] & 0x20)
+        status.error = bool(valid[2] & 0x40)
+    if 4 in valid:
+        status.paper_near_end = bool(valid[4] & 0x0C)
+        status.paper_out = status.paper_out or bool(valid[4] & 0x60)
+    return status
+
+
+def _socket_read_byte(s, timeout):
+    ready, _, _ = select.select([s], [], [], timeout)
+    if not ready:
+        return None
+    b = s.recv(1)
+    return b[0] if b else None
+
+
+def _socket_discard(s):
+    while select.select([s], [], [], 0)[0]:
+        if not s.recv(4096):
+            break
+
+
+def _serial_read_byte(ser, timeout):
+    previous = ser.timeout
+    ser.timeout = timeout
+    try:
+        b = ser.read(1)
+    finally:
+        ser.timeout = previous
+    return b[0] if b else None
+
+
+def _channel(conn):
+    """Retourne (write, read_byte, discard) pour un socket ou un port série pyserial"""
+    if isinstance(conn, socket.socket):
+        return (conn.sendall,
+                lambda t: _socket_read_byte(conn, t),
+                lambda: _socket_discard(conn))
+    return (conn.write,
+            lambda t: _serial_read_byte(conn, t),
+            conn.reset_input_buffer)
+
+
+def query_status(conn, timeout=0.3):
+    """
+    Interroge le statut temps réel sur une connexion ouverte
+
+    Args:
+        conn: socket connecté ou serial.Serial ouvert
+        timeout (float): Attente maximale par réponse (s)
+
+    Returns:
+        PrinterStatus | None: None si l'imprimante ne répond pas aux DLE EOT
+    """
+    write, read_byte, discard = _channel(conn)
+    discard()
+    responses = {}
+    for n in STATUS_REQUESTS:
+        write(DLE_EOT + bytes([n]))
+        responses[n] = read_byte(timeout)
+        if responses[n] is None and n == STATUS_REQUESTS[0]:
+            break
+    return decode_status(responses)
+
+
+def wait_drained(conn, timeout=DRAIN_TIMEOUT):
+    """
+    Attend que l'imprimante ait traité tout ce qui a été envoyé
+
+    Returns:
+        float | None: Durée d'attente en ms, ou None si pas de réponse (non supporté / timeout)
+    """
+    write, read_byte, discard = _channel(conn)
+    discard()
+    t0 = time.perf_counter()
+    write(GS_R_PAPER)
+    if read_byte(timeout) is None:
+        return None
+    return (time.perf_counter() - t0) * 1000
+
+
+def status_guard(conn, every=16, timeout=0.3):
+    """
+    Construit un contrôle appelé entre les blocs d'un envoi
+
+    Le statut est interrogé avant le premier bloc puis tous les `every` blocs.
+    Lève PrinterNotReadyError si l'imprimante n'est pas prête.
+
+    Returns:
+        callable: guard(index_du_bloc); guard.answered passe à True dès que
+            l'imprimante a répondu aux DLE EOT
+    """
+    def guard(index):
+        if index % every:
+            return
+        status = query_status(conn, timeout)
+        if status is None:
+            return
+        guard.answered = True
+        if not status.ready:
+            raise PrinterNotReadyError(status)
+    guard.answered = False
+    return guard
+
+
+async def query_status_async(reader, writer, timeout=0.3):
+    """
+    Version asyncio de query_status pour une connexion asyncio.open_connection
+
+    Returns:
+        PrinterStatus | None
+    """
+    responses = {}
+    for n in STATUS_REQUESTS:
+        writer.write(DLE_EOT + bytes([n]))
+        await writer.drain()
+        try:
+            b = await asyncio.wait_for(reader.read(1), timeout)
+        except asyncio.TimeoutError:
+            b = b""
+        responses[n] = b[0] if b else None
+        if responses[n] is None and n == STATUS_REQUESTS[0]:
+            break
+    return decode_status(responses)
@@ -0,0 +1,133 @@
+"""
+Journal des modifications du registre
+Avant chaque écriture, la valeur d'origine (valeur, type ou absence) est ajoutée au
+fichier de l'exécution en cours. Un fichier par exécution: annuler une exécution ne
+lit que son propre fichier, quel que soit l'historique du poste.
+"""
+import base64
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+import uuid
+
+_RUN_ID_RE = re.compile(r"^[\w-]+$")
+
+
+def default_journal_dir():
+    """Dossier du journal: %LOCALAPPDATA%\\Sys-Tools\\registry-journal (ou dossier temporaire)"""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(base, "Sys-Tools", "registry-journal")
+
+
+def _encode(value):
+    return {"b64": base64.b64encode(value).decode("ascii")} if isinstance(value, bytes) else value
+
+
+def _decode(value):
+    return base64.b64decode(value["b64"]) if isinstance(value, dict) else value
+
+
+class RegistryJournal:
+    """
+    Journal en ajout seul, indexé par identifiant d'exécution
+
+    - index.jsonl: une ligne par exécution (id, date, libellé)
+    - <id>.jsonl: une ligne par valeur modifiée {h, p, n, t, v}; t vaut null si la
+      valeur n'existait pas. Seul l'état d'origine compte: une valeur modifiée deux
+      fois dans la même exécution n'est journalisée qu'une fois.
+    """
+
+    def __init__(self, folder=None):
+        """
+        Args:
+            folder (str): Dossier du journal (défaut: default_journal_dir()), créé à la 1re écriture
+        """
+        self.folder = folder or default_journal_dir()
+        self._recorded = {}
+        self._lock = threading.Lock()
+
+    @property
+    def _index_path(self):
+        return os.path.join(self.folder, "index.jsonl")
+
+    def _run_path(self, run_id):
+        if not _RUN_ID_RE.match(run_id):
+            raise ValueError(f"Identifiant d'exécution invalide: {run_id!r}")
+        return os.path.join(self.folder, f"{run_id}.jsonl")
+
+    def _append(self, path, lines):
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("".join(json.dumps(line, ensure_ascii=False, separators=(",", ":")) + "\n"
+                            for line in lines))
+            f.flush()
+            os.fsync(f.fileno())
+
+    def new_run(self, label=""):
+        """
+        Ouvre une nouvelle exécution
+
+        Returns:
+            str: Identifiant de l'exécution (ex: 20250114-093012-3fa2c1)
+        """
+        run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        with self._lock:
+            os.makedirs(self.folder, exist_ok=True)
+            self._append(self._index_path, [{"id": run_id, "at": time.time(), "label": label}])
+            self._recorded[run_id] = set()
+        return run_id
+
+    def record(self, run_id, entries):
+        """
+        Journalise l'état d'origine de valeurs sur le point d'être modifiées
+
+        Args:
+            run_id (str): Exécution en cours
+            entries (iterable): (hive, chemin, nom, (valeur, type) ou None si absente)
+        """
+        with self._lock:
+            seen = self._recorded.setdefault(run_id, set())
+            lines = []
+            for hive, path, name, previous in entries:
+                key = (hive, path.lower(), name.lower())
+                if key in seen:
+                    continue
+                seen.add(key)
+                value, reg_type = previous if previous is not None else (None, None)
+                lines.append({"h": hive, "p": path, "n": name, "t": reg_type,
+                              "v": _encode(value)})
+            if lines:
+                self._append(self._run_path(run_id), lines)
+
+    def entries(self, run_id):
+        """
+        Returns:
+            list: (hive, chemin, nom, (valeur, type) ou None) dans l'ordre du journal
+        """
+        try:
+            with open(self._run_path(run_id), "r", encoding="utf-8") as f:
+                lines = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        result, seen = [], set()
+        for e in lines:
+            key = (e["h"], e["p"].lower(), e["n"].lower())
+            if key not in seen:
+                seen.add(key)
+                previous = None if e["t"] is None else (_decode(e["v"]), e["t"])
+                result.append((e["h"], e["p"], e["n"], previous))
+        return result
+
+    def runs(self):
+        """
+        Returns:
+            list: {"id", "at", "label"} des exécutions ayant modifié le registre, plus récentes d'abord
+        """
+        try:
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                runs = [json.loads(line) for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+        return [r for r in reversed(runs) if os.path.exists(self._run_path(r["id"]))]
@@ -0,0 +1,444 @@
+"""
+Accès au registre Windows
+Lecture en processus via winreg (vues WOW64 64 et 32 bits en une passe) avec cache,
+moteur d'application de tweaks déclaratifs (une ouverture par clé, écriture des seules
+différences, valeurs d'origine journalisées avant écriture, annulation d'une exécution)
+et registre factice en mémoire de même interface pour les tests hors Windows.
+"""
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+from services.registry_journal import RegistryJournal
+
+HKEY_CLASSES_ROOT = 0x80000000
+HKEY_CURRENT_USER = 0x80000001
+HKEY_LOCAL_MACHINE = 0x80000002
+HKEY_USERS = 0x80000003
+
+KEY_QUERY_VALUE = 0x0001
+KEY_SET_VALUE = 0x0002
+KEY_READ = 0x20019
+KEY_WRITE = 0x20006
+KEY_ALL_ACCESS = 0xF003F
+KEY_WOW64_64KEY = 0x0100
+KEY_WOW64_32KEY = 0x0200
+
+REG_SZ = 1
+REG_EXPAND_SZ = 2
+REG_BINARY = 3
+REG_DWORD = 4
+REG_MULTI_SZ = 7
+REG_QWORD = 11
+
+# Vues WOW64 lues dans l'ordre: une application 32 bits écrit sous WOW6432Node
+WOW64_VIEWS = (("64", KEY_WOW64_64KEY), ("32", KEY_WOW64_32KEY))
+
+# Statuts du rapport d'application des tweaks
+CHANGED = "modifié"
+UNCHANGED = "inchangé"
+FAILED = "échec"
+
+HIVE_NAMES = {
+    HKEY_CLASSES_ROOT: "HKCR",
+    HKEY_CURRENT_USER: "HKCU",
+    HKEY_LOCAL_MACHINE: "HKLM",
+    HKEY_USERS: "HKU",
+}
+
+
+def default_backend():
+    """Module winreg réel (Windows uniquement)"""
+    import winreg
+    return winreg
+
+
+class FakeKey:
+    """Handle de clé du registre factice (utilisable avec with, comme PyHKEY)"""
+
+    def __init__(self, registry, path):
+        self.registry = registry
+        self.path = path
+        self.closed = False
+
+    def Close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+
+
+class FakeWinreg:
+    """
+    Registre en mémoire reproduisant le sous-ensemble de winreg utilisé par l'application
+
+    Les chemins sont insensibles à la casse. Sous HKLM\\SOFTWARE, la vue 32 bits
+    (KEY_WOW64_32KEY) est redirigée vers SOFTWARE\\WOW6432Node comme sous Windows.
+    Les compteurs opens/reads/writes servent aux tests et benchmarks.
+    """
+
+    HKEY_CLASSES_ROOT = HKEY_CLASSES_ROOT
+    HKEY_CURRENT_USER = HKEY_CURRENT_USER
+    HKEY_LOCAL_MACHINE = HKEY_LOCAL_MACHINE
+    HKEY_USERS = HKEY_USERS
+    KEY_QUERY_VALUE = KEY_QUERY_VALUE
+    KEY_SET_VALUE = KEY_SET_VALUE
+    KEY_READ = KEY_READ
+    KEY_WRITE = KEY_WRITE
+    KEY_ALL_ACCESS = KEY_ALL_ACCESS
+    KEY_WOW64_64KEY = KEY_WOW64_64KEY
+    KEY_WOW64_32KEY = KEY_WOW64_32KEY
+    REG_SZ = REG_SZ
+    REG_EXPAND_SZ = REG_EXPAND_SZ
+    REG_BINARY = REG_BINARY
+    REG_DWORD = REG_DWORD
+    REG_MULTI_SZ = REG_MULTI_SZ
+    REG_QWORD = REG_QWORD
+
+    def __init__(self, values=None):
+        """
+        Args:
+            values (dict): {(hive, chemin, nom): (valeur, type)} initiales (vue 64 bits)
+        """
+        self.keys = {}
+        self.opens = self.reads = self.writes = 0
+        for (hive, path, name), (value, reg_type) in (values or {}).items():
+            self.keys.setdefault(self._key_id(hive, path, KEY_WOW64_64KEY), {})[
+                name.lower()] = (name, value, reg_type)
+
+    @staticmethod
+    def _key_id(hive, path, access=0):
+        parts = [p for p in path.lower().split("\\") if p]
+        if (hive == HKEY_LOCAL_MACHINE and access & KEY_WOW64_32KEY and parts
+                and parts[0] == "software" and parts[1:2] != ["wow6432node"]):
+            parts.insert(1, "wow6432node")
+        return hive, "\\".join(parts)
+
+    def OpenKey(self, key, sub_key, reserved=0, access=KEY_READ):
+        self.opens += 1
+        key_id = self._key_id(key, sub_key, access)
+        if key_id not in self.keys:
+            raise FileNotFoundError(2, "Le fichier spécifié est introuvable")
+        return FakeKey(self, key_id)
+
+    OpenKeyEx = OpenKey
+
+    def CreateKeyEx(self, key, sub_key, reserved=0, access=KEY_WRITE):
+        self.opens += 1
+        key_id = self._key_id(key, sub_key, access)
+        self.keys.setdefault(key_id, {})
+        return FakeKey(self, key_id)
+
+    def CloseKey(self, hkey):
+        hkey.Close()
+
+    def QueryValueEx(self, key, value_name):
+        self.reads += 1
+        try:
+            _, value, reg_type = self.keys[key.path][(value_name or "").lower()]
+        except KeyError:
+            raise FileNotFoundError(2, "Le fichier spécifié est introuvable") from None
+        return value, reg_type
+
+    def SetValueEx(self, key, value_name, reserved, reg_type, value):
+        self.writes += 1
+        self.keys[key.path][(value_name or "").lower()] = (value_name, value, reg_type)
+
+    def DeleteValue(self, key, value):
+        self.writes += 1
+        try:
+            del self.keys[key.path][(value or "").lower()]
+        except KeyError:
+            raise FileNotFoundError(2, "Le fichier spécifié est introuvable") from None
+
+
+class RegistryReader:
+    """
+    Lecture de valeurs du registre avec cache
+
+    Les lectures passent par winreg dans le processus (aucun reg.exe). Le cache est
+    vidé explicitement avec invalidate(), ex: après une modification par l'application.
+    """
+
+    def __init__(self, backend=None):
+        """
+        Args:
+            backend: Module winreg ou FakeWinreg (défaut: winreg, chargé au premier accès)
+        """
+        self._backend = backend
+        self._cache = {}
+        self._lock = threading.Lock()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = default_backend()
+        return self._backend
+
+    def _read_views(self, hive, path, name):
+        reg = self.backend
+        for view, flag in WOW64_VIEWS:
+            try:
+                with reg.OpenKey(hive, path, 0, reg.KEY_READ | flag) as key:
+                    value, reg_type = reg.QueryValueEx(key, name)
+                return value, reg_type, view
+            except OSError:
+                continue
+        return None
+
+    def read(self, hive, path, name):
+        """
+        Lit une valeur dans la vue 64 bits puis, à défaut, dans la vue 32 bits
+
+        Args:
+            hive (int): Ruche (ex: HKEY_LOCAL_MACHINE)
+            path (str): Chemin de la clé
+            name (str): Nom de la valeur
+
+        Returns:
+            tuple | None: (valeur, type, vue "64"/"32"), ou None si absente partout
+        """
+        cache_key = (hive, path.lower(), name.lower())
+        with self._lock:
+            if cache_key in self._cache:
+                return self._cache[cache_key]
+        try:
+            result = self._read_views(hive, path, name)
+        except ImportError:
+            result = None
+        with self._lock:
+            self._cache[cache_key] = result
+        return result
+
+    def invalidate(self, hive=None, path=None):
+        """Vide le cache, entièrement ou pour une ruche / une clé"""
+        with self._lock:
+            if hive is None:
+                self._cache.clear()
+                return
+            for key in [k for k in self._cache
+                        if k[0] == hive and (path is None or k[1] == path.lower())]:
+                del self._cache[key]
+
+
+# Lecteur partagé par l'application
+registry_reader = RegistryReader()
+
+
+@dataclass(frozen=True)
+class RegTweak:
+    """Valeur de registre voulue (type et valeur None: la valeur doit être absente)"""
+    hive: int
+    path: str
+    name: str
+    type: int
+    value: object
+
+    @property
+    def label(self):
+        return f"{HIVE_NAMES.get(self.hive, hex(self.hive))}\\{self.path}\\{self.name}"
+
+
+@dataclass
+class TweakResult:
+    """Résultat de l'application d'un tweak"""
+    tweak: RegTweak
+    status: str
+    previous: tuple = None  # (valeur, type) avant application, None si absente
+    error: str = ""
+
+
+def dword_tweaks(hive, values):
+    """
+    Construit des tweaks REG_DWORD
+
+    Args:
+        hive (int): Ruche (ex: HKEY_CURRENT_USER)
+        values (list): (chemin, nom, valeur)
+
+    Returns:
+        list: RegTweak
+    """
+    return [RegTweak(hive, path, name, REG_DWORD, value) for path, name, value in values]
+
+
+def summarize_results(results):
+    """Nombre de résultats par statut: {CHANGED: n, UNCHANGED: n, FAILED: n}"""
+    counts = {CHANGED: 0, UNCHANGED: 0, FAILED: 0}
+    for result in results:
+        counts[result.status] += 1
+    return counts
+
+
+class RegistryEngine:
+    """
+    Applique des jeux de tweaks déclaratifs
+
+    Les tweaks sont groupés par clé: chaque clé est ouverte une fois en lecture, les
+    valeurs actuelles sont comparées (valeur et type) et la clé n'est rouverte en
+    écriture que s'il reste des différences. Un poste déjà configuré ne subit donc
+    aucune écriture. Les écritures se font dans la vue 64 bits du registre.
+
+    Avec un journal, les valeurs d'origine sont journalisées avant chaque écriture,
+    sous l'exécution ouverte par run() dans le thread courant (sinon une exécution
+    est ouverte pour l'appel à apply()).
+    """
+
+    def __init__(self, backend=None, reader=None, journal=None):
+        """
+        Args:
+            backend: Module winreg ou FakeWinreg (défaut: winreg, chargé au premier accès)
+            reader (RegistryReader): Cache à invalider après écriture (défaut: registry_reader)
+            journal (RegistryJournal): Journal des valeurs d'origine (None: pas de journal)
+        """
+        self._backend = backend
+        self.reader = reader or registry_reader
+        self.journal = journal
+        self._local = threading.local()
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            self._backend = default_backend()
+        return self._backend
+
+    def _current_values(self, hive, path, names):
+        """(valeur, type) actuels de chaque nom, None si absent (clé comprise)"""
+        reg = self.backend
+        current = dict.fromkeys(names)
+        try:
+            key = reg.OpenKey(hive, path, 0, reg.KEY_READ | reg.KEY_WOW64_64KEY)
+        except FileNotFoundError:
+            return current
+        with key:
+            for name in names:
+                try:
+                    current[name] = tuple(reg.QueryValueEx(key, name))
+                except FileNotFoundError:
+                    pass
+        return current
+
+    def _write(self, hive, path, tweaks):
+        reg = self.backend
+        with reg.CreateKeyEx(hive, path, 0, reg.KEY_SET_VALUE | reg.KEY_WOW64_64KEY) as key:
+            for tweak in tweaks:
+                if tweak.type is None:
+                    try:
+                        reg.DeleteValue(key, tweak.name)
+                    except FileNotFoundError:
+                        pass
+                else:
+                    reg.SetValueEx(key, tweak.name, 0, tweak.type, tweak.value)
+
+    @contextmanager
+    def run(self, label):
+        """
+        Regroupe les modifications du bloc sous une même exécution du journal
+
+        L'exécution n'est créée qu'à la première écriture: un bloc sans modification
+        ne laisse aucune trace. Le bloc reçoit une liste qui contiendra, à la sortie,
+        l'identifiant de l'exécution si le registre a été modifié.
+        """
+        previous = getattr(self._local, "run", None)
+        self._local.run = run = {"label": label, "id": None}
+        holder = []
+        try:
+            yield holder
+        finally:
+            if run["id"]:
+                holder.append(run["id"])
+            self._local.run = previous
+
+    def wrap_run(self, label, fn):
+        """Retourne fn exécutée sous run(label), ex: comme cible de thread"""
+        def wrapper(*args, **kwargs):
+            with self.run(label):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    def _run_id(self, label):
+        run = getattr(self._local, "run", None)
+        if run is None:
+            return self.journal.new_run(label)
+        if run["id"] is None:
+            run["id"] = self.journal.new_run(run["label"])
+        return run["id"]
+
+    def apply(self, tweaks, log_fn=None, dry_run=False, label="Modification du registre"):
+        """
+        Applique les tweaks qui diffèrent de l'état actuel
+
+        Args:
+            tweaks (iterable): RegTweak à appliquer
+            log_fn (callable): Fonction de logging (une ligne par valeur)
+            dry_run (bool): Comparer sans écrire (les différences sont rapportées CHANGED)
+            label (str): Libellé de l'exécution du journal, hors d'un bloc run()
+
+        Returns:
+            list: TweakResult, groupés par clé dans l'ordre de première apparition
+        """
+        groups = {}
+        for tweak in tweaks:
+            groups.setdefault((tweak.hive, tweak.path.lower()), []).append(tweak)
+
+        results = []
+        run_id = None
+        for (hive, _), group in groups.items():
+            path = group[0].path
+            try:
+                current = self._current_values(hive, path, [t.name for t in group])
+                pending = [t for t in group
+                           if current[t.name] != (None if t.type is None else (t.value, t.type))]
+                if pending and not dry_run:
+                    if self.journal is not None:
+                        run_id = run_id or self._run_id(label)
+                        self.journal.record(run_id, [(hive, path, t.name, current[t.name])
+                                                     for t in pending])
+                    self._write(hive, path, pending)
+                    self.reader.invalidate(hive, path)
+            except OSError as e:
+                results.extend(TweakResult(t, FAILED, error=str(e)) for t in group)
+                if log_fn:
+                    for t in group:
+                        log_fn(f"  ⚠️ Erreur pour {t.name}: {e}")
+                continue
+            for t in group:
+                changed = t in pending
+                results.append(TweakResult(t, CHANGED if changed else UNCHANGED, current[t.name]))
+                if log_fn:
+                    state = "absente" if t.type is None else f"= {t.value}"
+                    log_fn(f"  ✓ {t.name} {state}" + ("" if changed else " (déjà appliqué)"))
+        return results
+
+    def rollback(self, run_id, log_fn=None):
+        """
+        Rétablit les valeurs d'origine d'une exécution, en une passe groupée par clé
+
+        Les valeurs absentes à l'origine sont supprimées; les clés créées restent
+        (vides). L'annulation est elle-même journalisée et peut donc être annulée.
+
+        Args:
+            run_id (str): Exécution à annuler
+            log_fn (callable): Fonction de logging
+
+        Returns:
+            list: TweakResult (liste vide si l'exécution est inconnue)
+        """
+        entries = self.journal.entries(run_id) if self.journal is not None else []
+        tweaks = []
+        for hive, path, name, previous in entries:
+            value, reg_type = previous if previous is not None else (None, None)
+            tweaks.append(RegTweak(hive, path, name, reg_type, value))
+        if not tweaks:
+            if log_fn:
+                log_fn(f"⚠️ Aucune modification journalisée pour {run_id}")
+            return []
+        with self.run(f"Annulation {run_id}"):
+            return self.apply(tweaks, log_fn)
+
+
+# Moteur partagé par l'application (modifications journalisées)
+registry_engine = RegistryEngine(journal=RegistryJournal())
@@ -0,0 +1,201 @@
+"""
+Transport série pour imprimantes
+Écriture par blocs cadencée au baudrate, contrôle de flux matériel (RTS/CTS) ou
+logiciel (XON/XOFF), et détection automatique du baudrate.
+"""
+import asyncio
+import time
+
+from services.printer_status import DLE_EOT, decode_status
+
+FLOW_CONTROLS = ("aucun", "rtscts", "xonxoff")
+AUTO_BAUD_RATES = (9600, 19200, 38400, 115200)
+
+# Durée d'émission visée par bloc: assez courte pour ne pas saturer un petit buffer
+PACING_INTERVAL = 0.05
+
+
+def _default_factory(port, **kwargs):
+    import serial
+    return serial.Serial(port, **kwargs)
+
+
+class SerialTransport:
+    """
+    Port série ouvert avec contrôle de flux et écriture cadencée
+
+    Utilisable comme gestionnaire de contexte. serial_factory permet d'injecter un
+    autre constructeur (ex: serial.serial_for_url) pour les tests.
+    """
+
+    def __init__(self, port, baudrate=9600, flow_control="aucun", pacing=True,
+                 timeout=1, write_timeout=10, serial_factory=None):
+        """
+        Args:
+            port (str): Port COM (ou chemin /dev/pts/N sous Linux)
+            baudrate (int): Vitesse de communication
+            flow_control (str): "aucun", "rtscts" (matériel) ou "xonxoff" (logiciel)
+            pacing (bool): Cadencer les blocs au baudrate
+            timeout (float): Timeout de lecture (s)
+            write_timeout (float): Timeout d'écriture (s), couvre un blocage CTS/XOFF
+            serial_factory (callable): Constructeur du port (défaut: serial.Serial)
+        """
+        if flow_control not in FLOW_CONTROLS:
+            raise ValueError(f"Contrôle de flux inconnu: {flow_control}")
+        self.port = port
+        self.baudrate = baudrate
+        self.flow_control = flow_control
+        self.pacing = pacing
+        self._timeout = timeout
+        self.write_timeout = write_timeout
+        self._factory = serial_factory or _default_factory
+        self.ser = None
+
+    @property
+    def bytes_per_second(self):
+        # 8N1: 10 bits transmis par octet
+        return self.baudrate / 10
+
+    @property
+    def chunk_size(self):
+        return max(16, int(self.bytes_per_second * PACING_INTERVAL))
+
+    def open(self):
+        self.ser = self._factory(
+            self.port,
+            baudrate=self.baudrate,
+            timeout=self._timeout,
+            write_timeout=self.write_timeout,
+            rtscts=self.flow_control == "rtscts",
+            xonxoff=self.flow_control == "xonxoff",
+        )
+        return self
+
+    def close(self):
+        if self.ser is not None:
+            try:
+                self.ser.close()
+            finally:
+                self.ser = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Interface compatible pyserial pour les fonctions de statut
+    @property
+    def timeout(self):
+        return self.ser.timeout if self.ser is not None else self._timeout
+
+    @timeout.setter
+    def timeout(self, value):
+        self._timeout = value
+        if self.ser is not None:
+            self.ser.timeout = value
+
+    def read(self, size=1):
+        return self.ser.read(size)
+
+    def reset_input_buffer(self):
+        self.ser.reset_input_buffer()
+
+    def flush(self):
+        self.ser.flush()
+
+    def write(self, data):
+        """
+        Écrit les données par blocs de chunk_size, cadencés au baudrate
+
+        Avec le cadencement, chaque bloc attend que le précédent ait eu le temps
+        d'être émis sur la ligne, ce qui évite de déborder le buffer de l'imprimante.
+
+        Returns:
+            int: Nombre d'octets écrits
+        """
+        view = memoryview(data)
+        size = self.chunk_size
+        start = time.perf_counter()
+        sent = 0
+        for i in range(0, len(view), size):
+            chunk = view[i:i + size]
+            self.ser.write(chunk)
+            sent += len(chunk)
+            if self.pacing:
+                due = start + sent / self.bytes_per_second
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+        return sent
+
+
+def probe_baud(port, baudrate, timeout=0.3, serial_factory=None):
+    """
+    Teste un baudrate en envoyant DLE EOT 1 et en validant l'octet de statut reçu
+
+    Returns:
+        bool: True si l'imprimante a répondu un statut valide
+    """
+    factory = serial_factory or _default_factory
+    try:
+        ser = factory(port, baudrate=baudrate, timeout=timeout, write_timeout=timeout)
+    except Exception:
+        return False
+    try:
+        ser.reset_input_buffer()
+        ser.write(DLE_EOT + b'\x01')
+        ser.flush()
+        b = ser.read(1)
+        return bool(b) and decode_status({1: b[0]}) is not None
+    except Exception:
+        return False
+    finally:
+        try:
+            ser.close()
+        except Exception:
+            pass
+
+
+def _detect_port_baud(port, rates, timeout, serial_factory):
+    for rate in rates:
+        if probe_baud(port, rate, timeout, serial_factory):
+            return rate
+    return None
+
+
+async def detect_baud_rates(ports, rates=AUTO_BAUD_RATES, timeout=0.3, serial_factory=None):
+    """
+    Détecte le baudrate de chaque port, tous les ports sondés en parallèle
+
+    Un port ne pouvant être ouvert qu'une fois, les vitesses d'un même port sont
+    essayées l'une après l'autre.
+
+    Returns:
+        dict: {port: baudrate détecté ou None}
+    """
+    results = await asyncio.gather(*(
+        asyncio.to_thread(_detect_port_baud, p, rates, timeout, serial_factory)
+        for p in ports))
+    return dict(zip(ports, results))
+
+
+def run_auto_baud(ports, log_fn, rates=AUTO_BAUD_RATES, timeout=0.3, serial_factory=None):
+    """
+    Exécute detect_baud_rates de façon synchrone avec journalisation
+
+    Returns:
+        dict: {port: baudrate détecté ou None}
+    """
+    if not ports:
+        log_fn("⚠️ Aucun port COM à sonder")
+        return {}
+    log_fn(f"🔍 Détection du baudrate sur {', '.join(ports)} "
+           f"({'/'.join(str(r) for r in rates)})...")
+    results = asyncio.run(detect_baud_rates(ports, rates, timeout, serial_factory))
+    for port, rate in results.items():
+        if rate:
+            log_fn(f"  ✅ {port}: {rate} bauds")
+        else:
+            log_fn(f"  ✗ {port}: aucune réponse")
+    return results
@@ -0,0 +1,259 @@
+"""
+Banc de débit du partage veloce
+Écrit puis relit des fichiers de test dans le partage (\\\\serveur\\veloce ou tout
+dossier local), mesure le débit séquentiel, les cadences de création / ouverture /
+stat de petits fichiers et les percentiles de latence par opération, puis supprime
+tout ce qu'il a créé.
+"""
+import mmap
+import os
+import shutil
+import socket
+import time
+
+from utils.stats_utils import percentile, summarize
+
+MB = 1024 * 1024
+BLOCK_SIZE = MB
+
+# CreateFileW: lecture sans cache (FILE_FLAG_NO_BUFFERING, y compris côté client SMB)
+GENERIC_READ = 0x80000000
+FILE_SHARE_READ = 0x1
+OPEN_EXISTING = 3
+FILE_FLAG_NO_BUFFERING = 0x20000000
+FILE_FLAG_SEQUENTIAL_SCAN = 0x08000000
+
+
+class ShareBenchReport:
+    """Résultats d'un banc de débit"""
+
+    def __init__(self, share):
+        self.share = share
+        # opération -> latences (ms) de chaque appel
+        self.latencies = {}
+        # "écriture"/"lecture" -> (octets, secondes)
+        self.throughput = {}
+        # True si la lecture a pu être servie par un cache (lecture sans cache impossible)
+        self.read_cached = False
+        self.errors = []
+
+    def add(self, op, ms):
+        self.latencies.setdefault(op, []).append(ms)
+
+    def rate(self, op):
+        """Opérations par seconde (enchaînées) pour une opération"""
+        values = self.latencies.get(op, [])
+        total = sum(values) / 1000
+        return len(values) / total if total else 0.0
+
+    def mb_per_s(self, kind):
+        nbytes, seconds = self.throughput.get(kind, (0, 0.0))
+        return nbytes / MB / seconds if seconds else 0.0
+
+    def format_lines(self):
+        """
+        Returns:
+            list: Lignes de résumé prêtes à journaliser
+        """
+        lines = [f"📊 Partage {self.share}"]
+        for kind in ("écriture", "lecture"):
+            if kind in self.throughput:
+                nbytes, seconds = self.throughput[kind]
+                note = ""
+                if kind == "lecture":
+                    note = " - avec cache, maximum" if self.read_cached else " - sans cache"
+                lines.append(f"   {kind.capitalize():<10} séquentielle: "
+                             f"{self.mb_per_s(kind):8.1f} Mo/s "
+                             f"({nbytes / MB:.0f} Mo en {seconds:.2f} s{note})")
+        for op, values in self.latencies.items():
+            s = summarize(values)
+            lines.append(f"   {op:<18} {self.rate(op):8.0f} op/s - p50 "
+                         f"{percentile(values, 50):.2f} / p95 {s['p95']:.2f} / "
+                         f"p99 {percentile(values, 99):.2f} / max {s['max']:.2f} ms")
+        for error in self.errors:
+            lines.append(f"   ⚠️ {error}")
+        return lines
+
+
+def _timed(report, op, fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    report.add(op, (time.perf_counter() - t0) * 1000)
+    return result
+
+
+def _write_file(path, size, block):
+    with open(path, "wb") as f:
+        remaining = size
+        while remaining > 0:
+            n = min(remaining, len(block))
+            f.write(memoryview(block)[:n])
+            remaining -= n
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _read_file(path, block_size=BLOCK_SIZE):
+    total = 0
+    with open(path, "rb", buffering=0) as f:
+        while True:
+            chunk = f.read(block_size)
+            if not chunk:
+                return total
+            total += len(chunk)
+
+
+def _read_file_uncached_windows(path, block_size):
+    import ctypes
+    from ctypes import wintypes
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.CreateFileW.restype = wintypes.HANDLE
+    kernel32.CreateFileW.argtypes = (wintypes.LPCWSTR, wintypes.DWORD, wintypes.DWORD,
+                                     wintypes.LPVOID, wintypes.DWORD, wintypes.DWORD,
+                                     wintypes.HANDLE)
+    kernel32.ReadFile.argtypes = (wintypes.HANDLE, wintypes.LPVOID, wintypes.DWORD,
+                                  ctypes.POINTER(wintypes.DWORD), wintypes.LPVOID)
+    kernel32.CloseHandle.argtypes = (wintypes.HANDLE,)
+
+    handle = kernel32.CreateFileW(path, GENERIC_READ, FILE_SHARE_READ, None, OPEN_EXISTING,
+                                  FILE_FLAG_NO_BUFFERING | FILE_FLAG_SEQUENTIAL_SCAN, None)
+    if handle == wintypes.HANDLE(-1).value:
+        raise ctypes.WinError(ctypes.get_last_error())
+    # NO_BUFFERING exige un tampon aligné: une zone mmap anonyme l'est sur une page
+    buf = mmap.mmap(-1, block_size)
+    anchor = ctypes.c_char.from_buffer(buf)
+    read = wintypes.DWORD()
+    total = 0
+    try:
+        while True:
+            if not kernel32.ReadFile(handle, ctypes.addressof(anchor), block_size,
+                                     ctypes.byref(read), None):
+                raise ctypes.WinError(ctypes.get_last_error())
+            if not read.value:
+                return total
+            total += read.value
+    finally:
+        kernel32.CloseHandle(handle)
+        del anchor
+        buf.close()
+
+
+def _read_file_uncached_posix(path, block_size):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        # Les données ont été fsync: leurs pages sont propres et peuvent être évincées
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        buf = bytearray(block_size)
+        total = 0
+        while True:
+            n = os.readv(fd, [buf])
+            if not n:
+                return total
+            total += n
+    finally:
+        os.close(fd)
+
+
+def _read_file_uncached(path, block_size=BLOCK_SIZE):
+    """
+    Lit un fichier sans passer par le cache du client
+
+    Raises:
+        OSError: Si la lecture sans cache n'est pas possible sur ce système / partage
+    """
+    if os.name == "nt":
+        return _read_file_uncached_windows(path, block_size)
+    if not hasattr(os, "posix_fadvise"):
+        raise OSError("posix_fadvise indisponible")
+    return _read_file_uncached_posix(path, block_size)
+
+
+def _read_all(report, paths, reader):
+    """Relit les fichiers; retourne (octets, secondes)"""
+    t0 = time.perf_counter()
+    nbytes = sum(_timed(report, "lecture fichier", reader, path) for path in paths)
+    return nbytes, time.perf_counter() - t0
+
+
+def _write_small(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _read_small(path):
+    with open(path, "rb") as f:
+        return f.read()
+
+
+def run_share_benchmark(share, log_fn, file_size_mb=16, file_count=4,
+                        small_files=200, small_size=4096):
+    """
+    Mesure les performances d'un partage (ou d'un dossier local)
+
+    Les fichiers sont écrits dans un sous-dossier temporaire du partage, supprimé à
+    la fin même en cas d'erreur. Tous les gros fichiers sont écrits avant d'être relus
+    sans cache (FILE_FLAG_NO_BUFFERING sous Windows, éviction du cache ailleurs): le
+    débit en lecture mesure le lien. Si c'est impossible, la lecture passe par le
+    cache et report.read_cached l'indique.
+
+    Args:
+        share (str): Dossier cible (ex: \\\\SV\\veloce)
+        log_fn (callable): Fonction de logging
+        file_size_mb (float): Taille de chaque gros fichier (Mo)
+        file_count (int): Nombre de gros fichiers (débit séquentiel)
+        small_files (int): Nombre de petits fichiers (création / ouverture / stat)
+        small_size (int): Taille de chaque petit fichier (octets)
+
+    Returns:
+        ShareBenchReport | None: Résultats, ou None si le partage est inaccessible
+    """
+    if not os.path.isdir(share):
+        log_fn(f"❌ Partage inaccessible: {share}")
+        return None
+    work = os.path.join(share, f"~banc-{socket.gethostname()}-{os.getpid()}-"
+                               f"{int(time.time())}")
+    report = ShareBenchReport(share)
+    size = int(file_size_mb * MB)
+    block = os.urandom(min(BLOCK_SIZE, max(size, 1)))
+    small = os.urandom(small_size)
+    log_fn(f"🚀 Banc de débit sur {share}: {file_count} × {file_size_mb:g} Mo, "
+           f"{small_files} petits fichiers de {small_size} o")
+    try:
+        os.mkdir(work)
+        big = [os.path.join(work, f"seq-{i}.bin") for i in range(file_count)]
+        t0 = time.perf_counter()
+        for path in big:
+            _timed(report, "écriture fichier", _write_file, path, size, block)
+        report.throughput["écriture"] = (size * file_count, time.perf_counter() - t0)
+        log_fn(f"   ✍️ Écriture: {report.mb_per_s('écriture'):.1f} Mo/s")
+
+        try:
+            report.throughput["lecture"] = _read_all(report, big, _read_file_uncached)
+        except OSError as e:
+            log_fn(f"   ⚠️ Lecture sans cache impossible ({e}), lecture avec cache")
+            report.read_cached = True
+            report.latencies.pop("lecture fichier", None)
+            report.throughput["lecture"] = _read_all(report, big, _read_file)
+        suffix = " (avec cache, maximum)" if report.read_cached else " (sans cache)"
+        log_fn(f"   📖 Lecture: {report.mb_per_s('lecture'):.1f} Mo/s{suffix}")
+
+        paths = [os.path.join(work, f"petit-{i}.dat") for i in range(small_files)]
+        for path in paths:
+            _timed(report, "création", _write_small, path, small)
+        for path in paths:
+            _timed(report, "ouverture+lecture", _read_small, path)
+        for path in paths:
+            _timed(report, "stat", os.stat, path)
+        for path in paths + big:
+            _timed(report, "suppression", os.remove, path)
+        log_fn(f"   📁 Petits fichiers: {report.rate('création'):.0f} créations/s, "
+               f"{report.rate('stat'):.0f} stat/s")
+    except OSError as e:
+        report.errors.append(f"Banc interrompu: {e}")
+        log_fn(f"❌ Banc interrompu: {e}")
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+        if os.path.exists(work):
+            report.errors.append(f"Nettoyage incomplet: {work}")
+            log_fn(f"⚠️ Nettoyage incomplet, dossier à supprimer: {work}")
+    return report
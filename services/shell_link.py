@@ -0,0 +1,235 @@
+"""
+Raccourcis Windows (.lnk) en Python pur
+Écriture et lecture du format Shell Link (MS-SHLLINK): cible locale ou UNC, dossier
+de travail, arguments et icône. Remplace WScript.Shell via PowerShell: la création
+d'un raccourci est une simple écriture de fichier, vérifiable octet par octet.
+"""
+import ntpath
+import struct
+import uuid
+from dataclasses import dataclass
+
+# En-tête: taille fixe et CLSID 00021401-0000-0000-C000-000000000046
+HEADER_SIZE = 0x4C
+LINK_CLSID = uuid.UUID("00021401-0000-0000-C000-000000000046").bytes_le
+
+# LinkFlags
+HAS_LINK_TARGET_ID_LIST = 0x0001
+HAS_LINK_INFO = 0x0002
+HAS_NAME = 0x0004
+HAS_RELATIVE_PATH = 0x0008
+HAS_WORKING_DIR = 0x0010
+HAS_ARGUMENTS = 0x0020
+HAS_ICON_LOCATION = 0x0040
+IS_UNICODE = 0x0080
+
+# LinkInfoFlags
+VOLUME_ID_AND_LOCAL_BASE_PATH = 0x1
+COMMON_NETWORK_RELATIVE_LINK = 0x2
+
+DRIVE_FIXED = 3
+WNNC_NET_LANMAN = 0x00020000
+VALID_NET_TYPE = 0x2
+SW_SHOWNORMAL = 1
+
+# Chaînes ANSI de LinkInfo (variantes Unicode écrites pour les cibles locales)
+ANSI_ENCODING = "cp1252"
+
+
+@dataclass
+class ShellLink:
+    """Contenu d'un raccourci"""
+    target: str
+    working_dir: str = ""
+    arguments: str = ""
+    icon_location: str = ""
+    icon_index: int = 0
+    description: str = ""
+
+
+def _ansi(text):
+    return text.encode(ANSI_ENCODING, errors="replace") + b"\0"
+
+
+def _unicode(text):
+    return text.encode("utf-16-le") + b"\0\0"
+
+
+def _split_target(target):
+    """(partage UNC ou None, chemin local ou suffixe) d'une cible absolue"""
+    target = target.replace("/", "\\")
+    if target.startswith("\\\\"):
+        drive, rest = ntpath.splitdrive(target)
+        if not drive or drive.count("\\") < 3:
+            raise ValueError(f"Chemin UNC invalide: {target}")
+        return drive, rest.lstrip("\\")
+    if len(target) >= 3 and target[1:3] == ":\\":
+        return None, target
+    raise ValueError(f"Chemin absolu requis pour la cible: {target}")
+
+
+def _link_info(target):
+    share, path = _split_target(target)
+    if share is None:
+        # En-tête 0x24: décalages des variantes Unicode du chemin inclus
+        volume = struct.pack("<IIII", 0x11, DRIVE_FIXED, 0, 0x10) + b"\0"
+        header_size = 0x24
+        body = [volume, _ansi(path), _ansi(""), _unicode(path), _unicode("")]
+    else:
+        # Les variantes Unicode du suffixe n'existent qu'avec un chemin local (en-tête
+        # 0x1C); le nom du partage a la sienne dans CommonNetworkRelativeLink
+        net_ansi, net_unicode = _ansi(share), _unicode(share)
+        cnrl = struct.pack("<IIIIIII", 0x1C + len(net_ansi) + len(net_unicode),
+                           VALID_NET_TYPE, 0x1C, 0, WNNC_NET_LANMAN,
+                           0x1C + len(net_ansi), 0) + net_ansi + net_unicode
+        header_size = 0x1C
+        body = [cnrl, _ansi(path)]
+
+    offsets = []
+    pos = header_size
+    for part in body:
+        offsets.append(pos)
+        pos += len(part)
+    if share is None:
+        volume_off, base_off, suffix_off, base_u_off, suffix_u_off = offsets
+        header = struct.pack("<IIIIIIIII", pos, header_size, VOLUME_ID_AND_LOCAL_BASE_PATH,
+                             volume_off, base_off, 0, suffix_off, base_u_off, suffix_u_off)
+    else:
+        cnrl_off, suffix_off = offsets
+        header = struct.pack("<IIIIIII", pos, header_size, COMMON_NETWORK_RELATIVE_LINK,
+                             0, 0, cnrl_off, suffix_off)
+    return header + b"".join(body)
+
+
+def _string_data(text):
+    return struct.pack("<H", len(text.encode("utf-16-le")) // 2) + text.encode("utf-16-le")
+
+
+def build_shell_link(link):
+    """
+    Construit le contenu binaire d'un raccourci
+
+    Args:
+        link (ShellLink): Cible (chemin absolu local ou UNC), dossier de travail,
+            arguments, icône
+
+    Returns:
+        bytes: Fichier .lnk (identique d'un appel à l'autre pour un même ShellLink)
+    """
+    flags = HAS_LINK_INFO | IS_UNICODE
+    strings = b""
+    for flag, text in ((HAS_NAME, link.description), (HAS_WORKING_DIR, link.working_dir),
+                       (HAS_ARGUMENTS, link.arguments), (HAS_ICON_LOCATION, link.icon_location)):
+        if text:
+            flags |= flag
+            strings += _string_data(text)
+    header = struct.pack("<I16sIIQQQIiIH2xII", HEADER_SIZE, LINK_CLSID, flags, 0,
+                         0, 0, 0, 0, link.icon_index, SW_SHOWNORMAL, 0, 0, 0)
+    return header + _link_info(link.target) + strings + b"\0\0\0\0"
+
+
+def write_shortcut(path, target, working_dir="", arguments="", icon_location="",
+                   icon_index=0, description=""):
+    """
+    Écrit un raccourci .lnk (remplace le fichier existant)
+
+    Args:
+        path (str): Fichier .lnk à créer
+        target (str): Cible, chemin absolu local ou UNC
+        working_dir (str): Dossier de travail
+        arguments (str): Arguments de la ligne de commande
+        icon_location (str): Fichier de l'icône ("" = icône de la cible)
+        icon_index (int): Index de l'icône dans ce fichier
+        description (str): Commentaire du raccourci
+    """
+    data = build_shell_link(ShellLink(target, working_dir, arguments, icon_location,
+                                      icon_index, description))
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def _cstring(data, offset, unicode=False):
+    if unicode:
+        end = offset
+        while data[end:end + 2] != b"\0\0":
+            end += 2
+        return data[offset:end].decode("utf-16-le")
+    end = data.index(b"\0", offset)
+    return data[offset:end].decode(ANSI_ENCODING, errors="replace")
+
+
+def _parse_link_info(info):
+    (_, header_size, flags, volume_off, base_off, cnrl_off,
+     suffix_off) = struct.unpack_from("<IIIIIII", info)
+    unicode_offsets = header_size >= 0x24
+    if unicode_offsets:
+        base_u_off, suffix_u_off = struct.unpack_from("<II", info, 0x1C)
+    if unicode_offsets and suffix_u_off:
+        suffix = _cstring(info, suffix_u_off, unicode=True)
+    else:
+        suffix = _cstring(info, suffix_off)
+    if flags & VOLUME_ID_AND_LOCAL_BASE_PATH:
+        if unicode_offsets and base_u_off:
+            base = _cstring(info, base_u_off, unicode=True)
+        else:
+            base = _cstring(info, base_off)
+        return base + suffix
+    if flags & COMMON_NETWORK_RELATIVE_LINK:
+        net_off = struct.unpack_from("<I", info, cnrl_off + 8)[0]
+        if net_off > 0x14:
+            net_u_off = struct.unpack_from("<I", info, cnrl_off + 0x14)[0]
+            share = _cstring(info, cnrl_off + net_u_off, unicode=True)
+        else:
+            share = _cstring(info, cnrl_off + net_off)
+        return ntpath.join(share, suffix) if suffix else share
+    return ""
+
+
+def parse_shell_link(data):
+    """
+    Lit le contenu d'un raccourci
+
+    Args:
+        data (bytes): Fichier .lnk
+
+    Returns:
+        ShellLink: Contenu (cible "" si le raccourci n'a pas de LinkInfo)
+
+    Raises:
+        ValueError: Si les données ne sont pas un raccourci
+    """
+    if len(data) < HEADER_SIZE or data[4:20] != LINK_CLSID:
+        raise ValueError("Fichier .lnk invalide")
+    flags = struct.unpack_from("<I", data, 20)[0]
+    icon_index = struct.unpack_from("<i", data, 56)[0]
+    pos = HEADER_SIZE
+    if flags & HAS_LINK_TARGET_ID_LIST:
+        pos += 2 + struct.unpack_from("<H", data, pos)[0]
+    target = ""
+    if flags & HAS_LINK_INFO:
+        size = struct.unpack_from("<I", data, pos)[0]
+        target = _parse_link_info(data[pos:pos + size])
+        pos += size
+
+    strings = {}
+    width = 2 if flags & IS_UNICODE else 1
+    for flag in (HAS_NAME, HAS_RELATIVE_PATH, HAS_WORKING_DIR, HAS_ARGUMENTS,
+                 HAS_ICON_LOCATION):
+        if flags & flag:
+            count = struct.unpack_from("<H", data, pos)[0]
+            raw = data[pos + 2:pos + 2 + count * width]
+            strings[flag] = (raw.decode("utf-16-le") if width == 2
+                             else raw.decode(ANSI_ENCODING, errors="replace"))
+            pos += 2 + count * width
+    return ShellLink(target=target,
+                     working_dir=strings.get(HAS_WORKING_DIR, ""),
+                     arguments=strings.get(HAS_ARGUMENTS, ""),
+                     icon_location=strings.get(HAS_ICON_LOCATION, ""),
+                     icon_index=icon_index,
+                     description=strings.get(HAS_NAME, ""))
+
+
+def read_shortcut(path):
+    """Lit un fichier .lnk (voir parse_shell_link)"""
+    with open(path, "rb") as f:
+        return parse_shell_link(f.read())
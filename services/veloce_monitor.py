@@ -0,0 +1,156 @@
+"""
+Surveillance continue de la liaison vers le serveur Veloce
+Sonde le serveur à intervalle fixe (connexion TCP 445 puis stat SMB dans le partage
+veloce) et conserve les latences dans des tampons circulaires de taille fixe pour
+l'affichage en direct (min/moy/p95, gigue, pertes).
+"""
+import itertools
+import os
+import socket
+import threading
+import time
+
+from services.lan_discovery import SMB_PORT, VELOCE_SHARE
+from utils.stats_utils import LatencyRing
+
+# Un nom différent à chaque sonde: le redirecteur SMB garde en cache les fichiers
+# introuvables et les attributs récents, un nom fixe ne mesurerait que le cache local
+_probe_ids = itertools.count()
+
+
+def share_path(server):
+    """Chemin UNC du partage veloce d'un serveur"""
+    return f"\\\\{server}\\{VELOCE_SHARE}"
+
+
+def probe_veloce(server, timeout=1.0, share=None):
+    """
+    Mesure une fois la liaison vers le serveur
+
+    Args:
+        server (str): Nom ou IP du serveur
+        timeout (float): Timeout de la connexion TCP (s)
+        share (str): Dossier sondé par stat (défaut: \\\\serveur\\veloce)
+
+    Returns:
+        tuple: (latence TCP 445 en ms, latence stat SMB en ms); None = pas de réponse
+    """
+    t0 = time.perf_counter()
+    try:
+        with socket.create_connection((server, SMB_PORT), timeout=timeout):
+            tcp_ms = (time.perf_counter() - t0) * 1000
+    except OSError:
+        return None, None
+    target = os.path.join(share or share_path(server), f"~sonde-{next(_probe_ids)}.tmp")
+    t0 = time.perf_counter()
+    try:
+        os.stat(target)
+    except FileNotFoundError:
+        pass  # réponse du serveur: c'est la durée de l'aller-retour qui compte
+    except OSError:
+        return tcp_ms, None
+    return tcp_ms, (time.perf_counter() - t0) * 1000
+
+
+class VeloceMonitor:
+    """
+    Sonde le serveur Veloce en arrière-plan à cadence fixe
+
+    Les créneaux manqués (sonde plus longue que l'intervalle) sont sautés au lieu
+    d'être rattrapés en rafale. Les échantillons sont lus par snapshot(). Une
+    exception de la sonde compte comme une perte; le thread continue.
+    """
+
+    def __init__(self, server, interval=1.0, capacity=600, timeout=1.0,
+                 probe=probe_veloce, on_sample=None, log_fn=None):
+        """
+        Args:
+            server (str): Nom ou IP du serveur
+            interval (float): Intervalle entre deux sondes (s)
+            capacity (int): Nombre d'échantillons conservés (600 = 10 min à 1 s)
+            timeout (float): Timeout de la connexion TCP (s)
+            probe (callable): Fonction (serveur, timeout) -> (tcp_ms, smb_ms)
+            on_sample (callable): Appelée (tcp_ms, smb_ms) après chaque sonde
+            log_fn (callable): Fonction de logging (première erreur inattendue)
+        """
+        self.server = server
+        self.interval = interval
+        self.timeout = timeout
+        self.probe = probe
+        self.on_sample = on_sample
+        self.log_fn = log_fn
+        self.tcp = LatencyRing(capacity)
+        self.smb = LatencyRing(capacity)
+        self.started_at = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._error_logged = False
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        if self.running:
+            return
+        self._stop.clear()
+        self.started_at = time.time()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self, wait=False):
+        self._stop.set()
+        if wait and self._thread is not None:
+            self._thread.join(self.interval + self.timeout + 1)
+
+    def _run(self):
+        next_at = time.monotonic()
+        while not self._stop.is_set():
+            try:
+                tcp_ms, smb_ms = self.probe(self.server, self.timeout)
+            except Exception as e:
+                # Ex: ValueError d'un nom de serveur contenant un octet nul
+                tcp_ms = smb_ms = None
+                self._log_error("sonde", e)
+            with self._lock:
+                self.tcp.append(tcp_ms)
+                self.smb.append(smb_ms)
+            if self.on_sample:
+                try:
+                    self.on_sample(tcp_ms, smb_ms)
+                except Exception as e:
+                    self._log_error("on_sample", e)
+            next_at += self.interval
+            now = time.monotonic()
+            if next_at < now:
+                next_at = now
+            self._stop.wait(next_at - now)
+
+    def _log_error(self, where, error):
+        """Journalise la première erreur inattendue seulement, pas une ligne par sonde"""
+        if self._error_logged or not self.log_fn:
+            return
+        self._error_logged = True
+        self.log_fn(f"⚠️ Surveillance de {self.server}: erreur {where} "
+                    f"({type(error).__name__}: {error}), surveillance poursuivie")
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: {"tcp"|"smb": (échantillons du plus ancien au plus récent, stats)}
+        """
+        with self._lock:
+            return {"tcp": (self.tcp.values(), self.tcp.stats()),
+                    "smb": (self.smb.values(), self.smb.stats())}
+
+
+def format_stats(label, stats):
+    """Ligne de résumé "TCP 445: min/moy/p95, gigue, pertes" """
+    if stats["count"] == 0:
+        return f"{label}: en attente..."
+    if stats["loss"] >= 1:
+        return f"{label}: aucune réponse ({stats['count']} sondes)"
+    return (f"{label}: min {stats['min']:.1f} / moy {stats['avg']:.1f} / "
+            f"p95 {stats['p95']:.1f} ms - gigue {stats['jitter']:.1f} ms - "
+            f"pertes {stats['loss'] * 100:.1f} %")
@@ -4,9 +4,85 @@ Gère les tweaks système, le registre, les utilisateurs et les KB Windows
 """
 import subprocess
 import os
-import winreg
+from services.registry_service import (CHANGED, FAILED, HKEY_CURRENT_USER,
+                                       HKEY_LOCAL_MACHINE, REG_SZ, UNCHANGED, RegTweak,
+                                       dword_tweaks, registry_engine, summarize_results)
+from services.shell_link import write_shortcut
 from utils.system_utils import is_admin, relaunch_as_admin
 
+# Jeux de tweaks déclaratifs (appliqués par registry_engine: seules les différences sont écrites)
+NOTIFICATION_TWEAKS = dword_tweaks(HKEY_CURRENT_USER, [
+    # Notifications toast
+    (r"Software\Microsoft\Windows\CurrentVersion\PushNotifications", "ToastEnabled", 0),
+    # "Afficher l'expérience de bienvenue" + "Obtenez des conseils..." + suggestions
+    (r"Software\Microsoft\Windows\CurrentVersion\ContentDeliveryManager",
+     "SubscribedContent-310093Enabled", 0),
+    (r"Software\Microsoft\Windows\CurrentVersion\ContentDeliveryManager",
+     "SubscribedContent-338389Enabled", 0),
+    (r"Software\Microsoft\Windows\CurrentVersion\ContentDeliveryManager", "SoftLandingEnabled", 0),
+    # "Suggest ways I can finish setting up..."
+    (r"Software\Microsoft\Windows\CurrentVersion\UserProfileEngagement",
+     "ScoobeSystemSettingEnabled", 0),
+])
+
+UAC_TWEAKS = dword_tweaks(HKEY_LOCAL_MACHINE, [
+    (r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System", "EnableLUA", 0),
+    (r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System", "ConsentPromptBehaviorAdmin", 0),
+    (r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System", "PromptOnSecureDesktop", 0),
+])
+
+# Postes Veloce: pas de cache des répertoires du partage réseau
+DIRECTORY_CACHE_TWEAKS = dword_tweaks(HKEY_LOCAL_MACHINE, [
+    (r"SYSTEM\CurrentControlSet\Services\LanmanWorkstation\Parameters",
+     "DirectoryCacheLifetime", 0),
+])
+
+# Boutons d'alimentation (valeurs par défaut des PowerSettings): Power -> Arrêter (2),
+# Veille -> Veille (1), fermeture du capot -> Veille (1), sur secteur et sur batterie
+_POWER_SETTINGS = (r"SYSTEM\CurrentControlSet\Control\Power\PowerSettings"
+                   r"\7516b95f-f776-4464-8c53-06167f40cc99")
+POWER_BUTTON_TWEAKS = dword_tweaks(HKEY_LOCAL_MACHINE, [
+    (rf"{_POWER_SETTINGS}\{setting}", name, value)
+    for setting, value in (("7648efa3-dd9c-4e3e-b566-50f929386280", 2),
+                           ("96996bc0-ad50-47ec-923b-6f41874dd9eb", 1),
+                           ("5ca83367-6e45-459f-a27b-476b1d01c936", 1))
+    for name in ("ACSettingIndex", "DCSettingIndex")
+])
+
+# Effets visuels: meilleures performances, sans animations
+BEST_PERFORMANCE_TWEAKS = dword_tweaks(HKEY_CURRENT_USER, [
+    (r"Software\Microsoft\Windows\CurrentVersion\Explorer\VisualEffects", "VisualFXSetting", 2),
+]) + [RegTweak(HKEY_CURRENT_USER, r"Control Panel\Desktop\WindowMetrics", "MinAnimate", REG_SZ, "0")]
+
+
+def password_sharing_tweaks(protected):
+    """Tweaks du partage protégé par mot de passe (activé ou désactivé)"""
+    on, off = (1, 0) if protected else (0, 1)
+    return dword_tweaks(HKEY_LOCAL_MACHINE, [
+        (r"SYSTEM\CurrentControlSet\Control\Lsa", "everyoneincludesanonymous", off),
+        (r"SYSTEM\CurrentControlSet\Services\LanmanServer\Parameters", "RestrictNullSessAccess", on),
+        (r"SYSTEM\CurrentControlSet\Control\Lsa", "ForceGuest", on),
+        (r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System",
+         "LocalAccountTokenFilterPolicy", off),
+    ])
+
+
+def active_hours_tweaks(start, end):
+    """Tweaks des heures actives Windows Update (heures 0-23)"""
+    return dword_tweaks(HKEY_LOCAL_MACHINE, [
+        (r"SOFTWARE\Microsoft\WindowsUpdate\UX\Settings", "ActiveHoursStart", start),
+        (r"SOFTWARE\Microsoft\WindowsUpdate\UX\Settings", "ActiveHoursEnd", end),
+    ])
+
+
+def log_tweak_summary(results, log_fn):
+    """Journalise le bilan d'une application de tweaks; retourne True si aucun échec"""
+    counts = summarize_results(results)
+    log_fn(f"  → {counts[CHANGED]} valeur(s) modifiée(s), "
+           f"{counts[UNCHANGED]} déjà en place"
+           + (f", {counts[FAILED]} échec(s)" if counts[FAILED] else ""))
+    return counts[FAILED] == 0
+
 
 def tweak_taskbar(log_fn):
     """
@@ -79,21 +155,10 @@ def tweak_taskbar(log_fn):
         # Désactiver les actualités et centres d'intérêts (Windows 10)
         tweaks.append((r"Software\Microsoft\Windows\CurrentVersion\Feeds", "ShellFeedsTaskbarViewMode", 2))
     
-    # Appliquer les tweaks de registre
+    # Appliquer les tweaks de registre (une ouverture par clé, seules les différences écrites)
     try:
-        for key_path, value_name, value_data in tweaks:
-            try:
-                # Créer la clé si elle n'existe pas
-                try:
-                    key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
-                except FileNotFoundError:
-                    key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path)
-                
-                winreg.SetValueEx(key, value_name, 0, winreg.REG_DWORD, value_data)
-                winreg.CloseKey(key)
-                log_fn(f"  ✓ {value_name} = {value_data}")
-            except Exception as e:
-                log_fn(f"  ⚠️ Erreur pour {value_name}: {e}")
+        results = registry_engine.apply(dword_tweaks(HKEY_CURRENT_USER, tweaks), log_fn)
+        log_tweak_summary(results, log_fn)
         
         # Nettoyer les icônes épinglés (garder seulement Explorateur & Edge)
         log_fn("  → Nettoyage des icônes épinglés...")
@@ -202,39 +267,9 @@ def disable_windows_notifications(log_fn):
     log_fn("▶ Désactivation des notifications Windows...")
     
     try:
-        # 1. Désactiver les notifications toast
-        key_path = r"Software\Microsoft\Windows\CurrentVersion\PushNotifications"
-        key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
-        winreg.SetValueEx(key, "ToastEnabled", 0, winreg.REG_DWORD, 0)
-        winreg.CloseKey(key)
-        log_fn("  ✓ Notifications toast désactivées")
-        
-        # 2. Désactiver "Afficher l'expérience de bienvenue" + "Obtenez des conseils..."
-        key_path = r"Software\Microsoft\Windows\CurrentVersion\ContentDeliveryManager"
-        try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
-        except:
-            key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path)
-        
-        winreg.SetValueEx(key, "SubscribedContent-310093Enabled", 0, winreg.REG_DWORD, 0)  # Bienvenue
-        winreg.SetValueEx(key, "SubscribedContent-338389Enabled", 0, winreg.REG_DWORD, 0)  # Conseils
-        winreg.SetValueEx(key, "SoftLandingEnabled", 0, winreg.REG_DWORD, 0)  # Suggestions
-        winreg.CloseKey(key)
-        log_fn("  ✓ Expérience de bienvenue désactivée")
-        log_fn("  ✓ Conseils et astuces désactivés")
-        
-        # 3. Désactiver "Suggest ways I can finish setting up..."
-        key_path = r"Software\Microsoft\Windows\CurrentVersion\UserProfileEngagement"
-        try:
-            key = winreg.OpenKey(winreg.HKEY_CURRENT_USER, key_path, 0, winreg.KEY_SET_VALUE)
-        except:
-            key = winreg.CreateKey(winreg.HKEY_CURRENT_USER, key_path)
-        
-        winreg.SetValueEx(key, "ScoobeSystemSettingEnabled", 0, winreg.REG_DWORD, 0)
-        winreg.CloseKey(key)
-        log_fn("  ✓ Suggestions de configuration désactivées")
-        
-        log_fn("✅ Toutes les notifications désactivées")
+        results = registry_engine.apply(NOTIFICATION_TWEAKS, log_fn)
+        if log_tweak_summary(results, log_fn):
+            log_fn("✅ Toutes les notifications désactivées")
     except Exception as e:
         log_fn(f"❌ Erreur: {e}")
 
@@ -399,33 +434,17 @@ def create_veloce_shortcuts(folder, log_fn):
     
     try:
         desktop = os.path.join(os.path.expanduser("~"), "Desktop")
-        
-        ps_script = f'''
-        [System.Threading.Thread]::CurrentThread.ApartmentState = [System.Threading.ApartmentState]::STA
-        $WshShell = New-Object -comObject WScript.Shell
-        $Shortcut = $WshShell.CreateShortcut("{os.path.join(desktop, "VELBO.lnk")}")
-        $Shortcut.TargetPath = "{os.path.join(folder, "velbo.exe")}"
-        $Shortcut.WorkingDirectory = "{folder}"
-        $Shortcut.Save()
-        
-        $Shortcut2 = $WshShell.CreateShortcut("{os.path.join(desktop, "VELSRV.lnk")}")
-        $Shortcut2.TargetPath = "{os.path.join(folder, "velsrv.exe")}"
-        $Shortcut2.WorkingDirectory = "{folder}"
-        $Shortcut2.IconLocation = "{os.path.join(folder, "velsrv.exe")},1"
-        $Shortcut2.Save()
-        '''
-        
-        result = subprocess.run(
-            ["powershell", "-Command", ps_script],
-            capture_output=True, text=True, check=True
-        )
+        folder = os.path.abspath(folder)
+        velsrv = os.path.join(folder, "velsrv.exe")
+        write_shortcut(os.path.join(desktop, "VELBO.lnk"), os.path.join(folder, "velbo.exe"),
+                       working_dir=folder)
+        write_shortcut(os.path.join(desktop, "VELSRV.lnk"), velsrv, working_dir=folder,
+                       icon_location=velsrv, icon_index=1)
         
         log_fn("✅ Raccourcis créés avec succès")
         log_fn("✅ VELBO.lnk sur le Bureau")
         log_fn("✅ VELSRV.lnk sur le Bureau")
         
-    except subprocess.CalledProcessError as e:
-        log_fn(f"❌ Erreur PowerShell: {e.stderr}")
     except Exception as e:
         log_fn(f"❌ Erreur création raccourcis: {e}")
 
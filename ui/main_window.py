@@ -16,12 +16,28 @@ import re
 import psutil
 
 from utils.system_utils import get_base_path, is_admin, relaunch_as_admin
-from services.printer_service import build_message, send_tcp, send_serial, get_serial_ports
+from utils.console_encoding import decode_output, run_console
+from services.printer_service import (build_message, send_tcp, send_serial,
+                                      get_serial_ports, printer_pool,
+                                      parse_printer_targets, run_print_fanout,
+                                      run_printer_discovery,
+                                      PrintSessionMetrics)
+from services.serial_transport import FLOW_CONTROLS, run_auto_baud
+from services.print_spooler import PrintSpooler
+from services.print_soak import run_soak_test, soak_sender
+from services.port_inventory import port_inventory
+from services.lan_discovery import probe_smb, run_lan_discovery, veloce_servers
+from services.veloce_monitor import VeloceMonitor, format_stats, share_path
+from services.share_benchmark import run_share_benchmark
 from services.windows_service import (
     tweak_taskbar, restore_context_menu, uninstall_kb5064081,
     disable_windows_notifications, apply_wallpaper, rename_computer,
-    add_windows_user, create_veloce_shortcuts, restore_context_menu_win11)
-from services.network_service import check_tcp_port, get_wifi_passwords, get_teamviewer_id, get_anydesk_id, show_wifi_passwords
+    add_windows_user, create_veloce_shortcuts, restore_context_menu_win11,
+    UAC_TWEAKS, DIRECTORY_CACHE_TWEAKS, BEST_PERFORMANCE_TWEAKS, POWER_BUTTON_TWEAKS,
+    active_hours_tweaks, password_sharing_tweaks, log_tweak_summary)
+from services.registry_service import CHANGED, registry_engine
+from services.shell_link import write_shortcut
+from services.network_service import check_tcp_port, get_wifi_passwords, get_teamviewer_id, get_anydesk_id, show_wifi_passwords, run_port_scan
 from utils.update_manager import (check_for_updates, download_update,
                                   install_update, get_remote_version,
                                   LOCAL_VERSION)
@@ -67,6 +83,24 @@ class ToolsApp(ctk.CTk):
         # Récupération des IDs en arrière-plan
         threading.Thread(target=self._update_remote_ids, daemon=True).start()
 
+        # Test d'endurance en cours (Event d'arrêt)
+        self._soak_stop = None
+        # Surveillance du serveur Veloce (continue même si on change de page)
+        self._veloce_monitor = None
+        self._monitor_refresh_job = None
+        # Spouleur d'impression: reprend les travaux en attente
+        self.spool_box = None
+        self.spooler = PrintSpooler(log_fn=self.log,
+                                    on_change=lambda job: self.after(
+                                        0, self._refresh_spool_view))
+        self.spooler.start()
+
+        # Inventaire des ports COM: énumération en arrière-plan puis surveillance
+        self.com_option = None
+        port_inventory.subscribe(lambda added, removed: self.after(
+            0, lambda: self._on_com_ports_changed(added, removed)))
+        port_inventory.start_watching()
+
     def _init_variables(self):
         """Initialise les variables de l'application"""
         self.print_text_var = ctk.StringVar(
@@ -78,9 +112,20 @@ class ToolsApp(ctk.CTk):
         self.ip_var = tk.StringVar(value="192.168.192.168")
         self.port_var = tk.StringVar(value="9100")
         self.baud_var = tk.StringVar(value="115200")
+        self.flow_var = tk.StringVar(value="aucun")
+        self.logo_var = tk.BooleanVar(value=False)
+        self.paper_var = tk.StringVar(value="80 mm")
+        self.soak_rate_var = tk.StringVar(value="30")
+        self.soak_minutes_var = tk.StringVar(value="10")
         self.shortcut_folder_var = tk.StringVar(value=r"C:\veloce")
         self.check_host_var = tk.StringVar(value="127.0.0.1")
         self.check_port_var = tk.StringVar(value="40000")
+        self.scan_host_var = tk.StringVar(value="127.0.0.1")
+        self.scan_ports_var = tk.StringVar(value="80,443,445,3389,9100,40000")
+        self.monitor_server_var = tk.StringVar(value="")
+        self.monitor_interval_var = tk.StringVar(value="1")
+        self.share_size_var = tk.StringVar(value="16")
+        self.share_count_var = tk.StringVar(value="4")
         self.wallpaper_var = tk.StringVar(value="wallpaper-kpi.jpg")
         self.pc_name_var = tk.StringVar(
             value=os.environ.get("COMPUTERNAME", ""))
@@ -297,6 +342,7 @@ class ToolsApp(ctk.CTk):
             ("🌐 Réseau", None),
             ("Vérifier port TCP 40000", "check_port"),
             ("Voir mots de passe WiFi", "show_wifi_passwords"),
+            ("Surveiller serveur Veloce", "veloce_monitor"),
             ("🖨️ Imprimantes", None),
             ("Test impression", "print_test"),
         ]
@@ -398,6 +444,8 @@ class ToolsApp(ctk.CTk):
             self._build_checkport_options(self.func_options_holder)
         elif func_key == "show_wifi_passwords":
             self._build_wifi_options(self.func_options_holder)
+        elif func_key == "veloce_monitor":
+            self._build_veloce_monitor_options(self.func_options_holder)
         elif func_key == "tweak_windows":
             self._build_tweak_options(self.func_options_holder)
         elif func_key == "rename_pc":
@@ -474,6 +522,20 @@ class ToolsApp(ctk.CTk):
                                      sticky="w",
                                      padx=6,
                                      pady=4)
+        ctk.CTkButton(self.tcp_frame,
+                      text="🔍 Rechercher",
+                      width=120,
+                      command=self._run_printer_discovery).grid(row=1,
+                                                                column=2,
+                                                                padx=6,
+                                                                pady=4)
+        self.found_printers_menu = ctk.CTkOptionMenu(
+            self.tcp_frame,
+            values=["Aucune trouvée"],
+            width=200,
+            command=self._select_found_printer)
+        self.found_printers_menu.grid(row=2, column=2, sticky="w", padx=6,
+                                      pady=4)
 
         # COM Frame
         self.com_frame = ctk.CTkFrame(self.conn_frame)
@@ -518,6 +580,26 @@ class ToolsApp(ctk.CTk):
                                            variable=self.baud_var,
                                            width=120)
         self.baud_menu.grid(row=2, column=1, sticky="w", padx=6, pady=4)
+        ctk.CTkButton(self.com_frame,
+                      text="🔍 Auto-baud",
+                      width=120,
+                      command=self._run_auto_baud).grid(row=2,
+                                                        column=2,
+                                                        padx=6,
+                                                        pady=4)
+
+        ctk.CTkLabel(self.com_frame, text="Contrôle de flux:").grid(row=0,
+                                                                    column=1,
+                                                                    sticky="e",
+                                                                    padx=6,
+                                                                    pady=6)
+        ctk.CTkOptionMenu(self.com_frame,
+                          values=list(FLOW_CONTROLS),
+                          variable=self.flow_var,
+                          width=120).grid(row=0,
+                                          column=2,
+                                          padx=6,
+                                          pady=6)
 
         # Options
         opts = ctk.CTkFrame(f, fg_color="transparent")
@@ -546,6 +628,22 @@ class ToolsApp(ctk.CTk):
                                     pady=6,
                                     sticky="w")
 
+        ctk.CTkCheckBox(opts,
+                        text="Imprimer le logo",
+                        variable=self.logo_var).grid(row=2,
+                                                     column=0,
+                                                     padx=6,
+                                                     pady=6,
+                                                     sticky="w")
+        ctk.CTkOptionMenu(opts,
+                          values=["58 mm", "80 mm"],
+                          variable=self.paper_var,
+                          width=80).grid(row=2,
+                                         column=1,
+                                         padx=6,
+                                         pady=6,
+                                         sticky="w")
+
         ctk.CTkButton(opts,
                       text="🚀 Envoyer le test",
                       width=160,
@@ -570,6 +668,87 @@ class ToolsApp(ctk.CTk):
                                      padx=6,
                                      pady=4)
 
+        # Cibles multiples (une par ligne: IP[:port] ou COMx[@baud])
+        multi_frame = ctk.CTkFrame(f, fg_color="transparent")
+        multi_frame.pack(fill="x", padx=6, pady=(6, 4))
+        ctk.CTkLabel(multi_frame,
+                     text="Cibles multiples (IP[:port] ou COMx[@baud]):").grid(
+                         row=0, column=0, sticky="nw", padx=6, pady=4)
+        self.multi_targets_box = ctk.CTkTextbox(multi_frame,
+                                                width=260,
+                                                height=90)
+        self.multi_targets_box.grid(row=0, column=1, sticky="w", padx=6,
+                                    pady=4)
+        ctk.CTkButton(multi_frame,
+                      text="🚀 Tester toutes les cibles",
+                      width=200,
+                      command=self._run_print_fanout).grid(row=0,
+                                                           column=2,
+                                                           sticky="n",
+                                                           padx=12,
+                                                           pady=4)
+
+        # Test d'endurance (cadence fixe pendant une durée donnée)
+        soak_frame = ctk.CTkFrame(f, fg_color="transparent")
+        soak_frame.pack(fill="x", padx=6, pady=(6, 4))
+        ctk.CTkLabel(soak_frame, text="Endurance - tickets/min:").grid(
+            row=0, column=0, sticky="w", padx=6, pady=4)
+        ctk.CTkEntry(soak_frame, textvariable=self.soak_rate_var,
+                     width=70).grid(row=0, column=1, sticky="w", padx=6,
+                                    pady=4)
+        ctk.CTkLabel(soak_frame, text="Durée (min):").grid(row=0,
+                                                            column=2,
+                                                            sticky="w",
+                                                            padx=6,
+                                                            pady=4)
+        ctk.CTkEntry(soak_frame, textvariable=self.soak_minutes_var,
+                     width=70).grid(row=0, column=3, sticky="w", padx=6,
+                                    pady=4)
+        ctk.CTkButton(soak_frame,
+                      text="🏁 Démarrer",
+                      width=120,
+                      command=self._run_soak_test).grid(row=0,
+                                                        column=4,
+                                                        padx=6,
+                                                        pady=4)
+        ctk.CTkButton(soak_frame,
+                      text="⏹ Arrêter",
+                      width=100,
+                      command=self._stop_soak_test).grid(row=0,
+                                                         column=5,
+                                                         padx=6,
+                                                         pady=4)
+
+        # Spouleur
+        spool_frame = ctk.CTkFrame(f, fg_color="transparent")
+        spool_frame.pack(fill="x", padx=6, pady=(6, 4))
+        spool_buttons = ctk.CTkFrame(spool_frame, fg_color="transparent")
+        spool_buttons.grid(row=0, column=0, sticky="nw", padx=6, pady=4)
+        ctk.CTkLabel(spool_buttons,
+                     text="File d'impression",
+                     font=ctk.CTkFont(weight="bold")).pack(anchor="w",
+                                                           pady=(0, 4))
+        ctk.CTkButton(spool_buttons,
+                      text="📥 Mettre en file",
+                      width=180,
+                      command=self._spool_print_test).pack(anchor="w", pady=2)
+        ctk.CTkButton(spool_buttons,
+                      text="🔁 Relancer les échecs",
+                      width=180,
+                      command=self._spool_retry_failed).pack(anchor="w",
+                                                             pady=2)
+        ctk.CTkButton(spool_buttons,
+                      text="🧹 Nettoyer",
+                      width=180,
+                      command=self._spool_clear_finished).pack(anchor="w",
+                                                               pady=2)
+        self.spool_box = ctk.CTkTextbox(spool_frame,
+                                        width=520,
+                                        height=120,
+                                        font=("Courier New", 11))
+        self.spool_box.grid(row=0, column=1, sticky="w", padx=6, pady=4)
+        self._refresh_spool_view()
+
         # Toggle TCP/COM
         def toggle():
             if self.mode_var.get() == "tcp":
@@ -605,6 +784,26 @@ class ToolsApp(ctk.CTk):
                       width=200,
                       command=self._run_check_port).pack(pady=6)
 
+        # Scan de ports d'un hôte du réseau local (serveur Veloce, imprimante...)
+        ctk.CTkLabel(f,
+                     text="Scanner les ports d'un hôte du réseau local",
+                     font=ctk.CTkFont(weight="bold")).pack(anchor="w",
+                                                           pady=(16, 6))
+        scan_row = ctk.CTkFrame(f, fg_color="transparent")
+        scan_row.pack(anchor="w", pady=(6, 8))
+        ctk.CTkLabel(scan_row, text="Hôte:").pack(side="left")
+        ctk.CTkEntry(scan_row, textvariable=self.scan_host_var,
+                     width=140).pack(side="left", padx=(4, 12))
+        ctk.CTkLabel(scan_row, text="Ports (ex: 80,9100-9102):").pack(
+            side="left")
+        ctk.CTkEntry(scan_row, textvariable=self.scan_ports_var,
+                     width=220).pack(side="left", padx=(4, 0))
+
+        ctk.CTkButton(f,
+                      text="🔍 Scanner les ports",
+                      width=200,
+                      command=self._run_port_scan).pack(pady=6)
+
     def _build_wifi_options(self, parent):
         """Construit l'interface de récupération des mots de passe WiFi"""
         f = ctk.CTkFrame(parent)
@@ -623,6 +822,185 @@ class ToolsApp(ctk.CTk):
                       width=280,
                       command=self._run_show_wifi_passwords).pack(pady=6)
 
+    def _build_veloce_monitor_options(self, parent):
+        """Construit l'interface de surveillance de la liaison au serveur Veloce"""
+        f = ctk.CTkFrame(parent)
+        f.pack(fill="both", expand=True, padx=6, pady=6)
+        ctk.CTkLabel(f,
+                     text="Surveiller la liaison vers le serveur Veloce",
+                     font=ctk.CTkFont(weight="bold")).pack(anchor="w",
+                                                           pady=(0, 6))
+        ctk.CTkLabel(
+            f,
+            text="Connexion TCP 445 + stat SMB dans \\\\serveur\\veloce, "
+            "en continu (10 dernières minutes à 1 s).",
+            text_color="#a8b3c6").pack(anchor="w", pady=(0, 6))
+
+        row = ctk.CTkFrame(f, fg_color="transparent")
+        row.pack(anchor="w", pady=(6, 8))
+        ctk.CTkLabel(row, text="Serveur:").pack(side="left")
+        ctk.CTkEntry(row, textvariable=self.monitor_server_var,
+                     width=140).pack(side="left", padx=(4, 8))
+        self._attach_veloce_server_picker(row, self.monitor_server_var,
+                                          side="left", padx=(0, 12))
+        ctk.CTkLabel(row, text="Intervalle (s):").pack(side="left")
+        ctk.CTkEntry(row, textvariable=self.monitor_interval_var,
+                     width=50).pack(side="left", padx=(4, 0))
+
+        btns = ctk.CTkFrame(f, fg_color="transparent")
+        btns.pack(anchor="w", pady=6)
+        ctk.CTkButton(btns,
+                      text="▶ Démarrer",
+                      width=140,
+                      command=self._start_veloce_monitor).pack(side="left")
+        ctk.CTkButton(btns,
+                      text="⏹ Arrêter",
+                      width=140,
+                      fg_color="#6b7280",
+                      hover_color="#4b5563",
+                      command=self._stop_veloce_monitor).pack(side="left",
+                                                              padx=(8, 0))
+
+        self._monitor_tcp_label = ctk.CTkLabel(f, text="TCP 445: arrêté",
+                                               text_color="#60a5fa")
+        self._monitor_tcp_label.pack(anchor="w")
+        self._monitor_smb_label = ctk.CTkLabel(f, text="SMB: arrêté",
+                                               text_color="#f59e0b")
+        self._monitor_smb_label.pack(anchor="w")
+        self._monitor_canvas = tk.Canvas(f, height=140, bg="#1e1e1e",
+                                         highlightthickness=0)
+        self._monitor_canvas.pack(fill="x", pady=(6, 0))
+        self._refresh_veloce_monitor()
+
+        # Banc de débit du partage (serveur saisi, sinon c:\veloce local)
+        ctk.CTkLabel(f,
+                     text="Mesurer le débit du partage veloce",
+                     font=ctk.CTkFont(weight="bold")).pack(anchor="w",
+                                                           pady=(16, 6))
+        bench_row = ctk.CTkFrame(f, fg_color="transparent")
+        bench_row.pack(anchor="w", pady=(6, 8))
+        ctk.CTkLabel(bench_row, text="Taille (Mo):").pack(side="left")
+        ctk.CTkEntry(bench_row, textvariable=self.share_size_var,
+                     width=60).pack(side="left", padx=(4, 12))
+        ctk.CTkLabel(bench_row, text="Fichiers:").pack(side="left")
+        ctk.CTkEntry(bench_row, textvariable=self.share_count_var,
+                     width=50).pack(side="left", padx=(4, 0))
+        ctk.CTkButton(f,
+                      text="📊 Mesurer le débit",
+                      width=200,
+                      command=self._run_share_benchmark).pack(pady=6)
+
+    def _start_veloce_monitor(self):
+        """Démarre la surveillance du serveur Veloce saisi"""
+        server = self.monitor_server_var.get().strip()
+        if not server:
+            self.log("⚠️ Indiquez le nom du serveur Veloce")
+            return
+        try:
+            interval = float(self.monitor_interval_var.get().strip().replace(",", "."))
+            if interval < 0.2:
+                raise ValueError
+        except ValueError:
+            self.log("⚠️ Intervalle invalide (minimum 0,2 s)")
+            return
+        if self._veloce_monitor is not None:
+            self._veloce_monitor.stop()
+        self._veloce_monitor = VeloceMonitor(server, interval=interval,
+                                             capacity=max(60, round(600 / interval)),
+                                             log_fn=self.log)
+        self._veloce_monitor.start()
+        self.log(f"📡 Surveillance de {server} démarrée (toutes les {interval:g} s)")
+        self._refresh_veloce_monitor()
+
+    def _stop_veloce_monitor(self):
+        """Arrête la surveillance et journalise le résumé"""
+        monitor = self._veloce_monitor
+        if monitor is None or not monitor.running:
+            self.log("ℹ️ Aucune surveillance en cours")
+            return
+        monitor.stop()
+        snap = monitor.snapshot()
+        self.log(f"⏹ Surveillance de {monitor.server} arrêtée")
+        self.log(f"   {format_stats('TCP 445', snap['tcp'][1])}")
+        self.log(f"   {format_stats('SMB', snap['smb'][1])}")
+
+    def _refresh_veloce_monitor(self):
+        """Met à jour les statistiques et le graphe (toutes les secondes)"""
+        if self._monitor_refresh_job is not None:
+            self.after_cancel(self._monitor_refresh_job)
+            self._monitor_refresh_job = None
+        canvas = getattr(self, "_monitor_canvas", None)
+        if canvas is None or not canvas.winfo_exists():
+            return
+        monitor = self._veloce_monitor
+        if monitor is not None:
+            snap = monitor.snapshot()
+            self._monitor_tcp_label.configure(
+                text=format_stats("TCP 445", snap["tcp"][1]))
+            self._monitor_smb_label.configure(
+                text=format_stats("SMB", snap["smb"][1]))
+            self._draw_latency_graph(canvas, snap, monitor.tcp.capacity)
+        if monitor is not None and monitor.running:
+            self._monitor_refresh_job = self.after(1000,
+                                                   self._refresh_veloce_monitor)
+
+    def _run_share_benchmark(self):
+        """Lance le banc de débit sur \\\\serveur\\veloce (ou c:\\veloce local)"""
+        try:
+            size_mb = float(self.share_size_var.get().strip().replace(",", "."))
+            count = int(self.share_count_var.get().strip())
+            if size_mb <= 0 or count <= 0:
+                raise ValueError
+        except ValueError:
+            self.log("⚠️ Taille ou nombre de fichiers invalide")
+            return
+        server = self.monitor_server_var.get().strip()
+
+        def worker():
+            if server:
+                share = share_path(server)
+            else:
+                exists, shared = self._check_veloce_share_status()
+                if not exists:
+                    self.log("⚠️ Indiquez le serveur Veloce (aucun c:\\veloce local)")
+                    return
+                share = r"c:\veloce"
+                if not shared:
+                    self.log("ℹ️ c:\\veloce n'est pas partagé: mesure du disque local")
+            report = run_share_benchmark(share, self.log, file_size_mb=size_mb,
+                                         file_count=count)
+            if report is not None:
+                for line in report.format_lines():
+                    self.log(line)
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _draw_latency_graph(self, canvas, snap, capacity):
+        """Trace les latences TCP et SMB; les pertes en traits rouges"""
+        canvas.delete("all")
+        width = max(canvas.winfo_width(), 200)
+        height = int(canvas.cget("height"))
+        top = max((v for values, _ in snap.values() for v in values if v == v),
+                  default=1.0)
+        top = max(top * 1.1, 1.0)
+        step = width / max(capacity - 1, 1)
+        canvas.create_text(4, 4, anchor="nw", fill="#a8b3c6",
+                           text=f"{top:.0f} ms", font=("Courier New", 9))
+        for key, color in (("tcp", "#60a5fa"), ("smb", "#f59e0b")):
+            values = snap[key][0]
+            points = []
+            for i, v in enumerate(values):
+                x = i * step
+                if v != v:
+                    canvas.create_line(x, height - 12, x, height, fill="#ef4444")
+                    if len(points) >= 4:
+                        canvas.create_line(*points, fill=color)
+                    points = []
+                    continue
+                points += [x, height - v / top * (height - 4)]
+            if len(points) >= 4:
+                canvas.create_line(*points, fill=color)
+
     def _build_tweak_options(self, parent):
         """Construit l'interface des tweaks Windows"""
         f = ctk.CTkFrame(parent)
@@ -721,6 +1099,57 @@ class ToolsApp(ctk.CTk):
                       hover_color="#15803d",
                       command=self._run_apply_wallpaper).pack(side="left")
 
+        # Annulation des modifications du registre (journal par exécution)
+        ctk.CTkLabel(f,
+                     text="↩️ Annuler les modifications du registre:",
+                     font=ctk.CTkFont(weight="bold")).pack(anchor="w",
+                                                           pady=(20, 6))
+        runs = registry_engine.journal.runs()[:30]
+        self._journal_runs = {
+            f"{time.strftime('%d/%m %H:%M:%S', time.localtime(r['at']))} - {r['label']}":
+            r["id"]
+            for r in runs
+        }
+        choices = list(self._journal_runs) or ["Aucune modification journalisée"]
+        if not hasattr(self, 'rollback_run_var'):
+            self.rollback_run_var = tk.StringVar()
+        self.rollback_run_var.set(choices[0])
+
+        rollback_frame = ctk.CTkFrame(f, fg_color="transparent")
+        rollback_frame.pack(anchor="w", pady=(0, 8))
+        ctk.CTkOptionMenu(rollback_frame,
+                          variable=self.rollback_run_var,
+                          values=choices,
+                          width=300).pack(side="left", padx=(0, 8))
+        ctk.CTkButton(rollback_frame,
+                      text="Annuler",
+                      width=120,
+                      fg_color="#c0392b",
+                      hover_color="#922b21",
+                      command=self._run_registry_rollback).pack(side="left")
+
+    def _run_registry_rollback(self):
+        """Rétablit les valeurs du registre d'origine de l'exécution choisie"""
+        choice = self.rollback_run_var.get()
+        run_id = self._journal_runs.get(choice)
+        if not run_id:
+            self.log("ℹ️ Aucune exécution à annuler")
+            return
+        if not messagebox.askyesno(
+                "Annuler les modifications",
+                f"Rétablir les valeurs du registre d'avant « {choice} » ?"):
+            return
+
+        def worker():
+            self.log(f"▶ Annulation de « {choice} » ({run_id})...")
+            results = registry_engine.rollback(run_id, self.log)
+            if results and log_tweak_summary(results, self.log):
+                self.log("✅ Valeurs d'origine rétablies")
+                self.log("⚠️ Redémarrage recommandé pour appliquer")
+            self.after(0, lambda: self.show_function("tweak_windows"))
+
+        threading.Thread(target=worker, daemon=True).start()
+
     def _build_rename_pc_options(self, parent):
         """Construit l'interface de renommage du PC"""
         f = ctk.CTkFrame(parent)
@@ -804,17 +1233,61 @@ class ToolsApp(ctk.CTk):
 
     def _refresh_com_ports(self):
         """Rafraîchit la liste des ports COM"""
+        def worker():
+            port_inventory.refresh(force=True)
+            self.after(0, self._update_com_menu)
+            infos = port_inventory.ports()
+            self.log(
+                f"🔄 Ports COM disponibles: {', '.join(p.label() for p in infos) if infos else 'Aucun détecté'}"
+            )
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _update_com_menu(self):
+        """Met à jour le menu des ports COM depuis l'inventaire"""
         ports = get_serial_ports()
         vals = ports if ports else ["Aucun détecté"]
         try:
+            if self.com_option is None or not self.com_option.winfo_exists():
+                return
             self.com_option.configure(values=vals)
-            if ports:
-                self.com_option.set(ports[0])
+            if self.com_var.get() not in vals:
+                self.com_option.set(vals[0])
         except Exception:
             pass
-        self.log(
-            f"🔄 Ports COM disponibles: {', '.join(ports) if ports else 'Aucun détecté'}"
-        )
+
+    def _on_com_ports_changed(self, added, removed):
+        """Branchement / débranchement d'un adaptateur série"""
+        for p in added:
+            self.log(f"🔌 Port série branché: {p.label()}")
+        for p in removed:
+            self.log(f"⏏️ Port série retiré: {p.device}")
+        self._update_com_menu()
+
+    def _run_auto_baud(self):
+        """Détecte le baudrate des imprimantes sur tous les ports COM"""
+        ports = get_serial_ports()
+        selected = self.com_var.get().strip()
+
+        def worker():
+            results = run_auto_baud(ports, self.log)
+            rate = results.get(selected) or next(
+                (r for r in results.values() if r), None)
+            if rate:
+                self.after(0, lambda: self.baud_var.set(str(rate)))
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _test_logo(self):
+        """Raster du logo pour le ticket de test (vide si désactivé ou indisponible)"""
+        if not self.logo_var.get():
+            return b""
+        try:
+            from services.printer_raster import PRINTER_WIDTHS, logo_raster
+            return logo_raster(width_dots=PRINTER_WIDTHS[self.paper_var.get()])
+        except Exception as e:
+            self.log(f"⚠️ Logo non imprimé: {e}")
+            return b""
 
     def _run_print_test(self):
         """Exécute le test d'impression"""
@@ -831,6 +1304,7 @@ class ToolsApp(ctk.CTk):
         port = self.port_var.get().strip()
         com_port = self.com_var.get().strip()
         baud = self.baud_var.get().strip()
+        flow = self.flow_var.get()
 
         data = build_message(n_lines_each=lines,
                              text=text_to_print,
@@ -838,19 +1312,24 @@ class ToolsApp(ctk.CTk):
                              ip=ip,
                              port=port,
                              com_port=com_port,
-                             baud=baud)
+                             baud=baud,
+                             logo=self._test_logo())
 
         self.log(f"--- DÉBUT DU TEST ({mode.upper()}) ---")
+        metrics = PrintSessionMetrics()
+
+        try:
+            port_num = int(port or 9100)
+        except:
+            port_num = 9100
 
         def worker():
             for i in range(repeat):
                 self.log(f"Exécution {i+1}/{repeat}...")
                 if mode.lower() == "tcp":
-                    try:
-                        port_num = int(port or 9100)
-                    except:
-                        port_num = 9100
-                    send_tcp(ip, port_num, data, self.log)
+                    sample = send_tcp(ip, port_num, data, self.log,
+                                      pool=printer_pool, metrics=metrics,
+                                      check_status=True)
                 else:
                     if not com_port or com_port == "Aucun détecté":
                         self.log("⚠️ Aucun port COM sélectionné")
@@ -859,12 +1338,214 @@ class ToolsApp(ctk.CTk):
                         baud_num = int(baud or 9600)
                     except:
                         baud_num = 9600
-                    send_serial(com_port, baud_num, data, self.log)
-                time.sleep(0.5)
+                    sample = send_serial(com_port, baud_num, data, self.log,
+                                         metrics=metrics, check_status=True,
+                                         flow_control=flow)
+                if sample.not_ready:
+                    self.log("⛔ Test interrompu: imprimante non prête")
+                    break
+                # Buffer vidé (GS r): enchaîner; sinon délai fixe
+                if not sample.drained:
+                    time.sleep(0.5)
+            # Libérer l'imprimante: beaucoup n'acceptent qu'une connexion à la fois
+            if mode.lower() == "tcp":
+                printer_pool.close(ip, port_num)
+            for line in metrics.format_summary():
+                self.log(line)
             self.log("✅ Test terminé\n")
 
         threading.Thread(target=worker, daemon=True).start()
 
+    def _run_soak_test(self):
+        """Lance le test d'endurance sur la cible courante (TCP ou COM)"""
+        if self._soak_stop is not None:
+            self.log("⚠️ Un test d'endurance est déjà en cours")
+            return
+        try:
+            rate = float(self.soak_rate_var.get().strip().replace(",", "."))
+            minutes = float(self.soak_minutes_var.get().strip().replace(",", "."))
+            lines = int(self.lines_var.get().strip() or 20)
+            if rate <= 0 or minutes <= 0:
+                raise ValueError
+        except Exception:
+            self.log("⚠️ Cadence, durée ou nombre de lignes invalide")
+            return
+
+        mode = self.mode_var.get()
+        ip = self.ip_var.get().strip()
+        com_port = self.com_var.get().strip()
+        try:
+            port_num = int(self.port_var.get().strip() or 9100)
+            baud_num = int(self.baud_var.get().strip() or 9600)
+        except ValueError:
+            port_num, baud_num = 9100, 9600
+        if mode != "tcp" and (not com_port or com_port == "Aucun détecté"):
+            self.log("⚠️ Aucun port COM sélectionné")
+            return
+
+        data = build_message(n_lines_each=lines,
+                             text=self.print_text_var.get().strip() or "Test Test Test",
+                             mode=mode,
+                             ip=ip,
+                             port=port_num,
+                             com_port=com_port,
+                             baud=baud_num,
+                             logo=self._test_logo())
+        send_fn = soak_sender(mode, ip if mode == "tcp" else com_port,
+                              port=port_num, baud=baud_num,
+                              flow_control=self.flow_var.get())
+        stop = self._soak_stop = threading.Event()
+
+        def worker():
+            try:
+                report = run_soak_test(send_fn, data, rate, minutes * 60,
+                                       self.log, stop_event=stop)
+                for line in report.format_lines():
+                    self.log(line)
+            finally:
+                if mode == "tcp":
+                    printer_pool.close(ip, port_num)
+                self._soak_stop = None
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _stop_soak_test(self):
+        """Interrompt le test d'endurance en cours"""
+        if self._soak_stop is None:
+            self.log("ℹ️ Aucun test d'endurance en cours")
+            return
+        self._soak_stop.set()
+        self.log("⏹ Arrêt du test d'endurance demandé...")
+
+    def _run_printer_discovery(self):
+        """Recherche les imprimantes réseau sur les sous-réseaux locaux"""
+        found = []
+
+        def add_found(ip, port, rtt):
+            found.append(f"{ip}:{port}")
+            values = list(found)
+            self.after(0, lambda: self.found_printers_menu.configure(
+                values=values))
+
+        def worker():
+            run_printer_discovery(self.log, on_found=add_found)
+            if found:
+                self.after(0, lambda: self._select_found_printer(found[0]))
+            else:
+                self.after(0, lambda: (
+                    self.found_printers_menu.configure(
+                        values=["Aucune trouvée"]),
+                    self.found_printers_menu.set("Aucune trouvée")))
+
+        self.found_printers_menu.configure(values=["Recherche..."])
+        self.found_printers_menu.set("Recherche...")
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _select_found_printer(self, choice):
+        """Remplit IP/port à partir d'une imprimante trouvée"""
+        ip, sep, port = choice.partition(":")
+        if not sep:
+            return
+        self.ip_var.set(ip)
+        self.port_var.set(port)
+        try:
+            self.found_printers_menu.set(choice)
+        except Exception:
+            pass
+
+    def _refresh_spool_view(self):
+        """Met à jour l'affichage de la file d'impression"""
+        try:
+            if self.spool_box is None or not self.spool_box.winfo_exists():
+                return
+            self.spool_box.configure(state="normal")
+            self.spool_box.delete("1.0", "end")
+            self.spool_box.insert("end", "\n".join(self.spooler.format_jobs()))
+            self.spool_box.configure(state="disabled")
+        except Exception:
+            pass
+
+    def _spool_print_test(self):
+        """Met le test d'impression en file pour la cible courante et les cibles multiples"""
+        try:
+            repeat = int(self.repeat_var.get().strip() or 1)
+            lines = int(self.lines_var.get().strip() or 20)
+            targets = parse_printer_targets(
+                self.multi_targets_box.get("1.0", "end"), self.flow_var.get())
+        except Exception:
+            self.log("⚠️ Valeurs de répétitions/lignes/cibles invalides")
+            return
+
+        if not targets:
+            if self.mode_var.get() == "tcp":
+                targets = parse_printer_targets(
+                    f"{self.ip_var.get().strip()}:{self.port_var.get().strip() or 9100}",
+                    self.flow_var.get())
+            else:
+                com_port = self.com_var.get().strip()
+                if not com_port or com_port == "Aucun détecté":
+                    self.log("⚠️ Aucun port COM sélectionné")
+                    return
+                targets = parse_printer_targets(
+                    f"{com_port}@{self.baud_var.get().strip() or 9600}",
+                    self.flow_var.get())
+
+        text_to_print = self.print_text_var.get().strip() or "Test Test Test"
+        logo = self._test_logo()
+        for target in targets:
+            data = build_message(n_lines_each=lines,
+                                 text=text_to_print,
+                                 mode=target.mode,
+                                 ip=target.address,
+                                 port=target.port,
+                                 com_port=target.address,
+                                 baud=target.baud,
+                                 logo=logo)
+            for _ in range(repeat):
+                self.spooler.submit(target, data)
+        self.log(f"📥 {repeat * len(targets)} travail(aux) mis en file "
+                 f"pour {len(targets)} imprimante(s)")
+
+    def _spool_retry_failed(self):
+        """Remet en file les travaux en échec"""
+        self.log(f"🔁 {self.spooler.retry_failed()} travail(aux) relancé(s)")
+
+    def _spool_clear_finished(self):
+        """Retire les travaux terminés ou en échec de la file"""
+        self.log(f"🧹 {self.spooler.clear_finished()} travail(aux) retiré(s)")
+        self._refresh_spool_view()
+
+    def _run_print_fanout(self):
+        """Envoie le test d'impression à plusieurs imprimantes en parallèle"""
+        try:
+            targets = parse_printer_targets(
+                self.multi_targets_box.get("1.0", "end"), self.flow_var.get())
+            lines = int(self.lines_var.get().strip() or 20)
+        except Exception:
+            self.log("⚠️ Liste de cibles ou nombre de lignes invalide")
+            return
+        if not targets:
+            self.log("⚠️ Aucune cible saisie")
+            return
+
+        text_to_print = self.print_text_var.get().strip() or "Test Test Test"
+        logo = self._test_logo()
+
+        def data_for(target):
+            return build_message(n_lines_each=lines,
+                                 text=text_to_print,
+                                 mode=target.mode,
+                                 ip=target.address,
+                                 port=target.port,
+                                 com_port=target.address,
+                                 baud=target.baud,
+                                 logo=logo)
+
+        threading.Thread(
+            target=lambda: run_print_fanout(targets, data_for, self.log,
+                                            check_status=True),
+            daemon=True).start()
+
     def _run_check_port(self):
         """Vérifie si un port est ouvert"""
         host = self.check_host_var.get().strip() or "127.0.0.1"
@@ -876,6 +1557,16 @@ class ToolsApp(ctk.CTk):
         threading.Thread(target=lambda: check_tcp_port(host, port, self.log),
                          daemon=True).start()
 
+    def _run_port_scan(self):
+        """Scanne les ports d'un hôte du réseau local"""
+        host = self.scan_host_var.get().strip()
+        spec = self.scan_ports_var.get().strip()
+        if not host:
+            self.log("⚠️ Aucun hôte saisi")
+            return
+        threading.Thread(target=lambda: run_port_scan(host, spec, self.log),
+                         daemon=True).start()
+
     def _run_show_wifi_passwords(self):
         """Récupère les mots de passe WiFi"""
         threading.Thread(target=lambda: get_wifi_passwords(self.log),
@@ -945,10 +1636,7 @@ class ToolsApp(ctk.CTk):
             kb_only = kb_num.replace("KB", "").replace("kb", "")
             cmd = f'wusa /uninstall /kb:{kb_only} /norestart'
             try:
-                result = subprocess.run(
-                    cmd, shell=True, capture_output=True, text=True,
-                    timeout=300, cwd=temp_dir
-                )
+                result = run_console(cmd, shell=True, timeout=300, cwd=temp_dir)
                 if result.stdout:
                     for ln in result.stdout.splitlines():
                         if ln.strip():
@@ -976,13 +1664,8 @@ class ToolsApp(ctk.CTk):
             self.log(f"▶ Exécution PowerShell: {cmd}")
             try:
                 import subprocess
-                proc = subprocess.run([
-                    "powershell", "-NoProfile", "-ExecutionPolicy", "Bypass",
-                    "-Command", cmd
-                ],
-                                      capture_output=True,
-                                      text=True,
-                                      timeout=300)
+                proc = run_console(["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass",
+                                    "-Command", cmd], timeout=300)
                 if proc.stdout:
                     self.log("----- PowerShell stdout -----")
                     for line in proc.stdout.splitlines():
@@ -1022,11 +1705,7 @@ class ToolsApp(ctk.CTk):
             # Nom du CPU (Intel i7-9600K, AMD Ryzen 5600X, etc.)
             cpu_name = "Non disponible"
             try:
-                cpu_info_proc = subprocess.run('wmic cpu get name',
-                                               shell=True,
-                                               capture_output=True,
-                                               text=True,
-                                               timeout=5)
+                cpu_info_proc = run_console('wmic cpu get name', shell=True, timeout=5)
                 if cpu_info_proc.returncode == 0 and cpu_info_proc.stdout:
                     lines = cpu_info_proc.stdout.strip().split('\n')
                     if len(lines) > 1:
@@ -1045,12 +1724,8 @@ class ToolsApp(ctk.CTk):
             ram_speed = "Non disponible"
             try:
                 # Type de RAM (DDR3, DDR4, DDR5)
-                ram_type_proc = subprocess.run(
-                    'wmic memorychip get memorytype',
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                    timeout=5)
+                ram_type_proc = run_console('wmic memorychip get memorytype', shell=True,
+                                            timeout=5)
                 if ram_type_proc.returncode == 0 and ram_type_proc.stdout:
                     lines = [
                         l.strip()
@@ -1070,11 +1745,7 @@ class ToolsApp(ctk.CTk):
                         ram_type = type_map.get(type_code, f'Type {type_code}')
 
                 # Fréquence de la RAM (MHz)
-                ram_speed_proc = subprocess.run('wmic memorychip get speed',
-                                                shell=True,
-                                                capture_output=True,
-                                                text=True,
-                                                timeout=5)
+                ram_speed_proc = run_console('wmic memorychip get speed', shell=True, timeout=5)
                 if ram_speed_proc.returncode == 0 and ram_speed_proc.stdout:
                     lines = [
                         l.strip()
@@ -1352,9 +2023,7 @@ class ToolsApp(ctk.CTk):
         def worker():
             try:
                 self.log("===== UTILISATEURS WINDOWS =====")
-                result = subprocess.check_output("net user",
-                                                 shell=True,
-                                                 text=True)
+                result = run_console("net user", shell=True, check=True).stdout
                 for line in result.splitlines():
                     if line.strip():
                         self.log(line)
@@ -1700,12 +2369,8 @@ class ToolsApp(ctk.CTk):
         if exists:
             try:
                 # Vérifier si le dossier est partagé via WMI
-                result = subprocess.run(
-                    'wmic share where "path=\'c:\\\\veloce\'" get name',
-                    capture_output=True,
-                    text=True,
-                    shell=True,
-                    timeout=5)
+                result = run_console('wmic share where "path=\'c:\\\\veloce\'" get name',
+                                     shell=True, timeout=5)
                 shared = "veloce" in result.stdout.lower()
             except:
                 pass
@@ -1733,48 +2398,15 @@ class ToolsApp(ctk.CTk):
     def _disable_password_protected_sharing(self, log_fn):
         """Désactive le partage protégé par mot de passe"""
         try:
-            import winreg
-
             log_fn("▶ Désactivation du partage protégé par mot de passe...")
 
-            # Étape 1: Modifier everyoneincludesanonymous
-            key1 = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                  r"SYSTEM\CurrentControlSet\Control\Lsa", 0,
-                                  winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key1, "everyoneincludesanonymous", 0,
-                              winreg.REG_DWORD, 1)
-            winreg.CloseKey(key1)
-            log_fn("✓ Clé 'everyoneincludesanonymous' définie à 1")
-
-            # Étape 2: Modifier RestrictNullSessAccess
-            key2 = winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                r"SYSTEM\CurrentControlSet\Services\LanmanServer\Parameters",
-                0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key2, "RestrictNullSessAccess", 0,
-                              winreg.REG_DWORD, 0)
-            winreg.CloseKey(key2)
-            log_fn("✓ Clé 'RestrictNullSessAccess' définie à 0")
-
-            ########
-
-            key3 = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                  r"SYSTEM\CurrentControlSet\Control\Lsa", 0,
-                                  winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key3, "ForceGuest", 0, winreg.REG_DWORD, 0)
-            winreg.CloseKey(key3)
-            log_fn("✓ Clé 'ForceGuest' définie à 0 (désactivé)")
-            ####
-
-            key4 = winreg.CreateKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System")
-            winreg.SetValueEx(key4, "LocalAccountTokenFilterPolicy", 0,
-                              winreg.REG_DWORD, 1)
-            winreg.CloseKey(key4)
-            log_fn(
-                "✓ Clé 'LocalAccountTokenFilterPolicy' définie à 1 (désactivé)"
-            )
+            # everyoneincludesanonymous=1, RestrictNullSessAccess=0, ForceGuest=0,
+            # LocalAccountTokenFilterPolicy=1
+            results = registry_engine.apply(password_sharing_tweaks(False),
+                                            log_fn)
+            if not log_tweak_summary(results, log_fn):
+                log_fn("⚠️ Nécessite droits administrateur")
+                return
 
             log_fn("✅ Partage protégé par mot de passe désactivé")
             log_fn(
@@ -1788,48 +2420,15 @@ class ToolsApp(ctk.CTk):
     def _enable_password_protected_sharing(self, log_fn):
         """Active le partage protégé par mot de passe"""
         try:
-            import winreg
-
             log_fn("▶ Activation du partage protégé par mot de passe...")
 
-            # Étape 1: Modifier everyoneincludesanonymous
-            key1 = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                  r"SYSTEM\CurrentControlSet\Control\Lsa", 0,
-                                  winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key1, "everyoneincludesanonymous", 0,
-                              winreg.REG_DWORD, 0)
-            winreg.CloseKey(key1)
-            log_fn("✓ Clé 'everyoneincludesanonymous' définie à 0")
-
-            # Étape 2: Modifier RestrictNullSessAccess
-            key2 = winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                r"SYSTEM\CurrentControlSet\Services\LanmanServer\Parameters",
-                0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key2, "RestrictNullSessAccess", 0,
-                              winreg.REG_DWORD, 1)
-            winreg.CloseKey(key2)
-            log_fn("✓ Clé 'RestrictNullSessAccess' définie à 1")
-
-            #####
-
-            key3 = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE,
-                                  r"SYSTEM\CurrentControlSet\Control\Lsa", 0,
-                                  winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key3, "ForceGuest", 0, winreg.REG_DWORD, 1)
-            winreg.CloseKey(key3)
-            log_fn("✓ Clé 'ForceGuest' définie à 1 (activé)")
-
-            ####
-
-            key4 = winreg.CreateKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System")
-            winreg.SetValueEx(key4, "LocalAccountTokenFilterPolicy", 0,
-                              winreg.REG_DWORD, 0)
-            winreg.CloseKey(key4)
-            log_fn(
-                "✓ Clé 'LocalAccountTokenFilterPolicy' définie à 0 (activé)")
+            # everyoneincludesanonymous=0, RestrictNullSessAccess=1, ForceGuest=1,
+            # LocalAccountTokenFilterPolicy=0
+            results = registry_engine.apply(password_sharing_tweaks(True),
+                                            log_fn)
+            if not log_tweak_summary(results, log_fn):
+                log_fn("⚠️ Nécessite droits administrateur")
+                return
 
             log_fn("✅ Partage protégé par mot de passe activé")
             log_fn(
@@ -1845,28 +2444,16 @@ class ToolsApp(ctk.CTk):
     def _disable_uac(self, log_fn):
         """Option 1: Désactiver le contrôle de compte utilisateur (UAC)"""
         try:
-            import winreg
-
             log_fn(
                 "▶ Désactivation du contrôle de compte utilisateur (UAC)...")
 
-            # Modifier la clé de registre pour UAC
-            key = winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                r"SOFTWARE\Microsoft\Windows\CurrentVersion\Policies\System",
-                0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, "EnableLUA", 0, winreg.REG_DWORD, 0)
-            winreg.SetValueEx(key, "ConsentPromptBehaviorAdmin", 0,
-                              winreg.REG_DWORD, 0)
-            winreg.SetValueEx(key, "PromptOnSecureDesktop", 0,
-                              winreg.REG_DWORD, 0)
-            winreg.CloseKey(key)
-
-            log_fn(
-                "✓ Clés UAC modifiées (EnableLUA=0, ConsentPromptBehaviorAdmin=0)"
-            )
+            results = registry_engine.apply(UAC_TWEAKS, log_fn)
+            if not log_tweak_summary(results, log_fn):
+                log_fn("⚠️ Nécessite droits administrateur")
+                return
             log_fn("✅ UAC désactivé")
-            log_fn("⚠️ Redémarrage requis pour appliquer les changements")
+            if any(r.status == CHANGED for r in results):
+                log_fn("⚠️ Redémarrage requis pour appliquer les changements")
 
         except Exception as e:
             log_fn(f"❌ Erreur désactivation UAC: {e}")
@@ -1889,11 +2476,7 @@ class ToolsApp(ctk.CTk):
             # Ajouter une règle de pare-feu pour Veloce Backoffice
             cmd = f'netsh advfirewall firewall add rule name="Veloce Backoffice" dir=in action=allow program="{veloce_path}" enable=yes profile=any'
 
-            result = subprocess.run(cmd,
-                                    capture_output=True,
-                                    text=True,
-                                    shell=True,
-                                    timeout=30)
+            result = run_console(cmd, shell=True, timeout=30)
 
             if result.returncode == 0:
                 log_fn("✓ Règle de pare-feu ajoutée pour Veloce Backoffice")
@@ -1905,11 +2488,7 @@ class ToolsApp(ctk.CTk):
                 log_fn(
                     "  Règle existante détectée, tentative de mise à jour...")
                 cmd_update = f'netsh advfirewall firewall set rule name="Veloce Backoffice" new enable=yes profile=any'
-                result_update = subprocess.run(cmd_update,
-                                               capture_output=True,
-                                               text=True,
-                                               shell=True,
-                                               timeout=30)
+                result_update = run_console(cmd_update, shell=True, timeout=30)
 
                 if result_update.returncode == 0:
                     log_fn(
@@ -1945,10 +2524,7 @@ Get-NetAdapter | ForEach-Object {
 }
 '''
 
-            result = subprocess.run(['powershell', '-Command', ps_cmd],
-                                    capture_output=True,
-                                    text=True,
-                                    timeout=60)
+            result = run_console(['powershell', '-Command', ps_cmd], timeout=60)
 
             if result.returncode == 0:
                 output_lines = result.stdout.strip().split('\n')
@@ -1980,11 +2556,7 @@ Get-NetAdapter | ForEach-Object {
 
             # Définir le fuseau horaire sur America/Toronto (Eastern Time)
             cmd_tz = 'tzutil /s "Eastern Standard Time"'
-            result = subprocess.run(cmd_tz,
-                                    capture_output=True,
-                                    text=True,
-                                    shell=True,
-                                    timeout=10)
+            result = run_console(cmd_tz, shell=True, timeout=10)
 
             if result.returncode == 0:
                 log_fn("✓ Fuseau horaire défini sur America/Toronto (Eastern)")
@@ -2030,11 +2602,7 @@ Get-NetAdapter | ForEach-Object {
             log_fn("✓ Serveurs de temps NTP configurés")
 
             # Forcer la resynchronisation immédiate
-            result_sync = subprocess.run('w32tm /resync /force',
-                                         capture_output=True,
-                                         text=True,
-                                         shell=True,
-                                         timeout=30)
+            result_sync = run_console('w32tm /resync /force', shell=True, timeout=30)
 
             if "successfully" in result_sync.stdout.lower(
             ) or result_sync.returncode == 0:
@@ -2062,10 +2630,7 @@ Get-NetAdapter | ForEach-Object {
             # PowerShell pour définir toutes les cartes réseau en mode Privé
             ps_cmd = 'Get-NetConnectionProfile | Set-NetConnectionProfile -NetworkCategory Private'
 
-            result = subprocess.run(['powershell', '-Command', ps_cmd],
-                                    capture_output=True,
-                                    text=True,
-                                    timeout=30)
+            result = run_console(['powershell', '-Command', ps_cmd], timeout=30)
 
             if result.returncode == 0:
                 log_fn("✓ Carte(s) réseau configurée(s) en mode Privé")
@@ -2087,29 +2652,13 @@ Get-NetAdapter | ForEach-Object {
     def _set_best_performance(self, log_fn):
         """Option 5: Configurer les meilleures performances système"""
         try:
-            import winreg
-
             log_fn("▶ Configuration des meilleures performances système...")
 
-            # Modifier la clé de registre pour les performances visuelles
-            key = winreg.OpenKey(
-                winreg.HKEY_CURRENT_USER,
-                r"Software\Microsoft\Windows\CurrentVersion\Explorer\VisualEffects",
-                0, winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, "VisualFXSetting", 0, winreg.REG_DWORD,
-                              2)  # 2 = Best Performance
-            winreg.CloseKey(key)
-
-            log_fn("✓ Paramètres de performances visuelles modifiés")
-
-            # Désactiver les animations
-            key2 = winreg.OpenKey(winreg.HKEY_CURRENT_USER,
-                                  r"Control Panel\Desktop\WindowMetrics", 0,
-                                  winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key2, "MinAnimate", 0, winreg.REG_SZ, "0")
-            winreg.CloseKey(key2)
+            # VisualFXSetting=2 (meilleures performances), MinAnimate="0"
+            results = registry_engine.apply(BEST_PERFORMANCE_TWEAKS, log_fn)
+            if not log_tweak_summary(results, log_fn):
+                return
 
-            log_fn("✓ Animations désactivées")
             log_fn("✅ Meilleures performances configurées")
             log_fn("⚠️ Redémarrage ou déconnexion/reconnexion recommandé")
 
@@ -2164,37 +2713,11 @@ Get-NetAdapter | ForEach-Object {
 
             log_fn("✅ Mode alimentation performance configuré")
 
-            # CONFIG boutons d'alimentation
-
-            # Bouton Power -> Arrêter (2)
-            subprocess.run(
-                'reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\7516b95f-f776-4464-8c53-06167f40cc99\\7648efa3-dd9c-4e3e-b566-50f929386280" /v ACSettingIndex /t REG_DWORD /d 2 /f',
-                shell=True,
-                check=True)
-            subprocess.run(
-                'reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\7516b95f-f776-4464-8c53-06167f40cc99\\7648efa3-dd9c-4e3e-b566-50f929386280" /v DCSettingIndex /t REG_DWORD /d 2 /f',
-                shell=True,
-                check=True)
-
-            # Bouton Veille -> Veille (1)
-            subprocess.run(
-                'reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\7516b95f-f776-4464-8c53-06167f40cc99\\96996bc0-ad50-47ec-923b-6f41874dd9eb" /v ACSettingIndex /t REG_DWORD /d 1 /f',
-                shell=True,
-                check=True)
-            subprocess.run(
-                'reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\7516b95f-f776-4464-8c53-06167f40cc99\\96996bc0-ad50-47ec-923b-6f41874dd9eb" /v DCSettingIndex /t REG_DWORD /d 1 /f',
-                shell=True,
-                check=True)
-
-            # Fermeture capot -> Veille (1)
-            subprocess.run(
-                'reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\7516b95f-f776-4464-8c53-06167f40cc99\\5ca83367-6e45-459f-a27b-476b1d01c936" /v ACSettingIndex /t REG_DWORD /d 1 /f',
-                shell=True,
-                check=True)
-            subprocess.run(
-                'reg add "HKLM\\SYSTEM\\CurrentControlSet\\Control\\Power\\PowerSettings\\7516b95f-f776-4464-8c53-06167f40cc99\\5ca83367-6e45-459f-a27b-476b1d01c936" /v DCSettingIndex /t REG_DWORD /d 1 /f',
-                shell=True,
-                check=True)
+            # CONFIG boutons d'alimentation (écrits seulement si différents, journalisés)
+            results = registry_engine.apply(POWER_BUTTON_TWEAKS, log_fn)
+            if not log_tweak_summary(results, log_fn):
+                log_fn("⚠️ Nécessite droits administrateur")
+                return
 
             # Recharger le plan courant
             subprocess.run('powercfg /SETACTIVE SCHEME_CURRENT',
@@ -2284,8 +2807,7 @@ Get-NetAdapter | ForEach-Object {
 
         local_cwd = os.environ.get('TEMP', os.environ.get('TMP', 'C:\\Windows\\Temp'))
         process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE,
-                                   stderr=subprocess.STDOUT, text=True, bufsize=1,
-                                   cwd=local_cwd)
+                                   stderr=subprocess.STDOUT, cwd=local_cwd)
 
         output_lines = []
         start_time = time.time()
@@ -2296,7 +2818,8 @@ Get-NetAdapter | ForEach-Object {
 
         def reader_thread():
             try:
-                for line in iter(process.stdout.readline, ''):
+                for raw in iter(process.stdout.readline, b''):
+                    line = decode_output(raw)
                     if line:
                         output_queue.put(line)
                     if process.poll() is not None:
@@ -2391,8 +2914,7 @@ Get-NetAdapter | ForEach-Object {
         choco = self._get_choco_path()
         if choco:
             try:
-                result = subprocess.run([choco, '--version'], capture_output=True,
-                                        text=True, timeout=10, cwd=local_cwd)
+                result = run_console([choco, '--version'], timeout=10, cwd=local_cwd)
                 if result.returncode == 0:
                     log_fn(f"     ✓ Chocolatey disponible ({result.stdout.strip()})")
                     return choco
@@ -2408,8 +2930,7 @@ Get-NetAdapter | ForEach-Object {
                 'iex ((New-Object System.Net.WebClient).DownloadString('
                 "\'https://community.chocolatey.org/install.ps1\'))\""
             )
-            result = subprocess.run(install_cmd, shell=True, capture_output=True,
-                                    text=True, timeout=180, cwd=local_cwd)
+            result = run_console(install_cmd, shell=True, timeout=180, cwd=local_cwd)
             # Après installation, chercher choco par chemin direct
             choco = self._get_choco_path()
             if choco and os.path.exists(choco):
@@ -2533,9 +3054,7 @@ exit 0
 
             # Vérifier winget une seule fois au départ
             try:
-                wg = subprocess.run('winget --version', shell=True,
-                                    capture_output=True, text=True, timeout=8,
-                                    cwd=local_cwd)
+                wg = run_console('winget --version', shell=True, timeout=8, cwd=local_cwd)
                 winget_ok = wg.returncode == 0
                 if winget_ok:
                     log_fn(f"  ✓ winget disponible ({wg.stdout.strip()})")
@@ -2811,8 +3330,6 @@ exit 0
     def _set_active_hours(self, log_fn, start_hour, end_hour):
         """Option 8: Configurer les heures actives du système"""
         try:
-            import winreg
-
             log_fn(
                 f"▶ Configuration des heures actives ({start_hour}h - {end_hour}h)..."
             )
@@ -2830,15 +3347,12 @@ exit 0
                 log_fn("❌ Format d'heure invalide")
                 return
 
-            # Modifier la clé de registre pour les heures actives
-            key = winreg.OpenKey(
-                winreg.HKEY_LOCAL_MACHINE,
-                r"SOFTWARE\Microsoft\WindowsUpdate\UX\Settings", 0,
-                winreg.KEY_SET_VALUE)
-            winreg.SetValueEx(key, "ActiveHoursStart", 0, winreg.REG_DWORD,
-                              start)
-            winreg.SetValueEx(key, "ActiveHoursEnd", 0, winreg.REG_DWORD, end)
-            winreg.CloseKey(key)
+            # Clé de registre des heures actives (écrite seulement si différente)
+            results = registry_engine.apply(active_hours_tweaks(start, end),
+                                            log_fn)
+            if not log_tweak_summary(results, log_fn):
+                log_fn("⚠️ Nécessite droits administrateur")
+                return
 
             if start >= end:
                 log_fn(
@@ -3580,7 +4094,8 @@ exit 0
             log_box.delete("1.0", "end")
             progress_bar.set(0)
             skip_current_step['active'] = False
-            threading.Thread(target=worker, daemon=True).start()
+            threading.Thread(target=registry_engine.wrap_run("Config PC", worker),
+                             daemon=True).start()
 
         def skip_step():
             skip_current_step['active'] = True
@@ -3619,35 +4134,13 @@ exit 0
                                    "Roaming", "Microsoft", "Windows",
                                    "Start Menu", "Programs", "Startup")
 
-            ps_script = f'''
-[System.Threading.Thread]::CurrentThread.ApartmentState = [System.Threading.ApartmentState]::STA
-$WshShell = New-Object -comObject WScript.Shell
-
-# VELBO sur le bureau
-$Shortcut1 = $WshShell.CreateShortcut("{os.path.join(desktop, 'VELBO.lnk')}")
-$Shortcut1.TargetPath = "{os.path.join(veloce_path, 'velbo.exe')}"
-$Shortcut1.WorkingDirectory = "{veloce_path}"
-$Shortcut1.Save()
-
-# VELSRV sur le bureau (avec 2e icône)
-$Shortcut2 = $WshShell.CreateShortcut("{os.path.join(desktop, 'VELSRV.lnk')}")
-$Shortcut2.TargetPath = "{os.path.join(veloce_path, 'velsrv.exe')}"
-$Shortcut2.WorkingDirectory = "{veloce_path}"
-$Shortcut2.IconLocation = "{os.path.join(veloce_path, 'velsrv.exe')},1"
-$Shortcut2.Save()
-
-# VELSRV au démarrage
-$Shortcut3 = $WshShell.CreateShortcut("{os.path.join(startup, 'VELSRV.lnk')}")
-$Shortcut3.TargetPath = "{os.path.join(veloce_path, 'velsrv.exe')}"
-$Shortcut3.WorkingDirectory = "{veloce_path}"
-$Shortcut3.IconLocation = "{os.path.join(veloce_path, 'velsrv.exe')},1"
-$Shortcut3.Save()
-'''
-
-            subprocess.run(["powershell", "-Command", ps_script],
-                           capture_output=True,
-                           text=True,
-                           check=True)
+            velsrv = os.path.join(veloce_path, "velsrv.exe")
+            write_shortcut(os.path.join(desktop, "VELBO.lnk"),
+                           os.path.join(veloce_path, "velbo.exe"), working_dir=veloce_path)
+            # VELSRV avec sa 2e icône, sur le bureau et au démarrage
+            for folder in (desktop, startup):
+                write_shortcut(os.path.join(folder, "VELSRV.lnk"), velsrv,
+                               working_dir=veloce_path, icon_location=velsrv, icon_index=1)
 
             log_fn("✅ VELBO.lnk créé sur le Bureau")
             log_fn("✅ VELSRV.lnk créé sur le Bureau")
@@ -3675,10 +4168,7 @@ $Shortcut3.Save()
             log_fn("▶ Configuration des permissions NTFS pour Everyone...")
             ntfs_cmd = f'icacls "{veloce_path}" /grant Everyone:(OI)(CI)F /T /C /Q'
 
-            result_ntfs = subprocess.run(ntfs_cmd,
-                                         shell=True,
-                                         capture_output=True,
-                                         text=True)
+            result_ntfs = run_console(ntfs_cmd, shell=True)
             if result_ntfs.returncode == 0:
                 log_fn("✅ Permissions NTFS: Everyone = Contrôle total")
             else:
@@ -3693,11 +4183,7 @@ $Shortcut3.Save()
             log_fn("▶ Création du partage réseau...")
             share_cmd = f'net share veloce={veloce_path} /grant:everyone,full'
 
-            result_share = subprocess.run(share_cmd,
-                                          shell=True,
-                                          capture_output=True,
-                                          text=True,
-                                          check=True)
+            result_share = run_console(share_cmd, shell=True, check=True)
 
             log_fn("✅ Partage réseau créé: \\\\<PC>\\veloce")
             log_fn("✅ Permissions partage: Everyone = Contrôle total")
@@ -3779,6 +4265,8 @@ $Shortcut3.Save()
                      font=ctk.CTkFont(size=12)).pack(anchor="w",
                                                      padx=12,
                                                      pady=2)
+        self._attach_veloce_server_picker(left_frame, server_var, anchor="w",
+                                          padx=12, pady=2)
 
         # Station
         ctk.CTkLabel(left_frame,
@@ -3909,12 +4397,8 @@ $Shortcut3.Save()
                 status_label.configure(text="Vérification accès réseau...")
                 log_msg(f"▶ Vérification accès à {veloce_base}...")
 
-                ping_result = subprocess.run(f"ping -n 1 -w 1000 {server}",
-                                             shell=True,
-                                             capture_output=True,
-                                             timeout=2)
-
-                if ping_result.returncode != 0:
+                # Connexion SMB (445): c'est elle qu'utilise \\serveur\veloce
+                if not probe_smb(server):
                     log_msg(f"❌ Serveur {server} non joignable")
                     status_label.configure(text="❌ Serveur non joignable")
                     progress_bar.set(1.0)
@@ -3977,23 +4461,11 @@ $Shortcut3.Save()
 
                 shortcut_path = os.path.join(desktop,
                                              f"station {station_no_zero}.lnk")
-                ps_script = f'''
-$WScriptShell = New-Object -ComObject WScript.Shell
-$Shortcut = $WScriptShell.CreateShortcut("{shortcut_path}")
-$Shortcut.TargetPath = "{ws_starter}"
-$Shortcut.WorkingDirectory = "{station_path}"
-$Shortcut.Save()
-'''
-                ps_cmd = [
-                    'powershell', '-ExecutionPolicy', 'Bypass', '-Command',
-                    ps_script
-                ]
-                result = subprocess.run(ps_cmd, capture_output=True, text=True)
-
-                if result.returncode == 0 and os.path.exists(shortcut_path):
+                try:
+                    write_shortcut(shortcut_path, ws_starter, working_dir=station_path)
                     log_msg(f"✓ Raccourci créé: {shortcut_path}")
-                else:
-                    log_msg(f"❌ Erreur création raccourci: {result.stderr}")
+                except (OSError, ValueError) as e:
+                    log_msg(f"❌ Erreur création raccourci: {e}")
                     log_msg("⚠️ Continuez manuellement...")
 
                 progress_bar.set(0.6)
@@ -4016,27 +4488,12 @@ $Shortcut.Save()
                         )
 
                 # Créer le nouveau raccourci dans le démarrage
-                ps_script_startup = f'''
-$WScriptShell = New-Object -ComObject WScript.Shell
-$Shortcut = $WScriptShell.CreateShortcut("{startup_shortcut}")
-$Shortcut.TargetPath = "{ws_starter}"
-$Shortcut.WorkingDirectory = "{station_path}"
-$Shortcut.Save()
-'''
-                result_startup = subprocess.run([
-                    'powershell', '-ExecutionPolicy', 'Bypass', '-Command',
-                    ps_script_startup
-                ],
-                                                capture_output=True,
-                                                text=True)
-
-                if result_startup.returncode == 0 and os.path.exists(
-                        startup_shortcut):
+                try:
+                    write_shortcut(startup_shortcut, ws_starter, working_dir=station_path)
                     log_msg(
                         f"✓ Raccourci copié au démarrage: {startup_shortcut}")
-                else:
-                    log_msg(
-                        f"❌ Erreur copie démarrage: {result_startup.stderr}")
+                except (OSError, ValueError) as e:
+                    log_msg(f"❌ Erreur copie démarrage: {e}")
 
                 # Supprimer l'ancien "Veloce WS Starter" du démarrage (.lnk ET .exe)
                 log_msg(f"▶ Nettoyage ancien raccourci 'Veloce WS Starter'...")
@@ -4074,15 +4531,10 @@ $Shortcut.Save()
                 )
 
                 try:
-                    import winreg
-                    key_path = r"SYSTEM\CurrentControlSet\Services\LanmanWorkstation\Parameters"
-                    key = winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, key_path,
-                                         0, winreg.KEY_SET_VALUE)
-                    winreg.SetValueEx(key, "DirectoryCacheLifetime", 0,
-                                      winreg.REG_DWORD, 0)
-                    winreg.CloseKey(key)
-                    log_msg(
-                        f"✓ Clé registre DirectoryCacheLifetime définie à 0")
+                    results = registry_engine.apply(DIRECTORY_CACHE_TWEAKS,
+                                                    log_msg)
+                    if not log_tweak_summary(results, log_msg):
+                        log_msg("⚠️ Nécessite droits administrateur")
                 except Exception as e:
                     log_msg(f"❌ Erreur clé registre: {e}")
                     log_msg("⚠️ Nécessite droits administrateur")
@@ -4102,7 +4554,8 @@ $Shortcut.Save()
                 log_msg(f"❌ Erreur fatale: {e}")
                 status_label.configure(text="❌ Erreur")
 
-        threading.Thread(target=worker, daemon=True).start()
+        threading.Thread(target=registry_engine.wrap_run(
+            f"Station Veloce {server}", worker), daemon=True).start()
 
     def _build_standard_ui(self):
         """Construit l'UI pour Poste Standard"""
@@ -4359,7 +4812,8 @@ $Shortcut.Save()
         self._standard_progress_bar.set(0)
 
         # Lancer en thread
-        threading.Thread(target=worker, daemon=True).start()
+        threading.Thread(target=registry_engine.wrap_run("Poste standard", worker),
+                         daemon=True).start()
 
     def _build_serveur_ui(self):
         """Construit l'UI pour Poste Serveur"""
@@ -4423,6 +4877,8 @@ $Shortcut.Save()
                      width=300,
                      placeholder_text="Ex: SV",
                      font=ctk.CTkFont(size=12)).pack(side="left", padx=10)
+        self._attach_veloce_server_picker(row1, self._veloce_server_var,
+                                          side="left", padx=10)
 
         # Numéro de station
         row2 = ctk.CTkFrame(fields_frame, fg_color="transparent")
@@ -4459,6 +4915,54 @@ $Shortcut.Save()
                       hover_color="#1d4ed8",
                       command=self._start_veloce_setup).pack(pady=20)
 
+    def _attach_veloce_server_picker(self, parent, server_var, **pack_opts):
+        """
+        Ajoute une liste des serveurs Veloce détectés sur le réseau local
+
+        Le balayage part en arrière-plan à l'ouverture (cache de session) et
+        le bouton 🔍 le relance. Choisir un serveur remplit server_var.
+        """
+        row = ctk.CTkFrame(parent, fg_color="transparent")
+        row.pack(**pack_opts)
+        found = []
+
+        def choose(choice):
+            if choice in found:
+                server_var.set(choice)
+
+        menu = ctk.CTkOptionMenu(row,
+                                 values=["Recherche..."],
+                                 width=180,
+                                 command=choose)
+        menu.pack(side="left")
+
+        def scan(refresh=False):
+            menu.configure(values=["Recherche..."])
+            menu.set("Recherche...")
+
+            def worker():
+                names = veloce_servers(run_lan_discovery(self.log,
+                                                         refresh=refresh))
+
+                def update():
+                    if not menu.winfo_exists():
+                        return
+                    found[:] = names
+                    values = names or ["Aucun serveur trouvé"]
+                    menu.configure(values=values)
+                    menu.set(values[0])
+                    if len(names) == 1 and not server_var.get().strip():
+                        server_var.set(names[0])
+
+                self.after(0, update)
+
+            threading.Thread(target=worker, daemon=True).start()
+
+        ctk.CTkButton(row, text="🔍", width=32,
+                      command=lambda: scan(refresh=True)).pack(side="left",
+                                                               padx=(4, 0))
+        scan()
+
     def _start_veloce_setup(self):
         """Démarre la configuration Station Veloce"""
         server = self._veloce_server_var.get().strip()
@@ -4681,12 +5185,8 @@ $Shortcut.Save()
 
                 try:
                     import subprocess
-                    ping_result = subprocess.run(f"ping -n 1 -w 1000 {server}",
-                                                 shell=True,
-                                                 capture_output=True,
-                                                 timeout=2)
-
-                    if ping_result.returncode != 0:
+                    # Connexion SMB (445): c'est elle qu'utilise \\serveur\veloce
+                    if not probe_smb(server):
                         log_to_dialog(f"❌ Serveur {server} non joignable")
                         step_label.configure(text="❌ Serveur non joignable")
                         progress_bar.set(1.0)
@@ -4765,31 +5265,10 @@ $Shortcut.Save()
                         progress_bar.set(1.0)
                         return
 
-                    # Utiliser PowerShell pour créer le raccourci
                     shortcut_path = os.path.join(
                         desktop, f"station {station_no_zero}.lnk")
-                    ps_script = f'''
-$WScriptShell = New-Object -ComObject WScript.Shell
-$Shortcut = $WScriptShell.CreateShortcut("{shortcut_path}")
-$Shortcut.TargetPath = "{ws_starter}"
-$Shortcut.WorkingDirectory = "{station_path}"
-$Shortcut.Save()
-'''
-                    ps_cmd = [
-                        'powershell', '-ExecutionPolicy', 'Bypass', '-Command',
-                        ps_script
-                    ]
-                    result = subprocess.run(ps_cmd,
-                                            capture_output=True,
-                                            text=True)
-
-                    if result.returncode == 0 and os.path.exists(
-                            shortcut_path):
-                        log_to_dialog(f"✓ Raccourci créé: {shortcut_path}")
-                    else:
-                        log_to_dialog(
-                            f"❌ Erreur création raccourci: {result.stderr}")
-                        log_to_dialog("⚠️ Continuez manuellement...")
+                    write_shortcut(shortcut_path, ws_starter, working_dir=station_path)
+                    log_to_dialog(f"✓ Raccourci créé: {shortcut_path}")
 
                     progress_bar.set(0.6)
 
@@ -4805,17 +5284,13 @@ $Shortcut.Save()
                 )
 
                 try:
-                    reg_cmd = r'C:\Windows\System32\reg.exe add HKLM\SYSTEM\CurrentControlSet\Services\LanmanWorkstation\Parameters /v DirectoryCacheLifetime /t REG_DWORD /d 0 /f'
-                    result = subprocess.run(reg_cmd,
-                                            shell=True,
-                                            capture_output=True,
-                                            text=True)
-
-                    if result.returncode == 0:
+                    results = registry_engine.apply(DIRECTORY_CACHE_TWEAKS,
+                                                    log_to_dialog)
+                    if log_tweak_summary(results, log_to_dialog):
                         log_to_dialog(
                             "✓ Clé de registre appliquée avec succès")
                     else:
-                        log_to_dialog(f"❌ Erreur registre: {result.stderr}")
+                        log_to_dialog("❌ Erreur registre: droits administrateur requis")
 
                     progress_bar.set(0.8)
 
@@ -4907,7 +5382,8 @@ $Shortcut.Save()
                     return
 
             # Lancer le worker avec les paramètres
-            threading.Thread(target=lambda: run_worker(server, station_num),
+            threading.Thread(target=registry_engine.wrap_run(
+                f"Auto setup {setup_type}", lambda: run_worker(server, station_num)),
                              daemon=True).start()
 
         ctk.CTkButton(main_frame,
@@ -5077,11 +5553,7 @@ $Shortcut.Save()
                 # Mode LOCAL (host vide)
                 if not host:
                     self.log(f"▶ Exécution LOCALE: {command}")
-                    result = subprocess.run(command,
-                                            shell=True,
-                                            capture_output=True,
-                                            text=True,
-                                            timeout=60)
+                    result = run_console(command, shell=True, timeout=60)
 
                     if result.stdout:
                         self.log("----- SORTIE -----")
@@ -5120,10 +5592,7 @@ $Shortcut.Save()
 
                 self.log(f"▶ Exécution DISTANTE sur {host}: {command}")
 
-                result = subprocess.run(cmd_parts,
-                                        capture_output=True,
-                                        text=True,
-                                        timeout=60)
+                result = run_console(cmd_parts, timeout=60)
 
                 if result.stdout:
                     self.log("----- SORTIE -----")
@@ -5394,12 +5863,8 @@ $Shortcut.Save()
             for iface in interfaces:
                 try:
                     # Récupère les infos via netsh
-                    result = subprocess.check_output(
-                        f'netsh interface ip show config name="{iface}"',
-                        shell=True,
-                        text=True,
-                        encoding="utf-8",
-                        errors="ignore")
+                    result = run_console(f'netsh interface ip show config name="{iface}"',
+                                         shell=True, check=True).stdout
 
                     # Parse la sortie
                     info = self._parse_netsh_output(result)
@@ -5647,8 +6112,8 @@ $Shortcut.Save()
                     cmd = (f'netsh interface ipv4 set address name="{iface}" '
                            f'static {ip} {mask}')
 
-                result = subprocess.run(cmd, shell=True, capture_output=True,
-                                        text=True, cwd=os.environ.get('TEMP', 'C:\\Windows\\Temp'))
+                result = run_console(cmd, shell=True,
+                                     cwd=os.environ.get('TEMP', 'C:\\Windows\\Temp'))
                 if result.returncode == 0:
                     self.log(f"✅ IP statique configurée: {ip}/{mask}")
                     if gw_clean:
@@ -5675,18 +6140,16 @@ $Shortcut.Save()
                 dns2 = self._net_dns2_var.get().strip()
 
                 if dns1:
-                    r = subprocess.run(
-                        f'netsh interface ipv4 set dns name="{iface}" static {dns1}',
-                        shell=True, capture_output=True, text=True, cwd=local_cwd)
+                    r = run_console(f'netsh interface ipv4 set dns name="{iface}" static {dns1}',
+                                    shell=True, cwd=local_cwd)
                     if r.returncode == 0:
                         self.log(f"✅ DNS primaire: {dns1}")
                     else:
                         self.log(f"⚠️ DNS primaire non appliqué (code {r.returncode})")
 
                 if dns2:
-                    r = subprocess.run(
-                        f'netsh interface ipv4 add dns name="{iface}" {dns2} index=2',
-                        shell=True, capture_output=True, text=True, cwd=local_cwd)
+                    r = run_console(f'netsh interface ipv4 add dns name="{iface}" {dns2} index=2',
+                                    shell=True, cwd=local_cwd)
                     if r.returncode == 0:
                         self.log(f"✅ DNS secondaire: {dns2}")
                     else:
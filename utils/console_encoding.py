@@ -0,0 +1,112 @@
+"""
+Décodage des sorties de commandes console (netsh, reg, powershell, wmic...)
+La page de code console est détectée une seule fois par processus; les sorties
+sont décodées directement avec elle puis nettoyées par une table str.translate.
+run_console exécute une commande et renvoie ses sorties déjà décodées.
+"""
+import codecs
+import locale
+import re
+import subprocess
+import sys
+from functools import lru_cache
+
+# Caractères de contrôle supprimés (sauf \t \n \r) et espace insécable -> espace
+_CLEANUP_TABLE = {c: None for c in (*range(0x00, 0x09), 0x0B, 0x0C, *range(0x0E, 0x20))}
+_CLEANUP_TABLE[0xA0] = " "
+# Recherche rapide: la table n'est appliquée que si l'un de ces caractères est présent
+_CLEANUP_RE = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\xa0]")
+
+# UTF-8 relu en cp1252 ("Ã©" pour "é"): séquences de deux caractères, réparées en
+# une seule passe et uniquement si un caractère témoin est présent
+_MOJIBAKE = {}
+for _code in range(0xA0, 0x100):
+    _seq = chr(_code).encode("utf-8").decode("cp1252", errors="ignore")
+    if len(_seq) == 2:
+        _MOJIBAKE[_seq] = chr(_code)
+_MOJIBAKE_RE = re.compile("|".join(map(re.escape, sorted(_MOJIBAKE, key=len, reverse=True))))
+_MOJIBAKE_MARKERS = ("Ã", "Â")
+
+
+def _windows_codepage():
+    """Page de code de sortie console, ou OEM si aucune console (application --noconsole)"""
+    import ctypes
+    kernel32 = ctypes.windll.kernel32
+    return kernel32.GetConsoleOutputCP() or kernel32.GetOEMCP()
+
+
+@lru_cache(maxsize=1)
+def console_encoding():
+    """
+    Encodage des sorties des commandes console, détecté une fois par processus
+
+    Windows: page de code console/OEM (cp850 sur un poste français, pas cp1252).
+
+    Returns:
+        str: Nom d'encodage Python (ex: "cp850", "utf-8")
+    """
+    encoding = None
+    if sys.platform.startswith("win"):
+        try:
+            cp = _windows_codepage()
+            encoding = "utf-8" if cp == 65001 else f"cp{cp}"
+        except Exception:
+            encoding = None
+    if not encoding:
+        encoding = locale.getpreferredencoding(False) or "utf-8"
+    try:
+        return codecs.lookup(encoding).name
+    except LookupError:
+        return "utf-8"
+
+
+def repair_mojibake(text):
+    """Répare le texte UTF-8 décodé à tort en cp1252 ("Ã©" -> "é")"""
+    if not any(m in text for m in _MOJIBAKE_MARKERS):
+        return text
+    return _MOJIBAKE_RE.sub(lambda m: _MOJIBAKE[m.group(0)], text)
+
+
+def decode_output(data, encoding=None):
+    """
+    Décode la sortie d'une commande console
+
+    Args:
+        data (bytes): Sortie brute (stdout/stderr)
+        encoding (str): Encodage à utiliser (défaut: console_encoding())
+
+    Returns:
+        str: Texte décodé, réparé et sans caractères de contrôle
+    """
+    if isinstance(data, str):
+        text = data
+    else:
+        text = data.decode(encoding or console_encoding(), errors="replace")
+    text = repair_mojibake(text)
+    if _CLEANUP_RE.search(text):
+        text = text.translate(_CLEANUP_TABLE)
+    return text
+
+
+def run_console(cmd, check=False, **kwargs):
+    """
+    Exécute une commande console et décode ses sorties avec decode_output
+
+    Args:
+        cmd (str | list): Commande (shell=True à passer pour une chaîne shell)
+        check (bool): Lever CalledProcessError si le code de retour est non nul
+        **kwargs: Arguments de subprocess.run (shell, timeout, cwd...)
+
+    Returns:
+        subprocess.CompletedProcess: stdout et stderr décodés en str
+
+    Raises:
+        subprocess.CalledProcessError: Si check et code de retour non nul
+        subprocess.TimeoutExpired: Si timeout est dépassé
+    """
+    proc = subprocess.run(cmd, capture_output=True, **kwargs)
+    proc.stdout = decode_output(proc.stdout or b"")
+    proc.stderr = decode_output(proc.stderr or b"")
+    if check:
+        proc.check_returncode()
+    return proc
@@ -0,0 +1,28 @@
+"""
+Utilitaires réseau
+Interfaces IPv4 locales, partagées par les balayages d'imprimantes et de postes
+"""
+import ipaddress
+import socket
+
+
+def local_subnets():
+    """
+    Retourne le /24 de chaque interface IPv4 active (hors loopback et APIPA)
+
+    Returns:
+        list: Liste de ipaddress.IPv4Network sans doublons
+    """
+    import psutil
+    subnets = []
+    for addrs in psutil.net_if_addrs().values():
+        for a in addrs:
+            if a.family != socket.AF_INET:
+                continue
+            ip = ipaddress.IPv4Address(a.address)
+            if ip.is_loopback or ip.is_link_local:
+                continue
+            net = ipaddress.IPv4Network(f"{ip}/24", strict=False)
+            if net not in subnets:
+                subnets.append(net)
+    return subnets
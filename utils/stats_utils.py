@@ -0,0 +1,181 @@
+"""
+Utilitaires statistiques
+Percentiles, résumés (min/moy/p95), histogrammes et tampons circulaires pour les
+mesures de latence et de débit
+"""
+import bisect
+import math
+from array import array
+
+
+def percentile(values, pct):
+    """
+    Calcule un percentile par la méthode du rang le plus proche
+
+    Args:
+        values (iterable): Valeurs numériques
+        pct (float): Percentile voulu (0-100)
+
+    Returns:
+        float: Valeur du percentile, ou 0.0 si aucune valeur
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def summarize(values):
+    """
+    Résume une série de mesures
+
+    Args:
+        values (iterable): Valeurs numériques
+
+    Returns:
+        dict: {count, min, avg, p95, max} (zéros si aucune valeur)
+    """
+    values = list(values)
+    if not values:
+        return {"count": 0, "min": 0.0, "avg": 0.0, "p95": 0.0, "max": 0.0}
+    return {
+        "count": len(values),
+        "min": min(values),
+        "avg": sum(values) / len(values),
+        "p95": percentile(values, 95),
+        "max": max(values),
+    }
+
+
+class LatencyHistogram:
+    """
+    Histogramme de latences à classes logarithmiques (10 classes par décade)
+
+    Mémoire constante quelle que soit la durée de la mesure; les percentiles sont
+    donnés à la borne supérieure de leur classe (erreur relative < 26 %),
+    ramenés entre le minimum et le maximum observés.
+    """
+
+    def __init__(self, lowest=0.1, highest=600000.0, per_decade=10):
+        """
+        Args:
+            lowest (float): Borne supérieure de la première classe (ms)
+            highest (float): Borne au-delà de laquelle tout tombe dans la dernière classe (ms)
+            per_decade (int): Nombre de classes par facteur 10
+        """
+        n = math.ceil(math.log10(highest / lowest) * per_decade)
+        self.bounds = [lowest * 10 ** (i / per_decade) for i in range(n + 1)]
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def record(self, value):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @property
+    def avg(self):
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct):
+        """
+        Returns:
+            float: Percentile approché (0.0 si aucune valeur)
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(pct / 100 * self.count))
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                upper = self.bounds[i] if i < len(self.bounds) else self.max
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+    def buckets(self):
+        """
+        Returns:
+            list: (borne inférieure, borne supérieure, nombre) des classes non vides
+        """
+        rows = []
+        for i, n in enumerate(self.counts):
+            if n:
+                low = self.bounds[i - 1] if i else 0.0
+                high = self.bounds[i] if i < len(self.bounds) else math.inf
+                rows.append((low, high, n))
+        return rows
+
+    def format_bars(self, width=30):
+        """
+        Returns:
+            list: Lignes "borne  barre  nombre" prêtes à journaliser
+        """
+        rows = self.buckets()
+        peak = max((n for _, _, n in rows), default=0)
+        lines = []
+        for low, high, n in rows:
+            bar = "█" * max(1, round(n / peak * width))
+            upper = "∞" if high == math.inf else f"{high:.1f}"
+            lines.append(f"   {low:>9.1f}–{upper:<9} ms {bar} {n}")
+        return lines
+
+
+class LatencyRing:
+    """
+    Tampon circulaire de latences de taille fixe (array de doubles)
+
+    Les pertes sont stockées comme NaN. Aucune allocation par échantillon: une
+    surveillance de toute une journée garde la même empreinte mémoire.
+    """
+
+    def __init__(self, capacity=600):
+        """
+        Args:
+            capacity (int): Nombre d'échantillons conservés
+        """
+        self.capacity = capacity
+        self._data = array("d", [math.nan]) * capacity
+        self._next = 0
+        self.count = 0
+        self.total = 0
+
+    def append(self, value):
+        """Ajoute une latence (ms), ou None pour une perte"""
+        self._data[self._next] = math.nan if value is None else value
+        self._next = (self._next + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        self.total += 1
+
+    def values(self):
+        """
+        Returns:
+            list: Échantillons du plus ancien au plus récent (NaN = perte)
+        """
+        if self.count < self.capacity:
+            return self._data[:self.count].tolist()
+        return (self._data[self._next:] + self._data[:self._next]).tolist()
+
+    def stats(self):
+        """
+        Résume les échantillons du tampon
+
+        La gigue est l'écart moyen entre deux réponses consécutives.
+
+        Returns:
+            dict: {count, min, avg, p95, max, jitter, loss} (loss en fraction 0-1)
+        """
+        samples = self.values()
+        ok = [v for v in samples if v == v]
+        result = summarize(ok)
+        result["count"] = len(samples)
+        result["jitter"] = (sum(abs(b - a) for a, b in zip(ok, ok[1:])) / (len(ok) - 1)
+                            if len(ok) > 1 else 0.0)
+        result["loss"] = (len(samples) - len(ok)) / len(samples) if samples else 0.0
+        return result